@@ -0,0 +1,78 @@
+"""
+Chunker throughput on synthetic multi-megabyte documents.
+
+    python -m benchmarks.bench_chunker --sizes-mb 1 8 32
+"""
+import argparse
+import random
+import time
+
+from src.chunkers.simple_chunker import SimpleChunker
+from src.chunkers.sliding_window import SlidingWindowChunker
+
+WORDS = (
+    "the a retrieval vector index query chunk document embedding model latency "
+    "throughput shard cluster search context answer token budget page table"
+).split()
+
+
+def synthetic_text(size_mb: float, seed: int = 0) -> str:
+    """
+    Paragraphs of 2-8 sentences of 5-20 words until the text reaches ``size_mb``.
+    """
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    paragraphs, size = [], 0
+    while size < target:
+        sentences = [
+            " ".join(rng.choices(WORDS, k=rng.randint(5, 20))).capitalize() + rng.choice(".!?")
+            for _ in range(rng.randint(2, 8))
+        ]
+        paragraph = " ".join(sentences)
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 2
+    return "\n\n".join(paragraphs)
+
+
+def bench(name: str, chunker, text: str, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        chunks = chunker.chunk(text)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        "chunker": name,
+        "size_mb": len(text) / (1024 * 1024),
+        "chunks": len(chunks),
+        "max_chunk_chars": max((len(chunk) for chunk in chunks), default=0),
+        "seconds": best,
+        "mb_per_second": len(text) / (1024 * 1024) / best,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    chunkers = {
+        "simple": SimpleChunker(),
+        "sliding-chars": SlidingWindowChunker(window_size=1000, stride=800),
+        "sliding-chars-paragraph": SlidingWindowChunker(window_size=1000, stride=800, snap="paragraph"),
+        "sliding-tokens": SlidingWindowChunker(window_size=256, stride=200, unit="tokens"),
+    }
+    print(f"{'chunker':<26}{'MB':>8}{'chunks':>10}{'max chars':>11}{'seconds':>10}{'MB/s':>9}")
+    for size_mb in args.sizes_mb:
+        text = synthetic_text(size_mb)
+        for name, chunker in chunkers.items():
+            r = bench(name, chunker, text, args.repeat)
+            print(
+                f"{r['chunker']:<26}{r['size_mb']:>8.1f}{r['chunks']:>10}{r['max_chunk_chars']:>11}"
+                f"{r['seconds']:>10.3f}{r['mb_per_second']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
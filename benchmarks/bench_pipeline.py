@@ -0,0 +1,244 @@
+"""
+End-to-end ingest and query benchmark on a synthetic corpus with the
+offline stack: FakeLLMEngine (deterministic embeddings, simulated
+latency) and NumpyVectorStore, or a locally run Elasticsearch.
+
+Reports per-stage throughput, p50/p95/p99 latency and peak RSS as JSON,
+so runs can be compared across commits:
+
+    python -m benchmarks.bench_pipeline --docs 200 --doc-kb 64 --queries 500 --output bench.json
+    python -m benchmarks.bench_pipeline --store elasticsearch --es-host http://localhost:9200
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks.bench_chunker import synthetic_text
+from src.chunkers.simple_chunker import SimpleChunker
+from src.chunkers.sliding_window import SlidingWindowChunker
+from src.llm_engines.fake_engine import FakeLLMEngine
+from src.pipeline.rag_pipeline import RAGPipeline
+from src.retrievers.basic_retriever import VectorStoreRetriever
+
+
+class TextFileExtractor:
+    def extract(self, file_path: str) -> str:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class StageRecorder:
+    """
+    Collects per-call latencies and item counts per stage.
+    """
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def measure(self, stage: str, items: int = 1):
+        started = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - started
+        record = self.stages.setdefault(stage, {"latencies": [], "items": 0, "seconds": 0.0})
+        record["latencies"].append(elapsed)
+        record["items"] += items
+        record["seconds"] += elapsed
+        record["peak_rss_mb"] = peak_rss_mb()
+
+    def add(self, stage: str, seconds: float, items: int):
+        record = self.stages.setdefault(stage, {"latencies": [], "items": 0, "seconds": 0.0})
+        record["latencies"].append(seconds)
+        record["items"] += items
+        record["seconds"] += seconds
+        record["peak_rss_mb"] = peak_rss_mb()
+
+    def report(self) -> dict:
+        report = {}
+        for stage, record in self.stages.items():
+            latencies = np.asarray(record["latencies"]) * 1000
+            report[stage] = {
+                "calls": len(latencies),
+                "items": record["items"],
+                "items_per_s": record["items"] / record["seconds"] if record["seconds"] else None,
+                "p50_ms": float(np.percentile(latencies, 50)),
+                "p95_ms": float(np.percentile(latencies, 95)),
+                "p99_ms": float(np.percentile(latencies, 99)),
+                # ru_maxrss is a process-wide high-water mark
+                "peak_rss_mb": record["peak_rss_mb"],
+            }
+        return report
+
+
+def write_corpus(directory: str, n_docs: int, doc_kb: float, seed: int = 0) -> list[str]:
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(n_docs):
+        path = os.path.join(directory, f"doc_{i:05d}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(synthetic_text(doc_kb / 1024, seed=seed + i))
+        paths.append(path)
+    return paths
+
+
+def sample_queries(paths: list[str], n: int, seed: int = 0) -> list[str]:
+    """
+    Sentences drawn from the corpus, so queries have relevant chunks.
+    """
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n):
+        with open(rng.choice(paths), "r", encoding="utf-8") as f:
+            sentences = [s.strip() for s in f.read().replace("!", ".").replace("?", ".").split(".") if s.strip()]
+        queries.append(rng.choice(sentences))
+    return queries
+
+
+def make_store(args, index_path: str):
+    if args.store == "numpy":
+        from src.vector_stores.numpy_store import NumpyVectorStore
+        return NumpyVectorStore(index_path, embedding_dim=args.dim)
+    from src.vector_stores.elasticsearch_store import ElasticsearchVectorStore
+    return ElasticsearchVectorStore(f"bench-{int(time.time())}", embedding_dim=args.dim, es_host=args.es_host)
+
+
+def bench_ingest(pipeline: RAGPipeline, paths: list[str], recorder: StageRecorder):
+    """
+    Ingest one file at a time, timing each stage of RAGPipeline.ingest separately.
+    """
+    for path in paths:
+        with recorder.measure("extract"):
+            text = pipeline.extractor.extract(path)
+        with recorder.measure("chunk"):
+            chunks = pipeline.chunker.chunk(text)
+        with recorder.measure("embed", items=len(chunks)):
+            vectors = pipeline.llm.embed(chunks)
+        docs = [
+            {"text": chunk, "vector": vector, "metadata": {"source": path}}
+            for chunk, vector in zip(chunks, vectors)
+        ]
+        with recorder.measure("index", items=len(docs)):
+            pipeline.vector_store.add_documents(docs)
+        recorder.add("ingest_file", sum(recorder.stages[stage]["latencies"][-1] for stage in ("extract", "chunk", "embed", "index")), 1)
+
+
+def bench_query(pipeline: RAGPipeline, queries: list[str], recorder: StageRecorder):
+    for query in queries:
+        with recorder.measure("query_embed"):
+            query_vector = pipeline.llm.embed([query])[0]
+        with recorder.measure("search"):
+            retrieved = pipeline.retriever.retrieve_documents(query, query_vector=query_vector)
+        with recorder.measure("generate"):
+            pipeline.llm.generate([{"role": "user", "content": "\n".join(doc["text"] for doc in retrieved) + query}])
+        with recorder.measure("query_end_to_end"):
+            pipeline.query(query)
+        stream = pipeline.query_stream(query)
+        for _ in stream:
+            pass
+        recorder.add("time_to_first_token", stream.metrics["time_to_first_token"], 1)
+
+
+def compare(baseline: dict, results: dict):
+    """
+    Print p50 latency and throughput of each stage relative to a baseline run.
+    """
+    print(f"{'stage':<22}{'p50 ms':>10}{'baseline':>10}{'change':>9}{'items/s':>12}{'baseline':>12}", file=sys.stderr)
+    for stage, current in results["stages"].items():
+        before = baseline["stages"].get(stage)
+        if before is None:
+            continue
+        change = (current["p50_ms"] / before["p50_ms"] - 1) * 100 if before["p50_ms"] else float("nan")
+        print(
+            f"{stage:<22}{current['p50_ms']:>10.3f}{before['p50_ms']:>10.3f}{change:>+8.1f}%"
+            f"{current['items_per_s'] or 0:>12.1f}{before['items_per_s'] or 0:>12.1f}",
+            file=sys.stderr,
+        )
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100)
+    parser.add_argument("--doc-kb", type=float, default=32)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--chunker", choices=["simple", "sliding_window"], default="sliding_window")
+    parser.add_argument("--store", choices=["numpy", "elasticsearch"], default="numpy")
+    parser.add_argument("--es-host", default="http://localhost:9200")
+    parser.add_argument("--embed-latency", type=float, default=0.0, help="Simulated seconds per embedding batch")
+    parser.add_argument("--generate-latency", type=float, default=0.0, help="Simulated seconds per generation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON results here instead of stdout")
+    parser.add_argument("--compare", help="Baseline JSON results to compare against")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    llm = FakeLLMEngine(embedding_dim=args.dim, embed_latency=args.embed_latency, generate_latency=args.generate_latency)
+    chunker = SimpleChunker() if args.chunker == "simple" else SlidingWindowChunker()
+    recorder = StageRecorder()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = write_corpus(os.path.join(workdir, "corpus"), args.docs, args.doc_kb, args.seed)
+        store = make_store(args, os.path.join(workdir, "index"))
+        pipeline = RAGPipeline(TextFileExtractor(), chunker, store, VectorStoreRetriever(store, llm), llm)
+
+        try:
+            bench_ingest(pipeline, paths, recorder)
+            if args.store == "elasticsearch":
+                store.client.indices.refresh(index=store.index_name)
+            bench_query(pipeline, sample_queries(paths, args.queries, args.seed), recorder)
+        finally:
+            if args.store == "elasticsearch":
+                store.client.indices.delete(index=store.index_name)
+
+    results = {
+        "benchmark": "pipeline",
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": vars(args),
+        "stages": recorder.report(),
+    }
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
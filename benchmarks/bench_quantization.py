@@ -0,0 +1,80 @@
+"""
+Recall, latency and vector memory of NumpyVectorStore with exact, int8 and
+PQ scoring, on clustered synthetic embeddings.
+
+    python -m benchmarks.bench_quantization --n 100000 --dim 768
+"""
+import argparse
+import logging
+import tempfile
+import time
+
+import numpy as np
+
+from src.vector_stores.numpy_store import NumpyVectorStore
+
+
+def clustered_vectors(n: int, dim: int, n_clusters: int = 256, noise: float = 0.35, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim), dtype=np.float32)
+    vectors = centers[rng.integers(0, n_clusters, n)] + noise * rng.standard_normal((n, dim), dtype=np.float32)
+    return vectors
+
+
+def run(store: NumpyVectorStore, queries: np.ndarray, truth: list[set], k: int, **options) -> dict:
+    hits, timings = 0, []
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        results = store.similarity_search(query, k, **options)
+        timings.append(time.perf_counter() - started)
+        hits += len({doc["_id"] for doc in results} & expected)
+    return {
+        "recall": hits / (k * len(queries)),
+        "p50_ms": 1000 * float(np.percentile(timings, 50)),
+        "p99_ms": 1000 * float(np.percentile(timings, 99)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--pq-subspaces", type=int, nargs="+", default=[96, 48])
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    vectors = clustered_vectors(args.n, args.dim)
+    queries = vectors[:args.queries] + 0.1 * np.random.default_rng(1).standard_normal((args.queries, args.dim), dtype=np.float32)
+
+    with tempfile.TemporaryDirectory() as index_path:
+        store = NumpyVectorStore(index_path, embedding_dim=args.dim)
+        for start in range(0, args.n, 10_000):
+            block = vectors[start:start + 10_000]
+            store.add_documents([{"text": str(start + i), "vector": vector} for i, vector in enumerate(block)])
+        truth = [{doc["_id"] for doc in store.similarity_search(query, args.k, exact=True)} for query in queries]
+
+        configs = [("float32", None, {}, {"exact": True})]
+        configs.append(("int8", "int8", {}, {"rerank_window": 0}))
+        configs.append(("int8+rescore", "int8", {}, {}))
+        for n_subspaces in args.pq_subspaces:
+            configs.append((f"pq{n_subspaces}", "pq", {"n_subspaces": n_subspaces}, {"rerank_window": 0}))
+            configs.append((f"pq{n_subspaces}+rescore", "pq", {"n_subspaces": n_subspaces}, {"rerank_window": 10 * args.k}))
+
+        print(f"{'config':<18}{'bytes/vec':>10}{'compression':>13}{'recall@k':>10}{'p50 ms':>9}{'p99 ms':>9}")
+        built = None
+        for name, method, train_options, search_options in configs:
+            if method and (method, tuple(train_options.items())) != built:
+                store.build_quantized_index(method, **train_options)
+                built = (method, tuple(train_options.items()))
+            bytes_per_vector = store.quantizer.code_size if method else 4 * args.dim
+            r = run(store, queries, truth, args.k, **search_options)
+            print(
+                f"{name:<18}{bytes_per_vector:>10}{4 * args.dim / bytes_per_vector:>12.1f}x"
+                f"{r['recall']:>10.3f}{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
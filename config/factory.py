@@ -1,11 +1,194 @@
-def create_llm_engine(provider: str):
-    if provider == "openai":
-        from llm_engines.openai_engine import OpenAIEngine
-        return OpenAIEngine()
-    elif provider == "anthropic":
-        from llm_engines.anthropic_engine import AnthropicEngine
-        return AnthropicEngine()
-    elif provider == "local":
-        from llm_engines.local_engine import LocalEngine
-        return LocalEngine()
-    raise ValueError(f"Unknown provider: {provider}")
+"""
+Config-driven construction of pipeline components.
+
+Components are registered by kind and name as "module:attribute" strings
+and only imported when a config asks for them, so a worker loads just the
+backends it uses. A component spec is either a name or a dict with a
+"type" key plus constructor arguments:
+
+    llm_engine:
+      type: google
+      model: gemini-1.5-pro
+    vector_store:
+      type: elasticsearch
+      index_name: docs
+      es_host: ${ELASTICSEARCH_URL:-http://localhost:9200}
+
+``${VAR}`` / ``${VAR:-default}`` in string values are expanded from the
+environment. Constructed components are cached per (kind, spec), so
+building the same config twice in a process reuses the same instances.
+"""
+import importlib
+import json
+import os
+import re
+import threading
+from typing import Union
+
+# kind -> name -> ("module:attribute", names of components passed to the constructor)
+REGISTRY: dict[str, dict[str, tuple[str, tuple[str, ...]]]] = {
+    "llm_engine": {
+        "google": ("src.llm_engines.google_engine:GoogleLLMEngine", ()),
+        "local": ("src.llm_engines.fake_engine:FakeLLMEngine", ()),
+        "fake": ("src.llm_engines.fake_engine:FakeLLMEngine", ()),
+    },
+    "extractor": {
+        "pdf": ("src.extractors.pdf_extractor:PDFExtractor", ()),
+        "pdf_ai": ("src.extractors.pdf_extractor:PDFExtractionAI", ("llm_engine",)),
+        "image_ai": ("src.extractors.image_extractor:ImageExtractorAI", ("llm_engine",)),
+        "excel": ("src.extractors.excel_extractor:ExcelExtractor", ()),
+    },
+    "chunker": {
+        "simple": ("src.chunkers.simple_chunker:SimpleChunker", ()),
+        "sliding_window": ("src.chunkers.sliding_window:SlidingWindowChunker", ()),
+    },
+    "vector_store": {
+        "elasticsearch": ("src.vector_stores.elasticsearch_store:ElasticsearchVectorStore", ()),
+        "numpy": ("src.vector_stores.numpy_store:NumpyVectorStore", ()),
+    },
+    "retriever": {
+        "vector": ("src.retrievers.basic_retriever:VectorStoreRetriever", ("vector_store", "llm_engine")),
+        "hybrid": ("src.retrievers.hybrid_retriever:HybridRetriever", ("vector_store", "llm_engine")),
+    },
+    "embedding_cache": {
+        "default": ("src.cache.embedding_cache:EmbeddingCache", ()),
+    },
+    "semantic_cache": {
+        "default": ("src.cache.semantic_cache:SemanticCache", ()),
+    },
+    "context_builder": {
+        "default": ("src.pipeline.context_builder:ContextBuilder", ()),
+    },
+}
+
+_instances: dict = {}
+_lock = threading.RLock()
+_ENV_VAR = re.compile(r"\$\{(\w+)(?::-([^}]*))?\}")
+
+
+def register(kind: str, name: str, target: str, requires: tuple = ()):
+    """
+    Register ``target`` ("package.module:Class") as ``name`` for ``kind``.
+    ``requires`` names the components (e.g. "llm_engine") passed to it as
+    keyword arguments.
+    """
+    REGISTRY.setdefault(kind, {})[name] = (target, tuple(requires))
+
+
+def _load(target: str):
+    module_name, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _expand_env(value):
+    if isinstance(value, str):
+        return _ENV_VAR.sub(lambda m: os.environ.get(m.group(1), m.group(2) or ""), value)
+    if isinstance(value, dict):
+        return {key: _expand_env(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_expand_env(item) for item in value]
+    return value
+
+
+def load_config(path: str) -> dict:
+    """
+    Read a YAML (needs PyYAML) or JSON config file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            return yaml.safe_load(f) or {}
+        return json.load(f)
+
+
+def create(kind: str, spec: Union[str, dict], **components):
+    """
+    Build (or return the cached) ``kind`` component for ``spec``.
+    ``components`` supplies the dependencies listed in the registry.
+    """
+    spec = _expand_env({"type": spec} if isinstance(spec, str) else dict(spec))
+    name = spec.pop("type", "default")
+    if name not in REGISTRY.get(kind, {}):
+        raise ValueError(f"Unknown {kind} type: {name}")
+    target, requires = REGISTRY[kind][name]
+    missing = [dependency for dependency in requires if components.get(dependency) is None]
+    if missing:
+        raise ValueError(f"{kind} '{name}' requires {', '.join(missing)}")
+
+    dependencies = {dependency: components[dependency] for dependency in requires}
+    key = (kind, name, json.dumps(spec, sort_keys=True, default=str), tuple(id(dependencies[d]) for d in requires))
+    with _lock:
+        if key not in _instances:
+            _instances[key] = _load(target)(**dependencies, **spec)
+        return _instances[key]
+
+
+def clear_cache():
+    with _lock:
+        _instances.clear()
+
+
+def create_llm_engine(provider: Union[str, dict], **options):
+    """
+    Build an LLM engine, e.g. create_llm_engine("google", model="gemini-1.5-pro")
+    or create_llm_engine("local") for the offline engine.
+    """
+    spec = {"type": provider, **options} if isinstance(provider, str) else {**provider, **options}
+    return create("llm_engine", spec)
+
+
+def build_components(config: Union[str, dict]) -> dict:
+    """
+    Build every component named in ``config`` (a dict or a config file path):
+    llm_engine, extractor, chunker, vector_store, retriever and the optional
+    call_governance (rate limiting, retries, coalescing and hedging around
+    the engine's provider calls, see GovernedLLMEngine), embedding_cache
+    (wraps the engine), semantic_cache and context_builder sections.
+    """
+    if isinstance(config, str):
+        config = load_config(config)
+
+    components = {}
+    llm_engine = create("llm_engine", config["llm_engine"])
+    if config.get("call_governance") is not None:
+        from src.llm_engines.governed_engine import GovernedLLMEngine
+        options = _expand_env(dict(config["call_governance"]))
+        with _lock:
+            key = ("governed_engine", id(llm_engine), json.dumps(options, sort_keys=True, default=str))
+            if key not in _instances:
+                _instances[key] = GovernedLLMEngine(llm_engine, **options)
+            llm_engine = _instances[key]
+    if config.get("embedding_cache") is not None:
+        from src.llm_engines.cached_engine import CachedEmbeddingEngine
+        cache = create("embedding_cache", config["embedding_cache"])
+        with _lock:
+            key = ("cached_engine", id(llm_engine), id(cache))
+            if key not in _instances:
+                _instances[key] = CachedEmbeddingEngine(llm_engine, cache)
+            llm_engine = _instances[key]
+    components["llm_engine"] = llm_engine
+
+    for kind in ("extractor", "chunker", "vector_store", "retriever", "semantic_cache", "context_builder"):
+        if config.get(kind) is not None:
+            components[kind] = create(kind, config[kind], **components)
+    return components
+
+
+def build_pipeline(config: Union[str, dict]):
+    """
+    Build a RAGPipeline from ``config``, see build_components. The
+    retriever defaults to a plain vector retriever over the store.
+    """
+    from src.pipeline.rag_pipeline import RAGPipeline
+
+    components = build_components(config)
+    retriever = components.get("retriever") or create("retriever", "vector", **components)
+    return RAGPipeline(
+        components.get("extractor"),
+        components.get("chunker"),
+        components["vector_store"],
+        retriever,
+        components["llm_engine"],
+        semantic_cache=components.get("semantic_cache"),
+        context_builder=components.get("context_builder"),
+    )
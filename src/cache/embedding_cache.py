@@ -0,0 +1,132 @@
+import hashlib
+import sqlite3
+import threading
+import logging
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+from src.observability import telemetry
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache keyed by a hash of (model, text).
+
+    Lookups go to a bounded in-memory LRU tier first, then to an optional
+    sqlite tier on disk. Disk hits are promoted into memory; new entries are
+    written to both tiers. ``stats`` counts hits per tier, misses and LRU
+    evictions.
+    """
+
+    def __init__(self, max_entries: int = 10000, db_path: Optional[str] = None):
+        if max_entries <= 0:
+            raise ValueError("'max_entries' must be a positive integer")
+
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+            logger.info(f"Opened embedding cache database at '{db_path}'")
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up cached vectors for texts.
+
+        :param model: Embedding model name, part of the cache key.
+        :param texts: Texts to look up.
+        :return: One float32 vector per text, or None where the text is not cached.
+        """
+        keys = [self.key(model, text) for text in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(keys)
+        with self._lock:
+            disk_lookup = {}
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    results[i] = vector
+                else:
+                    disk_lookup.setdefault(key, []).append(i)
+
+            if disk_lookup and self._db is not None:
+                found = {}
+                pending = list(disk_lookup)
+                # Stay well under sqlite's bound-parameter limit
+                for start in range(0, len(pending), 500):
+                    batch = pending[start:start + 500]
+                    rows = self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+                    ).fetchall()
+                    found.update(rows)
+                for key, blob in found.items():
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    self._remember(key, vector)
+                    for i in disk_lookup.pop(key):
+                        results[i] = vector
+                        self.stats["disk_hits"] += 1
+
+            misses = sum(len(indices) for indices in disk_lookup.values())
+            self.stats["misses"] += misses
+        if texts:
+            telemetry.increment("embedding_cache_lookups_total", len(texts) - misses, result="hit")
+            telemetry.increment("embedding_cache_lookups_total", misses, result="miss")
+        return results
+
+    def put_many(self, model: str, texts: List[str], vectors: np.ndarray):
+        """
+        Store vectors for texts in both tiers.
+        """
+        entries = [
+            (self.key(model, text), np.ascontiguousarray(vector, dtype=np.float32))
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            for key, vector in entries:
+                self._remember(key, vector)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, vector.tobytes()) for key, vector in entries],
+                )
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,129 @@
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from src.observability import telemetry
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Answer cache for near-duplicate queries.
+
+    Each entry holds a query embedding, the ids of the chunks retrieved for
+    it and the generated answer. A lookup returns the answer of the most
+    similar live entry if its cosine similarity is at least ``threshold``.
+    Entries expire after ``ttl_seconds`` and the least recently used one is
+    evicted beyond ``max_entries``.
+
+    Attach it to a vector store with ``store.add_change_listener(cache.on_index_change)``
+    so entries are dropped when the index changes: deleting a chunk drops the
+    entries that used it, adding documents drops everything because new
+    chunks may outrank the cached context.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 1000, ttl_seconds: float = 3600.0):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("'threshold' must be in (0, 1]")
+        if max_entries <= 0:
+            raise ValueError("'max_entries' must be a positive integer")
+
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, dict]" = OrderedDict()
+        self._next_key = 0
+        self._lock = threading.Lock()
+        # Stacked entry vectors, rebuilt lazily after the entry set changes
+        self._matrix = None
+        self._keys = None
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _index(self):
+        if self._matrix is None:
+            self._keys = np.fromiter(self._entries.keys(), dtype=np.int64, count=len(self._entries))
+            self._matrix = (
+                np.stack([entry["vector"] for entry in self._entries.values()]) if self._entries else None
+            )
+        return self._keys, self._matrix
+
+    def _drop(self, key: int):
+        del self._entries[key]
+        self._matrix = None
+
+    def lookup(self, query_vector) -> Optional[str]:
+        """
+        Cached answer for the closest live entry within ``threshold``, else None.
+        """
+        query = self._normalize(query_vector)
+        now = time.monotonic()
+        with self._lock:
+            keys, matrix = self._index()
+            if matrix is not None:
+                scores = matrix @ query
+                for i in np.argsort(-scores):
+                    if scores[i] < self.threshold:
+                        break
+                    key = int(keys[i])
+                    entry = self._entries.get(key)
+                    if entry is None:
+                        continue
+                    if entry["expires"] <= now:
+                        self._drop(key)
+                        self.stats["expirations"] += 1
+                        continue
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    telemetry.increment("semantic_cache_lookups_total", result="hit")
+                    return entry["answer"]
+            self.stats["misses"] += 1
+        telemetry.increment("semantic_cache_lookups_total", result="miss")
+        return None
+
+    def store(self, query_vector, chunk_ids: list, answer: str):
+        with self._lock:
+            key = self._next_key
+            self._next_key += 1
+            self._entries[key] = {
+                "vector": self._normalize(query_vector),
+                "chunk_ids": frozenset(chunk_ids),
+                "answer": answer,
+                "expires": time.monotonic() + self.ttl_seconds,
+            }
+            self._matrix = None
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, chunk_ids: list = None):
+        """
+        Drop the entries that used any of ``chunk_ids``, or every entry when None.
+        """
+        with self._lock:
+            if chunk_ids is None:
+                dropped = list(self._entries)
+            else:
+                changed = set(chunk_ids)
+                dropped = [key for key, entry in self._entries.items() if entry["chunk_ids"] & changed]
+            for key in dropped:
+                self._drop(key)
+            self.stats["invalidations"] += len(dropped)
+        if dropped:
+            logger.debug(f"Invalidated {len(dropped)} semantic cache entries")
+
+    def on_index_change(self, event: str, ids: list = None):
+        self.invalidate(ids if event == "delete" else None)
@@ -1,6 +1,134 @@
+import numpy as np
+
 from src.core.chunker import BaseChunker
 
+WHITESPACE = np.array([ord(c) for c in " \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f\x85\xa0\u2028\u2029\u3000"], dtype=np.uint32)
+SENTENCE_END = np.array([ord(c) for c in ".!?"], dtype=np.uint32)
+CLOSING = np.array([ord(c) for c in "\"')]\u201d\u2019"], dtype=np.uint32)
+NEWLINE = ord("\n")
+
+
 class SlidingWindowChunker(BaseChunker):
+    """
+    Fixed-size overlapping windows over the text, measured in characters or
+    in whitespace-delimited tokens.
+
+    Window ends and starts are snapped back to the nearest paragraph, then
+    sentence, then word boundary, as long as that costs at most
+    ``snap_tolerance`` of a window. Boundaries are detected with vectorized
+    numpy passes over the text's code points and looked up with binary
+    search, so chunking is linear in the text size plus the output size.
+
+    :param window_size: Window length in ``unit``s.
+    :param stride: Distance between window starts; ``window_size - stride`` is the overlap.
+    :param unit: "chars" or "tokens".
+    :param snap: "paragraph", "sentence" or "none": the coarsest boundary to snap to.
+    :param snap_tolerance: Fraction of a window a boundary may shorten it by.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 1000,
+        stride: int = 800,
+        unit: str = "chars",
+        snap: str = "sentence",
+        snap_tolerance: float = 0.2,
+    ):
+        if window_size <= 0 or not 0 < stride <= window_size:
+            raise ValueError("Need window_size > 0 and 0 < stride <= window_size")
+        if unit not in ("chars", "tokens"):
+            raise ValueError(f"Unknown unit: {unit}")
+        if snap not in ("paragraph", "sentence", "none"):
+            raise ValueError(f"Unknown snap mode: {snap}")
+
+        self.window_size = window_size
+        self.stride = stride
+        self.unit = unit
+        self.snap = snap
+        self.snap_tolerance = snap_tolerance
+
     def chunk(self, text: str) -> list[str]:
-        # Implement sliding window chunking logic here
-        return [text]
+        return [chunk["text"] for chunk in self.chunk_with_offsets(text)]
+
+    def _tokens(self, text: str):
+        """
+        Start and end offsets of whitespace-delimited tokens, plus boundary
+        token indices: the tokens that open a new paragraph / sentence /
+        word, coarsest first and limited by ``snap``.
+        """
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        space = np.isin(codes, WHITESPACE)
+        filled = ~space
+        starts = np.flatnonzero(filled & np.concatenate(([True], space[:-1])))
+        ends = np.flatnonzero(filled & np.concatenate((space[1:], [True]))) + 1
+        if self.snap == "none" or len(starts) < 2:
+            return starts, ends, []
+
+        # A token ends a sentence if its last character, ignoring one closing
+        # quote or bracket, is terminal punctuation
+        last = codes[ends - 1]
+        before_last = codes[np.maximum(ends - 2, starts)]
+        sentence_end = np.isin(last, SENTENCE_END) | (np.isin(last, CLOSING) & np.isin(before_last, SENTENCE_END))
+        boundaries = [np.flatnonzero(sentence_end[:-1]) + 1, np.arange(1, len(starts))]
+        if self.snap == "paragraph":
+            # Two or more newlines between a token and the next one
+            newlines = np.cumsum(codes == NEWLINE)
+            gap_newlines = newlines[starts[1:] - 1] - newlines[ends[:-1] - 1]
+            boundaries.insert(0, np.flatnonzero(gap_newlines >= 2) + 1)
+        return starts, ends, boundaries
+
+    @staticmethod
+    def _snap(boundaries: list[np.ndarray], target: int, lowest: int) -> int:
+        """
+        Largest boundary in ``(lowest, target]``, trying coarser boundary
+        kinds first; ``target`` itself if there is none.
+        """
+        for positions in boundaries:
+            i = np.searchsorted(positions, target, side="right") - 1
+            if i >= 0 and positions[i] > lowest:
+                return int(positions[i])
+        return target
+
+    def chunk_with_offsets(self, text: str) -> list[dict]:
+        """
+        Chunk ``text`` and report where each chunk came from.
+
+        :return: [{"text": str, "start": int, "end": int}, ...] with
+            ``text == source[start:end]`` (surrounding whitespace trimmed).
+        """
+        starts, ends, boundaries = self._tokens(text)
+        if len(starts) == 0:
+            return []
+        if self.unit == "chars":
+            boundaries = [starts[positions] for positions in boundaries]
+            length = len(text)
+        else:
+            length = len(starts)
+
+        tolerance = int(self.window_size * self.snap_tolerance)
+        chunks = []
+        start = 0
+        while start < length:
+            end = start + self.window_size
+            if end >= length:
+                end = length
+            else:
+                end = self._snap(boundaries, end, max(start, end - tolerance))
+
+            if self.unit == "tokens":
+                char_start, char_end = int(starts[start]), int(ends[end - 1])
+            else:
+                char_start, char_end = start, end
+            while char_start < char_end and text[char_start].isspace():
+                char_start += 1
+            while char_end > char_start and text[char_end - 1].isspace():
+                char_end -= 1
+            if char_start < char_end:
+                chunks.append({"text": text[char_start:char_end], "start": char_start, "end": char_end})
+
+            if end >= length:
+                break
+            target = start + self.stride
+            next_start = self._snap(boundaries, target, max(start, target - tolerance))
+            start = min(next_start, end)
+        return chunks
@@ -1,15 +1,114 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+import numpy as np
+
+from src.observability import telemetry
+
+
 class BaseLLMEngine:
+    # Provider limits for embed(); subclasses override to match their API
+    embedding_dim: int = None
+    embedding_batch_size: int = 100
+    max_concurrent_batches: int = 4
+
     def generate(self, messages: list) -> str:
         raise NotImplementedError
-    
+
+    def warmup(self):
+        """
+        Create clients and open connections ahead of the first request.
+        """
+
+    def generate_stream(self, messages: list, **kwargs) -> Iterator[str]:
+        """
+        Yield the response as text deltas as they are produced. Engines
+        without native streaming yield the full ``generate`` response once.
+        """
+        yield self.generate(messages, **kwargs)
+
     def generate_from_pdf(self, pdf_bytes: list, messages: list) -> str:
         raise NotImplementedError
 
     def generate_from_image(self, image_bytes: list, messages: list) -> str:
         raise NotImplementedError
-    
+
     def generate_from_audio(self, audio_bytes: list, messages: list) -> str:
         raise NotImplementedError
-    
+
     def generate_from_video(self, video_bytes: list, messages: list) -> str:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """
+        Embed one provider-sized batch in a single call.
+
+        :param texts: At most ``embedding_batch_size`` texts.
+        :return: float32 array of shape (len(texts), embedding_dim).
+        """
+        raise NotImplementedError
+
+    def embed(self, texts: list[str], batch_size: int = None, max_concurrency: int = None) -> np.ndarray:
+        """
+        Embed texts by packing them into batches and keeping up to
+        ``max_concurrency`` batches in flight at once.
+
+        :param texts: Texts to embed.
+        :param batch_size: Texts per provider call, defaults to ``embedding_batch_size``.
+        :param max_concurrency: Concurrent provider calls, defaults to ``max_concurrent_batches``.
+        :return: float32 array of shape (len(texts), embedding_dim), in input order.
+        """
+        batch_size = batch_size or self.embedding_batch_size
+        max_concurrency = max_concurrency or self.max_concurrent_batches
+        if batch_size <= 0 or max_concurrency <= 0:
+            raise ValueError("'batch_size' and 'max_concurrency' must be positive integers")
+        if not texts:
+            return np.empty((0, self.embedding_dim or 0), dtype=np.float32)
+
+        telemetry.increment("embedding_texts_total", len(texts))
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        if len(batches) == 1 or max_concurrency == 1:
+            results = [self.embed_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as executor:
+                results = list(executor.map(telemetry.propagate(self.embed_batch), batches))
+        return np.vstack(results).astype(np.float32, copy=False)
+
+
+class AsyncBaseLLMEngine:
+    embedding_dim: int = None
+    embedding_batch_size: int = 100
+    max_concurrent_batches: int = 4
+
+    async def generate(self, messages: list) -> str:
+        raise NotImplementedError
+
+    async def warmup(self):
+        pass
+
+    async def embed_batch(self, texts: list[str]) -> np.ndarray:
+        raise NotImplementedError
+
+    async def embed(self, texts: list[str], batch_size: int = None, max_concurrency: int = None) -> np.ndarray:
+        """
+        asyncio counterpart of BaseLLMEngine.embed: at most ``max_concurrency``
+        embed_batch() calls are awaited concurrently.
+        """
+        batch_size = batch_size or self.embedding_batch_size
+        max_concurrency = max_concurrency or self.max_concurrent_batches
+        if batch_size <= 0 or max_concurrency <= 0:
+            raise ValueError("'batch_size' and 'max_concurrency' must be positive integers")
+        if not texts:
+            return np.empty((0, self.embedding_dim or 0), dtype=np.float32)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(batch):
+            async with semaphore:
+                return await self.embed_batch(batch)
+
+        telemetry.increment("embedding_texts_total", len(texts))
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = await asyncio.gather(*(run(batch) for batch in batches))
+        return np.vstack(results).astype(np.float32, copy=False)
@@ -1,3 +1,19 @@
 class BaseRetriever:
     def retrieve(self, query: str) -> list[str]:
         raise NotImplementedError
+
+    def retrieve_documents(self, query: str, query_vector=None) -> list[dict]:
+        """
+        Like retrieve(), but return the matching documents (at least "text",
+        plus "_id" and metadata where the store provides them). Callers that
+        already embedded the query can pass ``query_vector`` to skip re-embedding.
+        """
+        return [{"text": text} for text in self.retrieve(query)]
+
+
+class AsyncBaseRetriever:
+    async def retrieve(self, query: str) -> list[str]:
+        raise NotImplementedError
+
+    async def retrieve_documents(self, query: str, query_vector=None) -> list[dict]:
+        return [{"text": text} for text in await self.retrieve(query)]
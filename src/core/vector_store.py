@@ -1,6 +1,79 @@
+import numpy as np
+
+
 class BaseVectorStore:
     def add_documents(self, docs: list):
         raise NotImplementedError
 
     def similarity_search(self, query: list[float], k: int):
+        """
+        The ``k`` nearest documents, each with its "text", metadata, "_id"
+        and "_score", the cosine similarity to ``query`` in [-1, 1].
+        """
+        raise NotImplementedError
+
+    def similarity_search_batch(self, query_vectors, k: int, filters: dict = None, **search_options) -> list[list[dict]]:
+        """
+        Search for several query vectors (a 2-D array or a list of vectors)
+        at once, returning one scored result list per query, in order.
+        Stores override this with a single batched request; the default
+        runs ``similarity_search`` per query.
+        """
+        return [
+            self.similarity_search(vector, k, filters, **search_options)
+            for vector in np.asarray(query_vectors, dtype=np.float32).tolist()
+        ]
+
+    def delete_documents(self, ids: list[str]):
+        raise NotImplementedError
+
+    def get_ids(self, filters: dict = None) -> set[str]:
+        """
+        Ids of the stored documents matching the metadata ``filters``.
+        """
+        raise NotImplementedError
+
+    def update_metadata(self, ids: list[str], metadata: dict) -> int:
+        """
+        Merge ``metadata`` into the metadata of the documents with the given
+        ids, without touching their text or vectors; unknown ids are ignored.
+        Returns the number of documents updated.
+        """
+        raise NotImplementedError
+
+    def warmup(self):
+        """
+        Establish connections and load data ahead of the first request.
+        """
+
+    def add_change_listener(self, listener):
+        """
+        Register ``listener(event, ids)``, called after the index changes.
+        ``event`` is "add" or "delete"; ``ids`` lists the affected document
+        ids, or is None when the store does not know them.
+        """
+        self.__dict__.setdefault("_change_listeners", []).append(listener)
+
+    def _notify_change(self, event: str, ids: list = None):
+        for listener in self.__dict__.get("_change_listeners", ()):
+            listener(event, ids)
+
+
+class AsyncBaseVectorStore:
+    async def add_documents(self, docs: list):
         raise NotImplementedError
+
+    async def similarity_search(self, query: list[float], k: int):
+        raise NotImplementedError
+
+    async def similarity_search_batch(self, query_vectors, k: int, filters: dict = None, **search_options) -> list[list[dict]]:
+        return [
+            await self.similarity_search(vector, k, filters, **search_options)
+            for vector in np.asarray(query_vectors, dtype=np.float32).tolist()
+        ]
+
+    async def warmup(self):
+        pass
+
+    add_change_listener = BaseVectorStore.add_change_listener
+    _notify_change = BaseVectorStore._notify_change
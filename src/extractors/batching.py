@@ -0,0 +1,96 @@
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from src.observability import telemetry
+from src.utils.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+def pack_batches(sizes: list[int], max_items: int, max_bytes: int) -> list[list[int]]:
+    """
+    Group consecutive item indices into batches of at most ``max_items``
+    items and ``max_bytes`` total size. An item larger than ``max_bytes``
+    gets a batch of its own.
+    """
+    batches, current, current_bytes = [], [], 0
+    for index, size in enumerate(sizes):
+        if current and (len(current) == max_items or current_bytes + size > max_bytes):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(index)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def split_sections(response: str, numbers: list[int], label: str = "Item") -> dict[int, str]:
+    """
+    Split a response with "=== <label> N ===" headers into text per number.
+    Numbers without a section are missing from the result; a single number
+    gets the whole response.
+    """
+    if len(numbers) == 1:
+        return {numbers[0]: response.strip()}
+    pattern = re.compile(rf"^=== {label} (\d+) ===[ \t]*$", re.MULTILINE)
+    parts = pattern.split(response)
+    # parts = [preamble, number, text, number, text, ...]
+    sections = {int(number): text.strip() for number, text in zip(parts[1::2], parts[2::2])}
+    return {number: sections[number] for number in numbers if number in sections}
+
+
+def extract_batched(
+    blobs: list[bytes],
+    generate: Callable[[list[bytes], list[dict]], str],
+    system_prompt: str,
+    instruction: str,
+    max_items: int = 8,
+    max_bytes: int = 16 * 1024 * 1024,
+    max_concurrency: int = 4,
+    rate_limiter: RateLimiter = None,
+) -> list[str]:
+    """
+    Run ``generate(blobs, messages)`` over size-bounded batches of ``blobs``
+    concurrently and return one text per blob, in input order.
+
+    A batch of one uses ``instruction`` as is, so its output matches a
+    single-item request. Larger batches ask the model to head each item with
+    "=== Item N ==="; items whose section is missing from the response are
+    retried on their own.
+    """
+
+    def call(indices: list[int]) -> dict[int, str]:
+        if len(indices) == 1:
+            prompt = instruction
+        else:
+            prompt = (
+                f"{instruction}\n\nThere are {len(indices)} attachments, numbered 1 to {len(indices)} in order. "
+                f"Answer for each attachment separately, starting each answer with a line '=== Item N ===' "
+                f"where N is the attachment number."
+            )
+        messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}]
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        response = generate([blobs[index] for index in indices], messages)
+        sections = split_sections(response, list(range(1, len(indices) + 1)))
+        return {index: sections[number] for number, index in enumerate(indices, start=1) if number in sections}
+
+    def run(indices: list[int]) -> dict[int, str]:
+        results = call(indices)
+        missing = [index for index in indices if index not in results]
+        if missing:
+            logger.warning(f"Batched response is missing {len(missing)} of {len(indices)} items; retrying them one by one")
+            for index in missing:
+                results.update(call([index]))
+        return results
+
+    batches = pack_batches([len(blob) for blob in blobs], max_items, max_bytes)
+    logger.info(f"Extracting {len(blobs)} items in {len(batches)} requests")
+    texts: dict[int, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(batches)))) as pool:
+        for results in pool.map(telemetry.propagate(run), batches):
+            texts.update(results)
+    return [texts[index] for index in range(len(blobs))]
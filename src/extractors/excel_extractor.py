@@ -1,46 +1,170 @@
-from typing import List, Dict, Any
-import pandas as pd
+from typing import Iterator, Union
 import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import openpyxl
+
 from src.core.extractor import BaseExtractor
+from src.utils.tempfiles import as_path
 
 import logging
 # Configure logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+
+
+def _cell(value, as_markdown: bool) -> str:
+    if value is None:
+        return ""
+    text = str(value).replace("\n", " ")
+    return text.replace("|", "\\|") if as_markdown else text
+
+
+def _render(sheet_name: str, first_row: int, last_row: int, header: list[str], rows: list[list[str]], as_markdown: bool) -> str:
+    if rows:
+        lines = [f"### Sheet: {sheet_name} (rows {first_row}-{last_row})\n"]
+    else:
+        lines = [f"### Sheet: {sheet_name} (no data rows)\n"]
+    # Rows read before a wider row extended the header are padded to its width
+    rows = [row + [""] * (len(header) - len(row)) for row in rows]
+    if as_markdown:
+        lines.append("| " + " | ".join(header) + " |")
+        lines.append("|" + "---|" * len(header))
+        lines.extend("| " + " | ".join(row) + " |" for row in rows)
+    else:
+        lines.append("\t".join(header))
+        lines.extend("\t".join(row) for row in rows)
+    return "\n".join(lines) + "\n"
+
+
+def _width(row) -> int:
+    # Read-only worksheets pad rows with empty cells up to the sheet's last column
+    width = len(row)
+    while width and row[width - 1] is None:
+        width -= 1
+    return width
+
+
+def _sheet_fragments(source, sheet_name: str, rows_per_block: int, as_markdown: bool) -> Iterator[str]:
+    """
+    Stream one sheet in blocks of ``rows_per_block`` rows, each rendered as a
+    self-contained table that repeats the header (first) row. Cells beyond
+    the header get generated column names ("Column 5"); a sheet with a
+    header but no data rows is emitted as the header alone.
+    """
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None or _width(header) == 0:
+            return
+        header = [_cell(value, as_markdown) for value in header[:_width(header)]]
+        block, first_row, last_row, emitted = [], 2, 1, False
+        for row_no, row in enumerate(rows, start=2):
+            width = _width(row)
+            if width == 0:
+                continue
+            if not block:
+                first_row = row_no
+            header.extend(f"Column {column}" for column in range(len(header) + 1, width + 1))
+            block.append([_cell(value, as_markdown) for value in row[:width]])
+            last_row = row_no
+            if len(block) == rows_per_block:
+                yield _render(sheet_name, first_row, last_row, header, block, as_markdown)
+                block, emitted = [], True
+        if block or not emitted:
+            yield _render(sheet_name, first_row, last_row, header, block, as_markdown)
+    finally:
+        workbook.close()
+
+
+def _stream_sheet(path: str, sheet_name: str, rows_per_block: int, as_markdown: bool, out):
+    # Module-level so it can run in a process pool; results go through ``out``
+    # so a worker blocks once its queue is full instead of buffering the sheet.
+    try:
+        for fragment in _sheet_fragments(path, sheet_name, rows_per_block, as_markdown):
+            out.put(("fragment", fragment))
+        out.put(("done", None))
+    except Exception as e:
+        out.put(("error", f"{type(e).__name__}: {e}"))
+
 
 class ExcelExtractor(BaseExtractor):
-    def extract(self, file_bytes: bytes, as_markdown: bool = True) -> str:
+    """
+    Streams .xlsx workbooks with openpyxl in read-only mode, so rows are
+    parsed incrementally instead of materializing each sheet as a DataFrame.
+
+    Sheets are emitted in workbook order as fragments of ``rows_per_block``
+    rows with the header repeated, small enough to chunk directly. With more
+    than one sheet and ``max_workers`` > 1, sheets are parsed in parallel
+    worker processes; each worker buffers at most ``queue_size`` fragments
+    ahead of the consumer.
+    """
+
+    def __init__(self, rows_per_block: int = 200, max_workers: int = None, queue_size: int = 8):
+        if rows_per_block <= 0:
+            raise ValueError("'rows_per_block' must be a positive integer")
+        self.rows_per_block = rows_per_block
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+
+    def extract(self, file_bytes: Union[bytes, str], as_markdown: bool = True) -> str:
         """
         Convert Excel file (from bytes) to string representation.
 
         Args:
-            file_bytes (bytes): Bytes of the Excel file.
-            as_markdown (bool): If True, format as markdown table; else plain text.
+            file_bytes (bytes | str): Bytes of the Excel file, or its path.
+            as_markdown (bool): If True, format as markdown tables; else tab-separated text.
 
         Returns:
             str: Formatted text representation of Excel file.
         """
-        try:
-            xls = pd.ExcelFile(io.BytesIO(file_bytes))
-            result = []
-
-            for sheet_name in xls.sheet_names:
-                df = xls.parse(sheet_name)
-
-                df = df.astype(str)
-                df = df.replace("nan", "", regex=False)  # Replace "nan" with empty string
-
-                result.append(f"### Sheet: {sheet_name}\n")
+        return "\n".join(self.extract_stream(file_bytes, as_markdown=as_markdown))
 
-                if as_markdown:
-                    table_str = df.to_markdown(index=False)
-                else:
-                    table_str = df.to_string(index=False)
+    def extract_stream(self, file_bytes: Union[bytes, str], as_markdown: bool = True) -> Iterator[str]:
+        """
+        Yield the workbook as markdown (or tab-separated) fragments, see the class docstring.
+        """
+        try:
+            source = io.BytesIO(file_bytes) if isinstance(file_bytes, bytes) else file_bytes
+            workbook = openpyxl.load_workbook(source, read_only=True)
+            sheet_names = workbook.sheetnames
+            workbook.close()
 
-                result.append(table_str + "\n")
+            if len(sheet_names) == 1 or self.max_workers == 1:
+                for sheet_name in sheet_names:
+                    if isinstance(source, io.BytesIO):
+                        source.seek(0)
+                    yield from _sheet_fragments(source, sheet_name, self.rows_per_block, as_markdown)
+            else:
+                yield from self._extract_parallel(file_bytes, sheet_names, as_markdown)
             logger.info("Excel extraction completed successfully.")
         except Exception as e:
             logger.error(f"Failed to extract text from Excel file: {e}")
             raise RuntimeError(f"Failed to extract text from Excel file: {e}")
-        
-        return "\n".join(result)
\ No newline at end of file
+
+    def _extract_parallel(self, file_bytes: Union[bytes, str], sheet_names: list[str], as_markdown: bool) -> Iterator[str]:
+        with as_path(file_bytes, suffix=".xlsx") as path:
+            yield from self._stream_sheets(path, sheet_names, as_markdown)
+
+    def _stream_sheets(self, path: str, sheet_names: list[str], as_markdown: bool) -> Iterator[str]:
+        manager = multiprocessing.Manager()
+        pool = ProcessPoolExecutor(max_workers=min(self.max_workers, len(sheet_names)))
+        try:
+            # Sheets are submitted in order, so the sheet being consumed is always running
+            queues = [manager.Queue(maxsize=self.queue_size) for _ in sheet_names]
+            for sheet_name, out in zip(sheet_names, queues):
+                pool.submit(_stream_sheet, path, sheet_name, self.rows_per_block, as_markdown, out)
+            for sheet_name, out in zip(sheet_names, queues):
+                while True:
+                    kind, payload = out.get()
+                    if kind == "done":
+                        break
+                    if kind == "error":
+                        raise RuntimeError(f"Sheet '{sheet_name}': {payload}")
+                    yield payload
+        finally:
+            # Shutting the manager down first unblocks workers stuck on a full queue
+            manager.shutdown()
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -1,15 +1,38 @@
 from typing import List, Dict, Any
 from src.core.extractor import BaseExtractor
 from src.core.llm_engine import BaseLLMEngine
+from src.extractors.batching import extract_batched
+from src.utils.rate_limiter import RateLimiter
 
 import logging
 # Configure logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+
+SYSTEM_PROMPT = "You are an AI model that extracts text from images."
+INSTRUCTION = "Extract text from the following image as it is"
+
 
 class ImageExtractorAI(BaseExtractor):
-    def __init__(self, llm_engine: 'BaseLLMEngine'):
+    """
+    :param max_items_per_request: Images packed into one request by ``extract_batch``.
+    :param max_request_bytes: Upper bound on the image bytes in one request.
+    :param max_concurrency: Batched requests in flight at once.
+    :param rate_limiter: Optional RateLimiter, one token per request.
+    """
+
+    def __init__(
+        self,
+        llm_engine: 'BaseLLMEngine',
+        max_items_per_request: int = 8,
+        max_request_bytes: int = 16 * 1024 * 1024,
+        max_concurrency: int = 4,
+        rate_limiter: RateLimiter = None,
+    ):
         self.llm_engine = llm_engine
+        self.max_items_per_request = max_items_per_request
+        self.max_request_bytes = max_request_bytes
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
 
     def extract(self, image_bytes: bytes) -> str:
         """
@@ -21,11 +44,11 @@ class ImageExtractorAI(BaseExtractor):
             messages = [
                 {
                     "role": "system",
-                    "content": "You are an AI model that extracts text from images."
+                    "content": SYSTEM_PROMPT
                 },
                 {
                     "role": "user",
-                    "content": f"Extract text from the following image as it is"
+                    "content": INSTRUCTION
                 }
             ]
 
@@ -35,4 +58,29 @@ class ImageExtractorAI(BaseExtractor):
             logger.error(f"Failed to extract text from image: {e}")
             raise RuntimeError(f"Failed to extract text from image: {e}")
 
-        return response
\ No newline at end of file
+        return response
+
+    def extract_batch(self, images: List[bytes]) -> List[str]:
+        """
+        Extract text from many images, several per model request, see
+        src.extractors.batching.extract_batched.
+        :param images: The bytes of each image file (any format the engine accepts).
+        :return: Extracted text per image, in input order.
+        """
+        try:
+            texts = extract_batched(
+                images,
+                lambda blobs, messages: self.llm_engine.generate_from_image(image_bytes=blobs, messages=messages),
+                SYSTEM_PROMPT,
+                INSTRUCTION,
+                max_items=self.max_items_per_request,
+                max_bytes=self.max_request_bytes,
+                max_concurrency=self.max_concurrency,
+                rate_limiter=self.rate_limiter,
+            )
+            logger.info(f"Batched text extraction from {len(images)} images completed successfully.")
+        except Exception as e:
+            logger.error(f"Failed to extract text from images: {e}")
+            raise RuntimeError(f"Failed to extract text from images: {e}")
+
+        return texts
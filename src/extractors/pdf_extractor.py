@@ -1,21 +1,212 @@
-from typing import List, Dict, Any
+from typing import Iterator, Union
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from src.core.extractor import BaseExtractor
 from src.core.llm_engine import BaseLLMEngine
+from src.extractors.batching import extract_batched, split_sections
+from src.observability import telemetry
+from src.utils.rate_limiter import RateLimiter
+from src.utils.tempfiles import as_path
 
 import logging
 # Configure logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+
+SYSTEM_PROMPT = "You are an AI model that extracts text from PDF files."
+INSTRUCTION = "Extract text from the following PDF as it is"
+
+
+def _page_count(path: str) -> int:
+    from pypdf import PdfReader
+    return len(PdfReader(path).pages)
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> list[dict]:
+    # Module-level so it can run in a process pool; the PDF is parsed once per range
+    from pypdf import PdfReader
+    reader = PdfReader(path)
+    results = []
+    for page_no in range(start, stop):
+        started = time.perf_counter()
+        text = reader.pages[page_no].extract_text() or ""
+        results.append({"page": page_no + 1, "text": text, "seconds": time.perf_counter() - started, "method": "text"})
+    return results
+
+
+def _single_page_pdfs(path: str, pages: list[int]) -> list[bytes]:
+    from pypdf import PdfReader, PdfWriter
+    reader = PdfReader(path)
+    blobs = []
+    for page in pages:
+        writer = PdfWriter()
+        writer.add_page(reader.pages[page - 1])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        blobs.append(buffer.getvalue())
+    return blobs
+
+
+def _page_range_pdfs(pdf_bytes: bytes, pages_per_item: int) -> list[bytes]:
+    """
+    Split a PDF into PDFs of at most ``pages_per_item`` consecutive pages.
+    """
+    from pypdf import PdfReader, PdfWriter
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    parts = []
+    for start in range(0, len(reader.pages), pages_per_item):
+        writer = PdfWriter()
+        for page in reader.pages[start:start + pages_per_item]:
+            writer.add_page(page)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        parts.append(buffer.getvalue())
+    return parts
+
 
 class PDFExtractor(BaseExtractor):
-    def extract(self, file_path: str) -> str:
-        # Implement PDF extraction logic here
-        return "PDF text"
+    """
+    Extracts the PDF text layer locally with pypdf.
+
+    Pages are extracted in ranges of ``pages_per_task`` across a process
+    pool and yielded by ``extract_pages`` as they finish, each with its
+    extraction time. Pages with fewer than ``min_chars`` characters of text
+    (scanned pages) are sent to ``llm_engine.generate_from_pdf`` as
+    single-page PDFs, ``fallback_batch_size`` pages per request, while the
+    remaining pages are still being extracted. Without an ``llm_engine``
+    such pages are returned empty.
+    """
+
+    def __init__(
+        self,
+        llm_engine: 'BaseLLMEngine' = None,
+        max_workers: int = None,
+        pages_per_task: int = 8,
+        min_chars: int = 1,
+        fallback_batch_size: int = 8,
+        fallback_workers: int = 2,
+    ):
+        self.llm_engine = llm_engine
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task
+        self.min_chars = min_chars
+        self.fallback_batch_size = fallback_batch_size
+        self.fallback_workers = fallback_workers
+
+    def extract(self, file_path: Union[str, bytes]) -> str:
+        """
+        Extract the text of every page, in page order.
+        :param file_path: Path of the PDF file, or its bytes.
+        :return: Page texts separated by blank lines.
+        """
+        started = time.perf_counter()
+        pages = sorted(self.extract_pages(file_path), key=lambda page: page["page"])
+        n_llm = sum(page["method"] == "llm" for page in pages)
+        slowest = max(pages, key=lambda page: page["seconds"], default=None)
+        logger.info(
+            f"Extracted {len(pages)} PDF pages ({n_llm} via LLM) in {time.perf_counter() - started:.2f}s"
+            + (f", slowest page {slowest['page']} ({slowest['seconds']:.2f}s)" if slowest else "")
+        )
+        return "\n\n".join(page["text"] for page in pages if page["text"])
+
+    def extract_pages(self, file_path: Union[str, bytes]) -> Iterator[dict]:
+        """
+        Yield {"page", "text", "seconds", "method": "text" | "llm"} per page,
+        in completion order.
+        """
+        try:
+            with as_path(file_path, suffix=".pdf") as path:
+                yield from self._extract_pages(path)
+        except Exception as e:
+            logger.error(f"Failed to extract text from PDF: {e}")
+            raise RuntimeError(f"Failed to extract text from PDF: {e}")
+
+    def _extract_pages(self, path: str) -> Iterator[dict]:
+        n_pages = _page_count(path)
+        ranges = [(start, min(start + self.pages_per_task, n_pages)) for start in range(0, n_pages, self.pages_per_task)]
+        scanned, fallbacks = [], []
+        fallback_pool = ThreadPoolExecutor(max_workers=self.fallback_workers) if self.llm_engine is not None else None
+
+        def on_page(page: dict):
+            if len(page["text"].strip()) >= self.min_chars or fallback_pool is None:
+                return page
+            scanned.append(page["page"])
+            if len(scanned) == self.fallback_batch_size:
+                fallbacks.append(fallback_pool.submit(telemetry.propagate(self._extract_scanned), path, scanned[:]))
+                scanned.clear()
+            return None
+
+        try:
+            if len(ranges) <= 1 or self.max_workers == 1:
+                for start, stop in ranges:
+                    yield from filter(None, map(on_page, _extract_page_range(path, start, stop)))
+            else:
+                with ProcessPoolExecutor(max_workers=min(self.max_workers, len(ranges))) as pool:
+                    futures = [pool.submit(_extract_page_range, path, start, stop) for start, stop in ranges]
+                    for future in as_completed(futures):
+                        yield from filter(None, map(on_page, future.result()))
+
+            if scanned:
+                fallbacks.append(fallback_pool.submit(telemetry.propagate(self._extract_scanned), path, scanned[:]))
+            for future in as_completed(fallbacks):
+                yield from future.result()
+        finally:
+            if fallback_pool is not None:
+                fallback_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _extract_scanned(self, path: str, pages: list[int]) -> list[dict]:
+        """
+        Extract pages without a text layer with one LLM request.
+        """
+        started = time.perf_counter()
+        numbers = ", ".join(map(str, pages))
+        messages = [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": (
+                    f"Extract the text of each attached single-page PDF as it is. The attachments are pages "
+                    f"{numbers}, in that order. Start each page with a line '=== Page N ===' using its page number."
+                )
+            }
+        ]
+        response = self.llm_engine.generate_from_pdf(pdf_bytes=_single_page_pdfs(path, pages), messages=messages)
+        texts = split_sections(response, pages, label="Page")
+        seconds = (time.perf_counter() - started) / len(pages)
+        logger.debug(f"Extracted scanned PDF pages {numbers} via LLM")
+        return [{"page": page, "text": texts.get(page, ""), "seconds": seconds, "method": "llm"} for page in pages]
 
 class PDFExtractionAI(BaseExtractor):
-    def __init__(self, llm_engine: 'BaseLLMEngine'):
+    """
+    :param pages_per_item: If set, ``extract_batch`` splits each PDF into
+        page ranges of this size (needs pypdf) so large documents are spread
+        over several requests.
+    :param max_items_per_request: PDFs or page ranges packed into one request.
+    :param max_request_bytes: Upper bound on the PDF bytes in one request.
+    :param max_concurrency: Batched requests in flight at once.
+    :param rate_limiter: Optional RateLimiter, one token per request.
+    """
+
+    def __init__(
+        self,
+        llm_engine: 'BaseLLMEngine',
+        pages_per_item: int = None,
+        max_items_per_request: int = 8,
+        max_request_bytes: int = 16 * 1024 * 1024,
+        max_concurrency: int = 4,
+        rate_limiter: RateLimiter = None,
+    ):
         self.llm_engine = llm_engine
-        
+        self.pages_per_item = pages_per_item
+        self.max_items_per_request = max_items_per_request
+        self.max_request_bytes = max_request_bytes
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+
     def extract(self, pdf_bytes: bytes) -> str:
         """
         Extract text from a PDF file using an AI model.
@@ -26,11 +217,11 @@ class PDFExtractionAI(BaseExtractor):
             messages = [
                 {
                     "role": "system",
-                    "content": "You are an AI model that extracts text from PDF files."
+                    "content": SYSTEM_PROMPT
                 },
                 {
                     "role": "user",
-                    "content": f"Extract text from the following PDF as it is"
+                    "content": INSTRUCTION
                 }
             ]
 
@@ -40,4 +231,38 @@ class PDFExtractionAI(BaseExtractor):
             logger.error(f"Failed to extract text from PDF: {e}")
             raise RuntimeError(f"Failed to extract text from PDF: {e}")
 
-        return response
\ No newline at end of file
+        return response
+
+    def extract_batch(self, pdfs: list[bytes]) -> list[str]:
+        """
+        Extract text from many PDFs, several (or several page ranges) per
+        model request, see src.extractors.batching.extract_batched.
+        :param pdfs: The bytes of each PDF file.
+        :return: Extracted text per PDF, in input order.
+        """
+        try:
+            items, owners = [], []
+            for index, pdf in enumerate(pdfs):
+                parts = _page_range_pdfs(pdf, self.pages_per_item) if self.pages_per_item else [pdf]
+                items.extend(parts)
+                owners.extend([index] * len(parts))
+
+            texts = extract_batched(
+                items,
+                lambda blobs, messages: self.llm_engine.generate_from_pdf(pdf_bytes=blobs, messages=messages),
+                SYSTEM_PROMPT,
+                INSTRUCTION,
+                max_items=self.max_items_per_request,
+                max_bytes=self.max_request_bytes,
+                max_concurrency=self.max_concurrency,
+                rate_limiter=self.rate_limiter,
+            )
+            per_pdf = [[] for _ in pdfs]
+            for owner, text in zip(owners, texts):
+                per_pdf[owner].append(text)
+            logger.info(f"Batched text extraction from {len(pdfs)} PDFs completed successfully.")
+        except Exception as e:
+            logger.error(f"Failed to extract text from PDFs: {e}")
+            raise RuntimeError(f"Failed to extract text from PDFs: {e}")
+
+        return ["\n\n".join(parts) for parts in per_pdf]
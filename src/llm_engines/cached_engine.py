@@ -0,0 +1,72 @@
+import logging
+from typing import List, Dict, Any, Iterator
+
+import numpy as np
+
+from src.cache.embedding_cache import EmbeddingCache
+from src.core.llm_engine import BaseLLMEngine
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class CachedEmbeddingEngine(BaseLLMEngine):
+    """
+    Wraps an engine so that embed() only sends texts missing from an
+    EmbeddingCache to the provider. Generation calls pass straight through.
+    """
+
+    def __init__(self, engine: BaseLLMEngine, cache: EmbeddingCache):
+        self.engine = engine
+        self.cache = cache
+        self.embedding_dim = engine.embedding_dim
+        self.embedding_batch_size = engine.embedding_batch_size
+        self.max_concurrent_batches = engine.max_concurrent_batches
+        # The cache key must change whenever the vectors would
+        self.cache_model = getattr(engine, "embedding_model", None) or getattr(engine, "model", repr(engine))
+
+    def __getattr__(self, name):
+        if name == "engine":
+            raise AttributeError(name)
+        return getattr(self.engine, name)
+
+    def warmup(self):
+        self.engine.warmup()
+
+    def embed(self, texts: List[str], batch_size: int = None, max_concurrency: int = None) -> np.ndarray:
+        cached = self.cache.get_many(self.cache_model, texts)
+        # Embed each distinct missing text once
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, cached) if vector is None))
+        if missing:
+            logger.debug(f"Embedding cache miss for {len(missing)} of {len(texts)} texts")
+            fresh = self.engine.embed(missing, batch_size=batch_size, max_concurrency=max_concurrency)
+            self.cache.put_many(self.cache_model, missing, fresh)
+            by_text = dict(zip(missing, fresh))
+            cached = [by_text[text] if vector is None else vector for text, vector in zip(texts, cached)]
+        if not texts:
+            return np.empty((0, self.embedding_dim or 0), dtype=np.float32)
+        return np.vstack(cached).astype(np.float32, copy=False)
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        return self.embed(texts)
+
+    def generate(self, messages: List[Dict[Any, Any]], **kwargs) -> str:
+        return self.engine.generate(messages, **kwargs)
+
+    def generate_stream(self, messages: List[Dict[Any, Any]], **kwargs) -> Iterator[str]:
+        return self.engine.generate_stream(messages, **kwargs)
+
+    def generate_from_pdf(self, pdf_bytes: List[bytes], messages: List[Dict[Any, Any]], **kwargs) -> str:
+        return self.engine.generate_from_pdf(pdf_bytes, messages, **kwargs)
+
+    def generate_from_image(self, image_bytes: List[bytes], messages: List[Dict[Any, Any]], **kwargs) -> str:
+        return self.engine.generate_from_image(image_bytes, messages, **kwargs)
+
+    def generate_from_audio(self, audio_bytes: List[bytes], messages: List[Dict[Any, Any]], **kwargs) -> str:
+        return self.engine.generate_from_audio(audio_bytes, messages, **kwargs)
+
+    def generate_from_video(self, video_bytes: List[bytes], messages: List[Dict[Any, Any]], **kwargs) -> str:
+        return self.engine.generate_from_video(video_bytes, messages, **kwargs)
+
+    def __repr__(self):
+        return f"CachedEmbedding({self.engine!r})"
@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+from typing import List, Dict, Any, Iterator
+
+import numpy as np
+
+from src.core.llm_engine import BaseLLMEngine, AsyncBaseLLMEngine
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class FakeProviderError(Exception):
+    """
+    Simulated provider error carrying an HTTP-style ``code``, like the
+    google.api_core and google.genai exceptions.
+    """
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FakeLLMEngine(BaseLLMEngine):
+    """
+    Deterministic offline engine for local runs and benchmarks.
+
+    Embeddings are unit vectors seeded from a hash of the text, so the same
+    text always maps to the same vector across processes. ``embed_latency``
+    and ``generate_latency`` (seconds per call) simulate provider round trips
+    so the batching and concurrency paths behave as they would online.
+
+    For load and resilience tests, a fraction ``slow_rate`` of calls takes
+    ``slow_latency`` seconds longer (a latency tail), ``throttle_rate`` of
+    calls fail with 429 RESOURCE_EXHAUSTED and ``error_rate`` with 503
+    UNAVAILABLE. ``calls`` counts the provider calls made.
+    """
+
+    def __init__(
+        self,
+        model: str = "fake",
+        embedding_dim: int = 768,
+        embedding_batch_size: int = 100,
+        max_concurrent_batches: int = 4,
+        embed_latency: float = 0.0,
+        generate_latency: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 0.0,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = None,
+    ):
+        self.model = model
+        self.embedding_dim = embedding_dim
+        self.embedding_batch_size = embedding_batch_size
+        self.max_concurrent_batches = max_concurrent_batches
+        self.embed_latency = embed_latency
+        self.generate_latency = generate_latency
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _simulate_call(self, latency: float):
+        """
+        Count the call, sleep for its simulated latency and raise an injected error, if any.
+        """
+        with self._lock:
+            self.calls += 1
+            slow, outcome = self._random.random() < self.slow_rate, self._random.random()
+        if slow:
+            latency += self.slow_latency
+        if latency:
+            time.sleep(latency)
+        if outcome < self.throttle_rate:
+            raise FakeProviderError(429, "RESOURCE_EXHAUSTED: simulated quota exceeded")
+        if outcome < self.throttle_rate + self.error_rate:
+            raise FakeProviderError(503, "UNAVAILABLE: simulated server error")
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+        vector = np.random.default_rng(seed).standard_normal(self.embedding_dim, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        self._simulate_call(self.embed_latency)
+        return np.stack([self._embed_one(text) for text in texts])
+
+    def generate(self, messages: List[Dict[Any, Any]], **kwargs) -> str:
+        """
+        Return a canned answer that echoes the tail of the last message.
+        """
+        self._simulate_call(self.generate_latency)
+        return self._answer(messages)
+
+    def generate_stream(self, messages: List[Dict[Any, Any]], **kwargs) -> Iterator[str]:
+        """
+        Yield the canned answer word by word, spreading ``generate_latency`` over the words.
+        """
+        # Injected errors and the latency tail hit before the first word, like a failed request
+        self._simulate_call(0.0)
+        words = self._answer(messages).split(" ")
+        for i, word in enumerate(words):
+            if self.generate_latency:
+                time.sleep(self.generate_latency / len(words))
+            yield word if i == 0 else " " + word
+
+    def _answer(self, messages: List[Dict[Any, Any]]) -> str:
+        prompt = messages[-1].get("content", "") if messages else ""
+        return f"[{self.model}] answer to: {prompt[-200:]}"
+
+    def __repr__(self):
+        return f"FakeLLM(model_name={self.model}, embedding_dim={self.embedding_dim})"
+
+
+class AsyncFakeLLMEngine(AsyncBaseLLMEngine):
+    """
+    asyncio variant of FakeLLMEngine; simulated latency uses asyncio.sleep.
+    """
+
+    def __init__(self, **kwargs):
+        self.engine = FakeLLMEngine(**kwargs)
+        self.model = self.engine.model
+        self.embedding_dim = self.engine.embedding_dim
+        self.embedding_batch_size = self.engine.embedding_batch_size
+        self.max_concurrent_batches = self.engine.max_concurrent_batches
+
+    async def embed_batch(self, texts: List[str]) -> np.ndarray:
+        if self.engine.embed_latency:
+            await asyncio.sleep(self.engine.embed_latency)
+        return np.stack([self.engine._embed_one(text) for text in texts])
+
+    async def generate(self, messages: List[Dict[Any, Any]], **kwargs) -> str:
+        if self.engine.generate_latency:
+            await asyncio.sleep(self.engine.generate_latency)
+        return self.engine._answer(messages)
+
+    def __repr__(self):
+        return f"AsyncFakeLLM(model_name={self.model}, embedding_dim={self.embedding_dim})"
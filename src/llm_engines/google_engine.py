@@ -1,32 +1,125 @@
+import asyncio
 import logging
 import os
-from dotenv import load_dotenv
-from typing import Optional, List, Dict, Any
+import numpy as np
+from typing import Optional, List, Dict, Any, Iterator
 
-import vertexai
-from google import genai, generativeai
-from google.cloud import aiplatform
-from google.oauth2 import service_account
-from vertexai.generative_models import GenerativeModel, Part
-
-from src.core.llm_engine import BaseLLMEngine
-
-load_dotenv()
+from src.core.llm_engine import BaseLLMEngine, AsyncBaseLLMEngine
+from src.observability import telemetry
+from src.utils.client_registry import get_client
+from src.utils.mime import sniff_mime
 
 # Configure logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+
+# Provider SDKs are imported on first use and clients come from the
+# process-wide registry, so importing this module is cheap and engines in
+# the same process share clients and their connection pools.
+
+
+def _load_dotenv():
+    def load():
+        from dotenv import load_dotenv
+        return load_dotenv()
+    get_client("dotenv", load)
+
+
+def _service_account_credentials(credentials_path: str):
+    def create():
+        from google.oauth2 import service_account
+        return service_account.Credentials.from_service_account_file(credentials_path)
+    return get_client("google-credentials", create, credentials_path=credentials_path)
+
+
+def _genai_client(api_key: str = None, project: str = None, location: str = None, credentials_path: str = None):
+    """
+    Shared genai.Client, for an API key or for Vertex AI with service account credentials.
+    """
+    def create():
+        from google import genai
+        if api_key:
+            return genai.Client(api_key=api_key)
+        return genai.Client(
+            vertexai=True,
+            credentials=_service_account_credentials(credentials_path),
+            project=project,
+            location=location,
+        )
+    return get_client(
+        "genai", create, api_key=api_key, project=project, location=location, credentials_path=credentials_path
+    )
+
+
+def _vertexai_model(model: str, project: str, location: str, credentials_path: str):
+    """
+    Shared Vertex AI GenerativeModel; the SDK is initialized once per project and location.
+    """
+    def init():
+        from google.cloud import aiplatform
+        aiplatform.init(project=project, location=location, credentials=_service_account_credentials(credentials_path))
+        return True
+
+    def create():
+        from vertexai.generative_models import GenerativeModel
+        get_client("vertexai-init", init, project=project, location=location, credentials_path=credentials_path)
+        return GenerativeModel(model_name=model)
+    return get_client("vertexai-model", create, model=model, project=project, location=location, credentials_path=credentials_path)
+
+
+def _vertexai_embedding_model(model: str):
+    def create():
+        from vertexai.language_models import TextEmbeddingModel
+        return TextEmbeddingModel.from_pretrained(model)
+    return get_client("vertexai-embedding", create, model=model)
+
+def _record_usage(response):
+    # Both SDKs report token counts on the response (the last chunk when streaming)
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    prompt_tokens = getattr(usage, "prompt_token_count", None) or 0
+    completion_tokens = getattr(usage, "candidates_token_count", None) or 0
+    if prompt_tokens:
+        telemetry.increment("llm_tokens_total", prompt_tokens, provider="google", kind="prompt")
+    if completion_tokens:
+        telemetry.increment("llm_tokens_total", completion_tokens, provider="google", kind="completion")
+
+
+def _response_text(response) -> str:
+    _record_usage(response)
+    return response.text if hasattr(response, "text") else str(response)
+
+def _chunk_text(chunk) -> str:
+    # .text raises on chunks without text parts (e.g. the final safety/finish chunk)
+    try:
+        return chunk.text or ""
+    except (ValueError, AttributeError):
+        return ""
+
 
 class GoogleLLMEngine(BaseLLMEngine):
-    def __init__(self, model: str, api_key: Optional[str] = None):
+    embedding_dim = 768
+
+    def __init__(
+        self,
+        model: str,
+        api_key: Optional[str] = None,
+        embedding_model: str = "text-embedding-004",
+        embedding_batch_size: int = 100,
+        max_concurrent_batches: int = 4,
+    ):
         try:
             self.model = model
             self.api_key = api_key
+            self.embedding_model = embedding_model
+            self.embedding_batch_size = embedding_batch_size
+            self.max_concurrent_batches = max_concurrent_batches
             self.client = None
             self.credentials = None
             self.client_type = None
             self.logger = logger  # Use the module logger
 
+            _load_dotenv()
             project_id = os.environ.get("GOOGLE_PROJECT_ID")
             location = os.environ.get("GOOGLE_LOCATION")
             credentials_path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
@@ -35,7 +128,7 @@ class GoogleLLMEngine(BaseLLMEngine):
             if self.api_key or os.environ.get("GOOGLE_API_KEY", ""):
                 api_key = self.api_key or os.environ.get("GOOGLE_API_KEY", "")
                 try:
-                    self.client = genai.Client(api_key=api_key)
+                    self.client = _genai_client(api_key=api_key)
                     self.client_type = "genai"
                     self.logger.info("Successfully initialized direct genai client using API key.")
                 except Exception as e:
@@ -45,10 +138,9 @@ class GoogleLLMEngine(BaseLLMEngine):
             # Only try Vertex AI if all three env vars are present
             elif project_id and location and credentials_path:
                 try:
-                    self.credentials = service_account.Credentials.from_service_account_file(credentials_path)
+                    self.credentials = _service_account_credentials(credentials_path)
                     self.logger.info("Loaded service account credentials from file.")
-                    aiplatform.init(project=project_id, location=location, credentials=self.credentials)
-                    self.client = GenerativeModel(model_name=self.model)
+                    self.client = _vertexai_model(self.model, project_id, location, credentials_path)
                     self.client_type = "vertexai"
                     self.logger.info(f"Successfully initialized Gemini client via Vertex AI using model {self.model}")
                 except Exception as e:
@@ -67,20 +159,10 @@ class GoogleLLMEngine(BaseLLMEngine):
             if self.client is None and project_id and location and credentials_path:
                 try:
                     if not self.credentials:
-                        self.credentials = service_account.Credentials.from_service_account_file(credentials_path)
+                        self.credentials = _service_account_credentials(credentials_path)
                         self.logger.info("Loaded service account credentials from file (fallback).")
-                    vertexai.init(
-                        project=project_id,
-                        location=location,
-                        credentials=self.credentials
-                    )
                     self.logger.info("Initializing genai SDK with Vertex AI as fallback.")
-                    self.client = genai.Client(
-                        vertexai=True,
-                        credentials=self.credentials,
-                        project=project_id,
-                        location=location,
-                    )
+                    self.client = _genai_client(project=project_id, location=location, credentials_path=credentials_path)
                     
                     self.client_type = "genai"
                     self.logger.info(f"Successfully initialized direct genai client using model {self.model}")
@@ -106,24 +188,50 @@ class GoogleLLMEngine(BaseLLMEngine):
             # Assume messages is a list of dicts with 'content' keys
             prompt = "\n".join([msg.get("content", "") for msg in messages])
             response = self.client.generate_content(prompt, **kwargs)
-            return response.text if hasattr(response, "text") else str(response)
+            return _response_text(response)
         elif self.client_type == "genai":
             # For genai.Client
             prompt = "\n".join([msg.get("content", "") for msg in messages])
-            response = self.client.generate_content(model=self.model, prompt=prompt, **kwargs)
-            return response.text if hasattr(response, "text") else str(response)
+            response = self.client.models.generate_content(model=self.model, contents=prompt, **kwargs)
+            return _response_text(response)
         else:
             raise RuntimeError("Client not initialized properly.")
+
+    def generate_stream(self, messages: List[Dict[Any, Any]], **kwargs) -> Iterator[str]:
+        """
+        Generate a response, yielding text deltas as the model produces them.
+
+        :param messages: The input prompt for the model.
+        :param kwargs: Additional arguments for the model.
+        :return: Iterator over the response text deltas.
+        """
+        prompt = "\n".join([msg.get("content", "") for msg in messages])
+        if self.client_type == "vertexai":
+            stream = self.client.generate_content(prompt, stream=True, **kwargs)
+        elif self.client_type == "genai":
+            stream = self.client.models.generate_content_stream(model=self.model, contents=prompt, **kwargs)
+        else:
+            raise RuntimeError("Client not initialized properly.")
+        chunk = None
+        for chunk in stream:
+            text = _chunk_text(chunk)
+            if text:
+                yield text
+        if chunk is not None:
+            _record_usage(chunk)
         
     def generate_from_image(self, image_bytes: List[bytes], messages: List[Dict[Any, Any]], **kwargs) -> str:
         """
         Generate a response from the model based on the content of an image.
 
-        :param image_bytes: The bytes of the image file.
+        :param image_bytes: The bytes of one or more image files; the MIME type of
+            each is sniffed from its content (JPEG, PNG, WebP, GIF, TIFF, HEIC, ...).
         :param messages: The input prompt for the model.
         :param kwargs: Additional arguments for the model.
         :return: The generated response as a string.
         """
+        if isinstance(image_bytes, bytes):
+            image_bytes = [image_bytes]
         contents = []
         for msg in messages:
             if isinstance(msg, dict) and "content" in msg:
@@ -132,17 +240,17 @@ class GoogleLLMEngine(BaseLLMEngine):
         if self.client_type == "vertexai":
             # For Vertex AI GenerativeModel
             from vertexai.generative_models import Part
-            image_parts = [Part.from_data(image, mime_type="image/jpeg") for image in image_bytes]
+            image_parts = [Part.from_data(image, mime_type=sniff_mime(image, default="image/jpeg")) for image in image_bytes]
             contents.extend(image_parts)
             response = self.client.generate_content(contents=contents, **kwargs)
-            return response.text if hasattr(response, "text") else str(response)
+            return _response_text(response)
         elif self.client_type == "genai":
             # For genai.Client
             from google.genai.types import Part
-            image_parts = [Part.from_bytes(image, mime_type="image/jpeg") for image in image_bytes]
+            image_parts = [Part.from_bytes(data=image, mime_type=sniff_mime(image, default="image/jpeg")) for image in image_bytes]
             contents.extend(image_parts)
-            response = self.client.generate_content(model=self.model, contents=contents, **kwargs)
-            return response.text if hasattr(response, "text") else str(response)
+            response = self.client.models.generate_content(model=self.model, contents=contents, **kwargs)
+            return _response_text(response)
         else:
             raise RuntimeError("Client not initialized properly.")
         
@@ -150,11 +258,13 @@ class GoogleLLMEngine(BaseLLMEngine):
         """
         Generate a response from the model based on the content of a PDF file.
 
-        :param pdf_bytes: The bytes of the PDF file.
+        :param pdf_bytes: The bytes of one or more PDF files.
         :param messages: The input prompt for the model.
         :param kwargs: Additional arguments for the model.
         :return: The generated response as a string.
         """
+        if isinstance(pdf_bytes, bytes):
+            pdf_bytes = [pdf_bytes]
         contents = []
         for msg in messages:
             if isinstance(msg, dict) and "content" in msg:
@@ -166,17 +276,104 @@ class GoogleLLMEngine(BaseLLMEngine):
             pdf_parts = [Part.from_data(pdf, mime_type="application/pdf") for pdf in pdf_bytes]
             contents.extend(pdf_parts)
             response = self.client.generate_content(contents=contents, **kwargs)
-            return response.text if hasattr(response, "text") else str(response)
+            return _response_text(response)
         elif self.client_type == "genai":
             # For genai.Client
             from google.genai.types import Part
-            pdf_parts = [Part.from_bytes(pdf, mime_type="application/pdf") for pdf in pdf_bytes]
+            pdf_parts = [Part.from_bytes(data=pdf, mime_type="application/pdf") for pdf in pdf_bytes]
             contents.extend(pdf_parts)
-            response = self.client.generate_content(model=self.model, contents=contents, **kwargs)
-            return response.text if hasattr(response, "text") else str(response)
+            response = self.client.models.generate_content(model=self.model, contents=contents, **kwargs)
+            return _response_text(response)
         else:
             raise RuntimeError("Client not initialized properly.")
         
 
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed one batch of texts with a single embedding API call.
+
+        :param texts: The texts to embed, at most embedding_batch_size of them.
+        :return: float32 array of shape (len(texts), embedding_dim).
+        """
+        if self.client_type == "vertexai":
+            # Vertex AI exposes embeddings through a separate model class
+            embeddings = _vertexai_embedding_model(self.embedding_model).get_embeddings(texts)
+            return np.asarray([embedding.values for embedding in embeddings], dtype=np.float32)
+        elif self.client_type == "genai":
+            # For genai.Client
+            response = self.client.models.embed_content(model=self.embedding_model, contents=texts)
+            return np.asarray([embedding.values for embedding in response.embeddings], dtype=np.float32)
+        else:
+            raise RuntimeError("Client not initialized properly.")
+
+    def warmup(self):
+        """
+        Open a connection with a free token-count request, and load the
+        Vertex AI embedding model, before the first real request.
+        """
+        if self.client_type == "vertexai":
+            self.client.count_tokens("warmup")
+            _vertexai_embedding_model(self.embedding_model)
+        elif self.client_type == "genai":
+            self.client.models.count_tokens(model=self.model, contents="warmup")
+        else:
+            raise RuntimeError("Client not initialized properly.")
+        self.logger.info(f"Warmed up {self!r}")
+
+    def __repr__(self):
+        return f"GoogleLLM(model_name={self.model}, mode={self.client_type})"
+
+
+class AsyncGoogleLLMEngine(AsyncBaseLLMEngine):
+    """
+    asyncio variant of GoogleLLMEngine. Client setup is delegated to a
+    GoogleLLMEngine; requests go through the SDKs' native async methods
+    (``client.aio`` for genai, ``*_async`` for Vertex AI).
+    """
+    embedding_dim = GoogleLLMEngine.embedding_dim
+
+    def __init__(self, model: str, api_key: Optional[str] = None, **kwargs):
+        self.engine = GoogleLLMEngine(model=model, api_key=api_key, **kwargs)
+        self.model = self.engine.model
+        self.embedding_model = self.engine.embedding_model
+        self.embedding_batch_size = self.engine.embedding_batch_size
+        self.max_concurrent_batches = self.engine.max_concurrent_batches
+
+    async def generate(self, messages: List[Dict[Any, Any]], **kwargs) -> str:
+        """
+        Generate a response from the model based on the given prompt.
+
+        :param messages: The input prompt for the model.
+        :param kwargs: Additional arguments for the model.
+        :return: The generated response as a string.
+        """
+        prompt = "\n".join([msg.get("content", "") for msg in messages])
+        if self.engine.client_type == "vertexai":
+            response = await self.engine.client.generate_content_async(prompt, **kwargs)
+        elif self.engine.client_type == "genai":
+            response = await self.engine.client.aio.models.generate_content(model=self.model, contents=prompt, **kwargs)
+        else:
+            raise RuntimeError("Client not initialized properly.")
+        return _response_text(response)
+
+    async def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed one batch of texts with a single embedding API call.
+
+        :param texts: The texts to embed, at most embedding_batch_size of them.
+        :return: float32 array of shape (len(texts), embedding_dim).
+        """
+        if self.engine.client_type == "vertexai":
+            embeddings = await _vertexai_embedding_model(self.embedding_model).get_embeddings_async(texts)
+            return np.asarray([embedding.values for embedding in embeddings], dtype=np.float32)
+        elif self.engine.client_type == "genai":
+            response = await self.engine.client.aio.models.embed_content(model=self.embedding_model, contents=texts)
+            return np.asarray([embedding.values for embedding in response.embeddings], dtype=np.float32)
+        else:
+            raise RuntimeError("Client not initialized properly.")
+
+    async def warmup(self):
+        await asyncio.to_thread(self.engine.warmup)
+
     def __repr__(self):
-        return f"GoogleLLM(model_name={self.model}, mode={self.client_type})"
\ No newline at end of file
+        return f"AsyncGoogleLLM(model_name={self.model}, mode={self.engine.client_type})"
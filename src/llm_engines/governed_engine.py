@@ -0,0 +1,291 @@
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List
+
+import numpy as np
+
+from src.core.llm_engine import BaseLLMEngine
+from src.observability import telemetry
+from src.utils.rate_limiter import AdaptiveRateLimiter
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+THROTTLE_CODES = {429, "429", "RESOURCE_EXHAUSTED"}
+RETRYABLE_CODES = THROTTLE_CODES | {500, 502, 503, 504, "500", "502", "503", "504", "UNAVAILABLE", "DEADLINE_EXCEEDED", "INTERNAL"}
+
+
+def _error_code(error: Exception):
+    # google.api_core exceptions carry .code (an int), google.genai errors .code and .status
+    for attribute in ("code", "status_code", "status"):
+        code = getattr(error, attribute, None)
+        if isinstance(code, int):
+            return int(code)
+        if code is not None and not callable(code):
+            # gRPC StatusCode enums compare by name
+            return getattr(code, "name", code)
+    return None
+
+
+def is_throttled(error: Exception) -> bool:
+    """
+    True for quota errors: HTTP 429 / gRPC RESOURCE_EXHAUSTED.
+    """
+    return _error_code(error) in THROTTLE_CODES or "RESOURCE_EXHAUSTED" in str(error)
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    True for quota errors, transient server errors and timeouts / dropped connections.
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    code = _error_code(error)
+    return code in RETRYABLE_CODES or is_throttled(error) or "UNAVAILABLE" in str(error)
+
+
+def _request_key(method: str, blobs, messages, kwargs: dict) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(method.encode("utf-8"))
+    digest.update(json.dumps([messages, kwargs], sort_keys=True, default=repr).encode("utf-8"))
+    for blob in blobs or ():
+        digest.update(hashlib.blake2b(blob, digest_size=16).digest())
+    return digest.hexdigest()
+
+
+class GovernedLLMEngine(BaseLLMEngine):
+    """
+    Wraps an engine with client-side call governance for its provider calls
+    (generate, generate_from_image / _pdf / _audio / _video, generate_stream
+    and embed_batch):
+
+    - single-flight: concurrent identical generate requests share one call;
+    - an AdaptiveRateLimiter admits calls and halves its rate on a
+      429 / RESOURCE_EXHAUSTED (at most once per ``throttle_cooldown``
+      seconds), recovering as calls succeed;
+    - retryable errors are retried with full-jitter exponential backoff;
+    - optionally, a generate call still running after the ``hedge_percentile``
+      of recent latencies (or a fixed ``hedge_after`` seconds) is hedged with
+      a second identical call, and the first to succeed wins. Hedges need a
+      spare rate-limiter token, so they never add load while throttled.
+
+    :param rate: Initial and maximum provider calls per second.
+    :param burst: Calls that may start at once after an idle period.
+    :param max_retries: Retries after the first attempt.
+    :param backoff_base: First backoff ceiling, in seconds, doubling per retry.
+    :param backoff_max: Upper bound on a single backoff.
+    :param hedge_percentile: Latency percentile (e.g. 95) after which to hedge, None to disable.
+    :param hedge_after: Fixed hedging delay in seconds, instead of a percentile.
+    """
+
+    def __init__(
+        self,
+        engine: BaseLLMEngine,
+        rate: float = 10.0,
+        burst: int = 10,
+        min_rate: float = None,
+        throttle_cooldown: float = 1.0,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        hedge_percentile: float = None,
+        hedge_after: float = None,
+        hedge_min_samples: int = 20,
+        latency_window: int = 200,
+        max_hedge_workers: int = 16,
+        retryable: Callable[[Exception], bool] = is_retryable,
+    ):
+        self.engine = engine
+        self.embedding_dim = engine.embedding_dim
+        self.embedding_batch_size = engine.embedding_batch_size
+        self.max_concurrent_batches = engine.max_concurrent_batches
+        self.limiter = AdaptiveRateLimiter(rate, burst, min_rate=min_rate, cooldown=throttle_cooldown)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_percentile = hedge_percentile
+        self.hedge_after = hedge_after
+        self.hedge_min_samples = hedge_min_samples
+        self.retryable = retryable
+        self._latencies = deque(maxlen=latency_window)
+        self._in_flight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._hedge_pool = None
+        if hedge_percentile is not None or hedge_after is not None:
+            self._hedge_pool = ThreadPoolExecutor(max_workers=max_hedge_workers, thread_name_prefix="hedge")
+
+    def __getattr__(self, name):
+        if name == "engine":
+            raise AttributeError(name)
+        return getattr(self.engine, name)
+
+    def warmup(self):
+        self.engine.warmup()
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform over [0, min(max, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _attempt(self, call: Callable, acquire: bool = True):
+        """
+        One rate-limited call, feeding its outcome back into the limiter and latency window.
+        """
+        if acquire:
+            self.limiter.acquire()
+        started = time.perf_counter()
+        try:
+            result = call()
+        except Exception as e:
+            if is_throttled(e):
+                self.limiter.on_throttle()
+                telemetry.increment("llm_governance_events_total", event="throttled")
+                logger.warning(f"Provider throttled, call rate lowered to {self.limiter.rate:.2f}/s")
+            raise
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._latencies.append(elapsed)
+        self.limiter.on_success()
+        return result
+
+    def _hedge_delay(self) -> float:
+        """
+        Seconds to wait before hedging, or None when hedging is off or
+        too few latencies have been seen yet.
+        """
+        if self.hedge_after is not None or self.hedge_percentile is None:
+            return self.hedge_after
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            latencies = np.fromiter(self._latencies, dtype=np.float64, count=len(self._latencies))
+        return float(np.percentile(latencies, self.hedge_percentile))
+
+    def _hedged(self, call: Callable):
+        """
+        Run ``call``; if it is still running after the hedge delay and a
+        limiter token is spare, race it against a second attempt. The slower
+        attempt is left to finish in the background, as threads cannot be cancelled.
+        """
+        delay = self._hedge_delay()
+        if delay is None:
+            return self._attempt(call)
+        # Wait for admission here, so queueing behind the limiter does not count towards the hedge delay
+        self.limiter.acquire()
+        running = threading.Event()
+
+        def run_primary():
+            running.set()
+            return self._attempt(call, False)
+
+        primary = self._hedge_pool.submit(telemetry.propagate(run_primary))
+        # Nor does time spent queued for a pool worker: the delay runs from when the call starts
+        running.wait()
+        done, _ = wait([primary], timeout=delay)
+        if done or not self.limiter.try_acquire():
+            return primary.result()
+
+        telemetry.increment("llm_governance_events_total", event="hedged")
+        # The limiter token was taken by try_acquire above
+        secondary = self._hedge_pool.submit(telemetry.propagate(self._attempt), call, False)
+        pending = {primary, secondary}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is secondary:
+                        telemetry.increment("llm_governance_events_total", event="hedge_won")
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def _call(self, call: Callable, hedge: bool = False):
+        """
+        Run ``call`` with rate limiting, retries and (for generation) hedging.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self._hedged(call) if hedge else self._attempt(call)
+            except Exception as e:
+                if attempt == self.max_retries or not self.retryable(e):
+                    raise
+                delay = self._backoff(attempt)
+                telemetry.increment("llm_governance_events_total", event="retry")
+                logger.warning(f"Provider call failed ({e}), retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+                time.sleep(delay)
+
+    def _single_flight(self, key: str, call: Callable):
+        """
+        Run ``call`` once for all concurrent callers with the same ``key``.
+        """
+        with self._lock:
+            leader = self._in_flight.get(key)
+            if leader is None:
+                future = self._in_flight[key] = Future()
+        if leader is not None:
+            telemetry.increment("llm_governance_events_total", event="coalesced")
+            return leader.result()
+        try:
+            result = self._call(call, hedge=True)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def generate(self, messages: List[Dict[Any, Any]], **kwargs) -> str:
+        return self._single_flight(
+            _request_key("generate", None, messages, kwargs),
+            lambda: self.engine.generate(messages, **kwargs),
+        )
+
+    def _generate_from_media(self, method: str, media, messages: List[Dict[Any, Any]], kwargs: dict) -> str:
+        blobs = [media] if isinstance(media, bytes) else media
+        return self._single_flight(
+            _request_key(method, blobs, messages, kwargs),
+            lambda: getattr(self.engine, method)(media, messages, **kwargs),
+        )
+
+    def generate_from_image(self, image_bytes: List[bytes], messages: List[Dict[Any, Any]], **kwargs) -> str:
+        return self._generate_from_media("generate_from_image", image_bytes, messages, kwargs)
+
+    def generate_from_pdf(self, pdf_bytes: List[bytes], messages: List[Dict[Any, Any]], **kwargs) -> str:
+        return self._generate_from_media("generate_from_pdf", pdf_bytes, messages, kwargs)
+
+    def generate_from_audio(self, audio_bytes: List[bytes], messages: List[Dict[Any, Any]], **kwargs) -> str:
+        return self._generate_from_media("generate_from_audio", audio_bytes, messages, kwargs)
+
+    def generate_from_video(self, video_bytes: List[bytes], messages: List[Dict[Any, Any]], **kwargs) -> str:
+        return self._generate_from_media("generate_from_video", video_bytes, messages, kwargs)
+
+    def generate_stream(self, messages: List[Dict[Any, Any]], **kwargs) -> Iterator[str]:
+        """
+        Rate-limited stream; a failure before the first delta is retried,
+        after it the error reaches the caller (the text is already out).
+        Streams are neither coalesced nor hedged.
+        """
+        def first_delta():
+            stream = iter(self.engine.generate_stream(messages, **kwargs))
+            return stream, next(stream, None)
+
+        stream, delta = self._call(first_delta)
+        if delta is None:
+            return
+        yield delta
+        yield from stream
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        return self._call(lambda: self.engine.embed_batch(texts))
+
+    def __repr__(self):
+        return f"Governed({self.engine!r})"
@@ -0,0 +1,146 @@
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.observability.telemetry import Span, Telemetry, telemetry as default_telemetry
+
+logger = logging.getLogger(__name__)
+
+
+class Exporter:
+    """
+    Receives telemetry events as they happen; every hook is optional.
+    """
+
+    def on_span_start(self, span: Span):
+        pass
+
+    def on_span_end(self, span: Span):
+        pass
+
+    def on_counter(self, name: str, value: float, labels: dict):
+        pass
+
+    def on_histogram(self, name: str, value: float, labels: dict):
+        pass
+
+
+def _labels(labels: tuple, extra: tuple = ()) -> str:
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for key, value in items
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+class PrometheusExporter(Exporter):
+    """
+    Renders the aggregated counters and histograms in the Prometheus text
+    exposition format, on demand (``render``) or over HTTP (``serve``).
+    """
+
+    def __init__(self, telemetry: Telemetry = None):
+        self.telemetry = telemetry or default_telemetry
+        self._server = None
+
+    def render(self) -> str:
+        snapshot = self.telemetry.snapshot()
+        lines, typed = [], set()
+        for (name, labels), value in sorted(snapshot["counters"].items()):
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), histogram in sorted(snapshot["histograms"].items()):
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            for bound, count in histogram["buckets"]:
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{_labels(labels, (('le', le),))} {count}")
+            lines.append(f"{name}_sum{_labels(labels)} {histogram['sum']}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9464, host: str = "0.0.0.0"):
+        """
+        Serve ``render()`` at http://host:port/metrics from a daemon thread.
+        """
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="prometheus-exporter", daemon=True).start()
+        logger.info(f"Serving Prometheus metrics on http://{host}:{port}/metrics")
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+
+class OpenTelemetryExporter(Exporter):
+    """
+    Mirrors spans, counters and histograms into the OpenTelemetry API (needs
+    ``opentelemetry-api``), so any configured OTel SDK exporter (OTLP,
+    Jaeger, console, ...) receives them. Parent/child relations are kept.
+    """
+
+    def __init__(self, tracer_provider=None, meter_provider=None, name: str = "ai-sys"):
+        from opentelemetry import metrics, trace
+
+        self._trace = trace
+        self._tracer = (tracer_provider or trace.get_tracer_provider()).get_tracer(name)
+        self._meter = (meter_provider or metrics.get_meter_provider()).get_meter(name)
+        self._spans: dict[str, object] = {}
+        self._instruments: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def on_span_start(self, span: Span):
+        parent = self._spans.get(span.parent_id)
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        otel_span = self._tracer.start_span(
+            span.name, context=context, attributes=span.attributes, start_time=int(span.start_time * 1e9)
+        )
+        with self._lock:
+            self._spans[span.span_id] = otel_span
+
+    def on_span_end(self, span: Span):
+        with self._lock:
+            otel_span = self._spans.pop(span.span_id, None)
+        if otel_span is None:
+            return
+        otel_span.set_attributes(span.attributes)
+        if span.error is not None:
+            from opentelemetry.trace import Status, StatusCode
+            otel_span.set_status(Status(StatusCode.ERROR, span.error))
+        otel_span.end(end_time=int(span.end_time * 1e9))
+
+    def _instrument(self, name: str, create):
+        with self._lock:
+            if name not in self._instruments:
+                self._instruments[name] = create(name)
+            return self._instruments[name]
+
+    def on_counter(self, name: str, value: float, labels: dict):
+        self._instrument(name, self._meter.create_counter).add(value, attributes=labels)
+
+    def on_histogram(self, name: str, value: float, labels: dict):
+        self._instrument(name, self._meter.create_histogram).record(value, attributes=labels)
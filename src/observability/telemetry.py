@@ -0,0 +1,172 @@
+import contextvars
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STAGE_DURATION = "rag_stage_duration_seconds"
+
+
+class Span:
+    """
+    One timed operation. Spans opened inside another span (in the same
+    thread or asyncio task) become its children and share its trace id.
+    """
+    __slots__ = ("name", "attributes", "trace_id", "span_id", "parent_id", "start_time", "end_time", "error")
+
+    def __init__(self, name: str, attributes: dict, parent: "Span" = None):
+        self.name = name
+        self.attributes = attributes
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_time = time.time()
+        self.end_time = None
+        self.error = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end_time or time.time()) - self.start_time
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+
+class Telemetry:
+    """
+    In-process registry of spans, counters and histograms.
+
+    The current span lives in a contextvar. It follows asyncio tasks on its
+    own, but a thread starts with an empty context, so work handed to
+    threads or thread pools is wrapped with ``propagate`` to keep its spans
+    under the caller's trace.
+
+    ``span(name)`` times a block and records its duration in the
+    ``rag_stage_duration_seconds{stage=name}`` histogram; ``increment`` and
+    ``observe`` update labelled counters and histograms. Exporters receive
+    span start/end and metric updates as they happen (see
+    src.observability.exporters); ``snapshot`` returns the aggregates.
+    With ``enabled = False`` every call returns immediately.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.enabled = True
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: dict[tuple, float] = {}
+        # (name, labels) -> [bucket counts..., +Inf count], sum
+        self._histograms: dict[tuple, list] = {}
+        self._exporters = []
+        self._current = contextvars.ContextVar("current_span", default=None)
+
+    def add_exporter(self, exporter):
+        self._exporters.append(exporter)
+
+    def remove_exporter(self, exporter):
+        self._exporters.remove(exporter)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        if not self.enabled:
+            yield None
+            return
+        span = Span(name, attributes, self._current.get())
+        token = self._current.set(span)
+        for exporter in self._exporters:
+            exporter.on_span_start(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_time = time.time()
+            self._current.reset(token)
+            self.observe(STAGE_DURATION, span.end_time - span.start_time, stage=name)
+            for exporter in self._exporters:
+                exporter.on_span_end(span)
+
+    def current_span(self) -> Span:
+        return self._current.get()
+
+    def increment(self, name: str, value: float = 1, **labels):
+        """
+        Add ``value`` to the counter ``name`` (by convention ending in "_total").
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        for exporter in self._exporters:
+            exporter.on_counter(name, value, labels)
+
+    def observe(self, name: str, value: float, **labels):
+        """
+        Record ``value`` in the histogram ``name``.
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            histogram[0][bisect_left(self.buckets, value)] += 1
+            histogram[1] += value
+        for exporter in self._exporters:
+            exporter.on_histogram(name, value, labels)
+
+    def snapshot(self) -> dict:
+        """
+        {"counters": {(name, labels): value}, "histograms": {(name, labels):
+        {"buckets": cumulative counts per upper bound, "sum", "count"}}}
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(counts), total) for key, (counts, total) in self._histograms.items()}
+        result = {"counters": counters, "histograms": {}}
+        for key, (counts, total) in histograms.items():
+            cumulative, running = [], 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                running += count
+                cumulative.append((bound, running))
+            result["histograms"][key] = {"buckets": cumulative, "sum": total, "count": running}
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+# Process-wide instance used by the pipeline, engines and stores
+telemetry = Telemetry()
+
+
+def span(name: str, **attributes):
+    return telemetry.span(name, **attributes)
+
+
+def propagate(fn):
+    """
+    Wrap ``fn`` to run with the caller's contextvars (and so its current
+    span) in whatever thread calls it. Each call gets its own copy, so the
+    wrapper can run in several threads at once.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return run
+
+
+def increment(name: str, value: float = 1, **labels):
+    telemetry.increment(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels):
+    telemetry.observe(name, value, **labels)
@@ -0,0 +1,62 @@
+import asyncio
+
+from src.pipeline.context_builder import ContextBuilder
+from src.pipeline.rag_pipeline import build_messages, source_chunks, source_documents
+
+
+class AsyncRAGPipeline:
+    """
+    asyncio counterpart of RAGPipeline for async stores, retrievers and engines.
+
+    Extraction and chunking are CPU-bound and run on the default thread pool;
+    embedding, indexing, retrieval and generation are awaited natively. At most
+    ``max_concurrency`` queries are in flight at once; the rest wait on a
+    semaphore instead of occupying a thread each.
+    """
+
+    def __init__(self,
+                 extractor,
+                 chunker,
+                 vector_store,
+                 retriever,
+                 llm_engine,
+                 max_concurrency: int = 256,
+                 context_builder: ContextBuilder = None):
+        self.extractor = extractor
+        self.chunker = chunker
+        self.vector_store = vector_store
+        self.retriever = retriever
+        self.llm = llm_engine
+        self.max_concurrency = max_concurrency
+        self.context_builder = context_builder
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def aingest(self, file_path: str):
+        """
+        Index a file's chunks like ``RAGPipeline.ingest(file_path, incremental=False)``:
+        under the same deterministic ids and "source" / "version" metadata, so
+        re-ingesting a file through either pipeline upserts its chunks.
+        """
+        text = await asyncio.to_thread(self.extractor.extract, file_path)
+        chunks = await asyncio.to_thread(self.chunker.chunk, text)
+        by_id = source_chunks(file_path, chunks)
+        vectors = await self.llm.embed(list(by_id.values()))
+        await self.vector_store.add_documents(source_documents(file_path, text, by_id.items(), vectors))
+
+    async def aquery(self, query: str) -> str:
+        async with self._semaphore:
+            if self.context_builder is None:
+                retrieved_chunks = await self.retriever.retrieve(query)
+                context = "\n".join(retrieved_chunks)
+            else:
+                query_vector = (await self.llm.embed([query]))[0]
+                retrieved = await self.retriever.retrieve_documents(query, query_vector=query_vector)
+                # Without an awaitable embed hook, chunks returned without vectors are ordered by score
+                context, _ = self.context_builder.build(retrieved, query_vector)
+            return await self.llm.generate(build_messages(context, query))
+
+    async def aquery_many(self, queries: list[str]) -> list[str]:
+        """
+        Answer queries concurrently, bounded by ``max_concurrency``; results keep input order.
+        """
+        return list(await asyncio.gather(*(self.aquery(query) for query in queries)))
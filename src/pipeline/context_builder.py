@@ -0,0 +1,192 @@
+import logging
+import math
+import re
+from typing import Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Sentence or line end followed by whitespace, the preferred truncation point
+_SENTENCE_END = re.compile(r"[.!?\n]\s")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for budgeting without a tokenizer, about four
+    characters per token for English text with Gemini / GPT-style vocabularies.
+    """
+    return math.ceil(len(text) / 4)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def mmr_order(relevance: np.ndarray, vectors: np.ndarray, lambda_mult: float = 0.7, duplicate_threshold: float = None) -> list[int]:
+    """
+    Order candidates by maximal marginal relevance: repeatedly pick the one
+    maximizing ``lambda_mult * relevance - (1 - lambda_mult) * max similarity
+    to the already picked ones``. Candidates whose similarity to a picked one
+    exceeds ``duplicate_threshold`` are dropped as near-duplicates.
+
+    :param relevance: Relevance of each candidate to the query, shape (n,).
+    :param vectors: L2-normalized candidate vectors, shape (n, dim).
+    :return: Indices of the kept candidates, in pick order.
+    """
+    n = len(relevance)
+    similarity = vectors @ vectors.T
+    # Highest similarity of each candidate to any picked candidate so far
+    redundancy = np.full(n, -np.inf, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    order = []
+    while available.any():
+        penalty = np.where(np.isfinite(redundancy), redundancy, 0.0)
+        scores = np.where(available, lambda_mult * relevance - (1 - lambda_mult) * penalty, -np.inf)
+        pick = int(np.argmax(scores))
+        order.append(pick)
+        available[pick] = False
+        redundancy = np.maximum(redundancy, similarity[pick])
+        if duplicate_threshold is not None:
+            available &= redundancy < duplicate_threshold
+    return order
+
+
+class ContextBuilder:
+    """
+    Turns retrieved chunks into the context sent to the LLM: near-duplicates
+    are dropped and the rest ordered by maximal marginal relevance over the
+    chunk vectors, then packed into a token budget. A chunk that does not fit
+    is cut at a sentence boundary when at least ``min_truncated_tokens`` of
+    the budget remain and it scores at least ``truncate_min_relevance``
+    relative to the best chunk, otherwise skipped.
+
+    :param max_tokens: Token budget for the joined context.
+    :param lambda_mult: MMR trade-off, 1.0 is pure relevance, 0.0 pure diversity.
+    :param duplicate_threshold: Cosine similarity above which a chunk is a near-duplicate of a kept one.
+    :param count_tokens: Token counter, defaults to estimate_tokens.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 2000,
+        lambda_mult: float = 0.7,
+        duplicate_threshold: float = 0.95,
+        min_truncated_tokens: int = 64,
+        truncate_min_relevance: float = 0.5,
+        separator: str = "\n",
+        count_tokens: Callable[[str], int] = estimate_tokens,
+    ):
+        if max_tokens <= 0:
+            raise ValueError("'max_tokens' must be a positive integer")
+        self.max_tokens = max_tokens
+        self.lambda_mult = lambda_mult
+        self.duplicate_threshold = duplicate_threshold
+        self.min_truncated_tokens = min_truncated_tokens
+        self.truncate_min_relevance = truncate_min_relevance
+        self.separator = separator
+        self.count_tokens = count_tokens
+
+    def _vectors(self, documents: list[dict], embed: Callable = None) -> np.ndarray:
+        """
+        Normalized vectors of the documents, from their "vector" field or,
+        for documents returned without one, embedded with ``embed``.
+        None when some are missing and ``embed`` is not given.
+        """
+        missing = [i for i, doc in enumerate(documents) if doc.get("vector") is None]
+        if missing and embed is None:
+            return None
+        embedded = embed([documents[i]["text"] for i in missing]) if missing else []
+        vectors = [doc.get("vector") for doc in documents]
+        for i, vector in zip(missing, embedded):
+            vectors[i] = vector
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+
+    def _relevance(self, documents: list[dict], vectors: np.ndarray, query_vector) -> np.ndarray:
+        """
+        Cosine similarity to the query when its vector is known, otherwise
+        the retrieval scores (or ranks) rescaled to [0, 1].
+        """
+        if query_vector is not None and vectors is not None:
+            return vectors @ _normalize(np.asarray(query_vector, dtype=np.float32))
+        if all(doc.get("_score") is not None for doc in documents):
+            scores = np.asarray([doc["_score"] for doc in documents], dtype=np.float32)
+        else:
+            scores = -np.arange(len(documents), dtype=np.float32)
+        spread = scores.max() - scores.min()
+        return (scores - scores.min()) / spread if spread > 0 else np.ones(len(scores), dtype=np.float32)
+
+    def _truncate(self, text: str, budget: int) -> str:
+        """
+        Longest prefix of ``text`` within ``budget`` tokens, ending at a
+        sentence boundary when there is one in the second half.
+        """
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.count_tokens(text[:middle]) <= budget:
+                low = middle
+            else:
+                high = middle - 1
+        prefix = text[:low]
+        ends = [match.end() for match in _SENTENCE_END.finditer(prefix)]
+        if ends and ends[-1] >= len(prefix) // 2:
+            prefix = prefix[:ends[-1]]
+        return prefix.rstrip()
+
+    def build(self, documents: list[dict], query_vector=None, embed: Callable = None) -> tuple[str, dict]:
+        """
+        Select and pack ``documents`` (retrieval results with "text" and
+        optionally "vector" / "_score") into a context string.
+
+        :param query_vector: The query embedding, for relevance; falls back to "_score".
+        :param embed: Embeds texts of documents returned without a vector.
+        :return: The context and a report: "candidates", "selected",
+            "duplicates", "truncated", "tokens", "candidate_tokens" (of the
+            naively joined candidates) and "tokens_saved".
+        """
+        candidate_tokens = self.count_tokens(self.separator.join(doc["text"] for doc in documents))
+        report = {
+            "candidates": len(documents), "selected": 0, "duplicates": 0, "truncated": 0,
+            "tokens": 0, "candidate_tokens": candidate_tokens, "tokens_saved": candidate_tokens,
+        }
+        if not documents:
+            return "", report
+
+        vectors = self._vectors(documents, embed)
+        relevance = self._relevance(documents, vectors, query_vector)
+        if vectors is not None:
+            order = mmr_order(relevance, vectors, self.lambda_mult, self.duplicate_threshold)
+        else:
+            order = list(np.argsort(-relevance, kind="stable"))
+        report["duplicates"] = len(documents) - len(order)
+
+        best = float(relevance[order[0]])
+        separator_tokens = self.count_tokens(self.separator)
+        parts, used = [], 0
+        for i in order:
+            text = documents[i]["text"]
+            cost = self.count_tokens(text) + (separator_tokens if parts else 0)
+            if used + cost <= self.max_tokens:
+                parts.append(text)
+                used += cost
+                continue
+            remaining = self.max_tokens - used - (separator_tokens if parts else 0)
+            relevant = best <= 0 or relevance[i] >= self.truncate_min_relevance * best
+            if remaining >= self.min_truncated_tokens and relevant:
+                truncated = self._truncate(text, remaining)
+                if truncated:
+                    parts.append(truncated)
+                    used += self.count_tokens(truncated) + (separator_tokens if len(parts) > 1 else 0)
+                    report["truncated"] += 1
+
+        context = self.separator.join(parts)
+        tokens = self.count_tokens(context)
+        report.update(selected=len(parts), tokens=tokens, tokens_saved=max(candidate_tokens - tokens, 0))
+        logger.debug(
+            f"Built context from {len(parts)} of {len(documents)} chunks: {tokens} tokens, "
+            f"{report['tokens_saved']} saved, {report['duplicates']} near-duplicates dropped"
+        )
+        return context, report
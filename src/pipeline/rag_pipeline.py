@@ -1,22 +1,234 @@
+import logging
+import time
+from typing import Iterable, Iterator
+
+from src.cache.semantic_cache import SemanticCache
+from src.observability import telemetry
+from src.pipeline.context_builder import ContextBuilder
+from src.pipeline.streaming_ingest import StreamingIngestor
+from src.utils.chunk_ids import chunk_id, content_version
+
+logger = logging.getLogger(__name__)
+
+
+def build_messages(context: str, query: str) -> list[dict]:
+    return [
+        {"role": "system", "content": "You are a helpful assistant. Use the following context to answer the question."},
+        {"role": "user", "content": f"Context:\n{context}\n\nQuestion: {query}"}
+    ]
+
+
+def source_chunks(file_path: str, chunks: list[str]) -> dict:
+    """
+    A file's chunks by deterministic id (see chunk_id); a chunk repeated
+    within the file maps onto one id.
+    """
+    return {chunk_id(chunk, file_path): chunk for chunk in chunks}
+
+
+def source_documents(file_path: str, text: str, chunks: Iterable[tuple], vectors) -> list[dict]:
+    """
+    Documents to store for ``(id, chunk)`` pairs of a file and their vectors,
+    tagged with the "source" path and the "version" hash of the extracted ``text``.
+    """
+    version = content_version(text)
+    return [
+        {"id": doc_id, "text": chunk, "vector": vector.tolist(), "metadata": {"source": file_path, "version": version}}
+        for (doc_id, chunk), vector in zip(chunks, vectors)
+    ]
+
+
+class AnswerStream:
+    """
+    Iterator over the text deltas of a streamed answer. ``metrics`` is filled
+    in while it is consumed: "retrieval_seconds", "time_to_first_token" and
+    "total_seconds" (all from the start of the query), "deltas" and "cached",
+    plus "context_tokens" and "context_tokens_saved" with a context builder.
+    """
+
+    def __init__(self, deltas: Iterator[str], metrics: dict):
+        self._deltas = deltas
+        self._parts = []
+        self.metrics = metrics
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        delta = next(self._deltas)
+        self._parts.append(delta)
+        return delta
+
+    @property
+    def text(self) -> str:
+        """
+        The answer received so far.
+        """
+        return "".join(self._parts)
+
+
 class RAGPipeline:
     def __init__(self,
                  extractor,
                  chunker,
                  vector_store,
                  retriever,
-                 llm_engine):
+                 llm_engine,
+                 semantic_cache: SemanticCache = None,
+                 context_builder: ContextBuilder = None):
         self.extractor = extractor
         self.chunker = chunker
         self.vector_store = vector_store
         self.retriever = retriever
         self.llm = llm_engine
+        self.semantic_cache = semantic_cache
+        self.context_builder = context_builder
+        if semantic_cache is not None:
+            vector_store.add_change_listener(semantic_cache.on_index_change)
+
+    def ingest(self, file_path: str, incremental: bool = True) -> dict:
+        """
+        Index a file's chunks under deterministic ids (see chunk_id), tagged
+        with their "source" path and the "version" hash of the extracted text.
+
+        With ``incremental`` the new chunk set is diffed against the chunks
+        already indexed for this source: only added chunks are embedded and
+        stored, chunks no longer present are deleted, and unchanged chunks
+        get the new version with a metadata-only update. Otherwise every
+        chunk is re-embedded and upserted.
+        """
+        with telemetry.span("ingest", source=file_path) as ingest_span:
+            with telemetry.span("extract"):
+                text = self.extractor.extract(file_path)
+            telemetry.increment("ingest_extracted_chars_total", len(text))
+            with telemetry.span("chunk"):
+                chunks = self.chunker.chunk(text)
+            telemetry.increment("ingest_chunks_total", len(chunks))
+            version = content_version(text)
+            by_id = source_chunks(file_path, chunks)
+
+            existing = self.vector_store.get_ids({"source": file_path}) if incremental else set()
+            added = [(doc_id, chunk) for doc_id, chunk in by_id.items() if doc_id not in existing]
+            removed = [doc_id for doc_id in existing if doc_id not in by_id]
+            stale = []
+            if incremental and len(added) < len(by_id):
+                current = self.vector_store.get_ids({"source": file_path, "version": version})
+                stale = [doc_id for doc_id in by_id if doc_id in existing and doc_id not in current]
+
+            if added:
+                with telemetry.span("embed", texts=len(added)):
+                    vectors = self.llm.embed([chunk for _, chunk in added])
+                docs = source_documents(file_path, text, added, vectors)
+                with telemetry.span("index", documents=len(docs)):
+                    self.vector_store.add_documents(docs)
+            if removed:
+                with telemetry.span("delete", documents=len(removed)):
+                    self.vector_store.delete_documents(removed)
+            if stale:
+                with telemetry.span("update_metadata", documents=len(stale)):
+                    self.vector_store.update_metadata(stale, {"version": version})
+            result = {"added": len(added), "deleted": len(removed), "unchanged": len(by_id) - len(added), "updated": len(stale)}
+            if ingest_span is not None:
+                ingest_span.attributes.update(result)
+            return result
+
+    def ingest_stream(self, file_paths: Iterable[str], **options) -> dict:
+        """
+        Ingest many files with overlapping extract/chunk/embed/index stages.
+        ``options`` are passed to StreamingIngestor (worker counts, queue size, ...).
+        """
+        with telemetry.span("ingest_stream"):
+            ingestor = StreamingIngestor(self.extractor, self.chunker, self.llm, self.vector_store, **options)
+            return ingestor.ingest(file_paths)
 
-    def ingest(self, file_path: str):
-        text = self.extractor.extract(file_path)
-        chunks = self.chunker.chunk(text)
-        self.vector_store.add_documents(chunks)
+    def _query_vector(self, query: str):
+        # Embedded up front only when the semantic cache or the context builder needs it
+        if self.semantic_cache is None and self.context_builder is None:
+            return None
+        with telemetry.span("embed", texts=1):
+            return self.llm.embed([query])[0]
+
+    def _build_context(self, retrieved: list[dict], query_vector, metrics: dict = None) -> str:
+        """
+        Join the retrieved chunks, or, with a context builder, de-duplicate
+        and pack them into its token budget.
+        """
+        if self.context_builder is None:
+            return "\n".join(doc["text"] for doc in retrieved)
+        with telemetry.span("build_context"):
+            context, report = self.context_builder.build(retrieved, query_vector, embed=self.llm.embed)
+        telemetry.increment("context_tokens_total", report["tokens"])
+        telemetry.increment("context_tokens_saved_total", report["tokens_saved"])
+        logger.info(
+            f"Context: {report['selected']} of {report['candidates']} chunks, {report['tokens']} tokens "
+            f"({report['tokens_saved']} saved)"
+        )
+        if metrics is not None:
+            metrics.update(context_tokens=report["tokens"], context_tokens_saved=report["tokens_saved"])
+        return context
 
     def query(self, query: str) -> str:
-        retrieved_chunks = self.retriever.retrieve(query)
-        context = "\n".join(retrieved_chunks)
-        return self.llm.generate(f"Answer based on context:\n{context}\n\nQ: {query}\nA:")
+        with telemetry.span("query"):
+            query_vector = self._query_vector(query)
+            if self.semantic_cache is not None:
+                answer = self.semantic_cache.lookup(query_vector)
+                if answer is not None:
+                    return answer
+            with telemetry.span("retrieve"):
+                retrieved = self.retriever.retrieve_documents(query, query_vector=query_vector)
+            context = self._build_context(retrieved, query_vector)
+            with telemetry.span("generate"):
+                answer = self.llm.generate(build_messages(context, query))
+            if self.semantic_cache is not None:
+                self.semantic_cache.store(query_vector, [doc.get("_id") for doc in retrieved], answer)
+            return answer
+
+    def query_stream(self, query: str) -> AnswerStream:
+        """
+        Like ``query``, but stream the answer as it is generated.
+        Generation starts as soon as retrieval completes:
+
+            stream = pipeline.query_stream("...")
+            for delta in stream:
+                print(delta, end="", flush=True)
+            stream.metrics["time_to_first_token"]
+        """
+        metrics = {"cached": False, "deltas": 0}
+        return AnswerStream(self._stream_answer(query, metrics), metrics)
+
+    def _stream_answer(self, query: str, metrics: dict) -> Iterator[str]:
+        started = time.perf_counter()
+        query_vector = self._query_vector(query)
+        if self.semantic_cache is not None:
+            answer = self.semantic_cache.lookup(query_vector)
+            if answer is not None:
+                elapsed = time.perf_counter() - started
+                metrics.update(cached=True, deltas=1, retrieval_seconds=elapsed, time_to_first_token=elapsed)
+                yield answer
+                metrics["total_seconds"] = time.perf_counter() - started
+                return
+
+        retrieved = self.retriever.retrieve_documents(query, query_vector=query_vector)
+        context = self._build_context(retrieved, query_vector, metrics)
+        metrics["retrieval_seconds"] = time.perf_counter() - started
+
+        parts = []
+        for delta in self.llm.generate_stream(build_messages(context, query)):
+            if not delta:
+                continue
+            if not parts:
+                metrics["time_to_first_token"] = time.perf_counter() - started
+            parts.append(delta)
+            metrics["deltas"] += 1
+            yield delta
+        metrics["total_seconds"] = time.perf_counter() - started
+        telemetry.observe(telemetry.STAGE_DURATION, metrics["retrieval_seconds"], stage="retrieve")
+        telemetry.observe("rag_time_to_first_token_seconds", metrics.get("time_to_first_token", metrics["total_seconds"]))
+        telemetry.observe(telemetry.STAGE_DURATION, metrics["total_seconds"], stage="query_stream")
+        logger.info(
+            f"Streamed answer: retrieval {metrics['retrieval_seconds']:.3f}s, "
+            f"first token {metrics.get('time_to_first_token', float('nan')):.3f}s, total {metrics['total_seconds']:.3f}s"
+        )
+
+        if self.semantic_cache is not None:
+            self.semantic_cache.store(query_vector, [doc.get("_id") for doc in retrieved], "".join(parts))
@@ -0,0 +1,197 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+from src.observability import telemetry
+from src.utils.chunk_ids import content_version
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+def _extract(extractor, file_path: str):
+    # Module-level so it can be shipped to a process pool
+    return extractor.extract(file_path)
+
+
+class _Stage:
+    """
+    A pool of worker threads reading from a bounded input queue and writing
+    every item ``fn`` yields to the next stage's queue. A full output queue
+    blocks the workers, which is what propagates back-pressure upstream.
+    """
+
+    def __init__(self, name: str, fn: Callable[[object], Iterable], workers: int, inbox: queue.Queue, outbox: queue.Queue, on_error: Callable):
+        if workers <= 0:
+            raise ValueError(f"Stage '{name}' needs at least one worker")
+        self.name = name
+        self.fn = fn
+        self.inbox = inbox
+        self.outbox = outbox
+        self.on_error = on_error
+        self.busy_seconds = 0.0
+        self._remaining = workers
+        self._lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=telemetry.propagate(self._run), name=f"ingest-{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def _run(self):
+        while True:
+            item = self.inbox.get()
+            if item is _DONE:
+                # Re-queue the sentinel for sibling workers of this stage
+                self.inbox.put(_DONE)
+                break
+            started = time.perf_counter()
+            try:
+                for result in self.fn(item):
+                    if self.outbox is not None:
+                        self.outbox.put(result)
+            except Exception as e:
+                self.on_error(self.name, item, e)
+            finally:
+                with self._lock:
+                    self.busy_seconds += time.perf_counter() - started
+
+        with self._lock:
+            self._remaining -= 1
+            last = self._remaining == 0
+        if last and self.outbox is not None:
+            self.outbox.put(_DONE)
+
+
+class StreamingIngestor:
+    """
+    Streams files through extract -> chunk -> embed -> index with a bounded
+    queue and a separate worker pool per stage, so CPU-bound extraction,
+    network-bound embedding and bulk indexing overlap while memory stays
+    proportional to the queue sizes rather than to the corpus.
+
+    Extraction can run in a process pool (``extract_processes``); the
+    extractor must then be picklable. A failing file or batch is logged and
+    recorded in the returned stats without stopping the stream.
+    """
+
+    def __init__(
+        self,
+        extractor,
+        chunker,
+        llm_engine,
+        vector_store,
+        extract_workers: int = 4,
+        extract_processes: bool = False,
+        chunk_workers: int = 2,
+        embed_workers: int = 4,
+        index_workers: int = 1,
+        queue_size: int = 16,
+        embed_batch_size: int = None,
+    ):
+        self.extractor = extractor
+        self.chunker = chunker
+        self.llm = llm_engine
+        self.vector_store = vector_store
+        self.extract_workers = extract_workers
+        self.extract_processes = extract_processes
+        self.chunk_workers = chunk_workers
+        self.embed_workers = embed_workers
+        self.index_workers = index_workers
+        self.queue_size = queue_size
+        self.embed_batch_size = embed_batch_size or llm_engine.embedding_batch_size
+
+    def ingest(self, file_paths: Iterable[str]) -> dict:
+        """
+        Ingest every file from ``file_paths``, which may be a lazy iterator.
+
+        :return: Stats with counts of files, chunks and indexed documents,
+            per-stage worker seconds (including time blocked on a full
+            downstream queue), and a list of failures.
+        """
+        stats = {"files": 0, "chunks": 0, "indexed": 0, "failures": [], "stage_seconds": {}}
+        stats_lock = threading.Lock()
+
+        def on_error(stage: str, item, error: Exception):
+            source = item[0] if isinstance(item, tuple) else item
+            logger.error(f"Streaming ingest stage '{stage}' failed for {source}: {error}")
+            with stats_lock:
+                stats["failures"].append({"stage": stage, "source": source, "error": str(error)})
+
+        process_pool = ProcessPoolExecutor(max_workers=self.extract_workers) if self.extract_processes else None
+
+        def extract(file_path: str) -> Iterator:
+            with telemetry.span("extract", source=file_path):
+                if process_pool is not None:
+                    text = process_pool.submit(_extract, self.extractor, file_path).result()
+                else:
+                    text = self.extractor.extract(file_path)
+            telemetry.increment("ingest_extracted_chars_total", len(text))
+            with stats_lock:
+                stats["files"] += 1
+            yield file_path, text
+
+        def chunk(item) -> Iterator:
+            file_path, text = item
+            with telemetry.span("chunk", source=file_path):
+                chunks = self.chunker.chunk(text)
+            telemetry.increment("ingest_chunks_total", len(chunks))
+            metadata = {"source": file_path, "version": content_version(text)}
+            with stats_lock:
+                stats["chunks"] += len(chunks)
+            for start in range(0, len(chunks), self.embed_batch_size):
+                yield file_path, metadata, chunks[start:start + self.embed_batch_size]
+
+        def embed(item) -> Iterator:
+            file_path, metadata, chunks = item
+            with telemetry.span("embed", texts=len(chunks)):
+                vectors = self.llm.embed(chunks, max_concurrency=1)
+            yield file_path, [
+                {"text": text, "vector": vector.tolist(), "metadata": metadata}
+                for text, vector in zip(chunks, vectors)
+            ]
+
+        def index(item) -> Iterator:
+            _, docs = item
+            with telemetry.span("index", documents=len(docs)):
+                self.vector_store.add_documents(docs)
+            with stats_lock:
+                stats["indexed"] += len(docs)
+            return iter(())
+
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(4)]
+        stages = [
+            _Stage("extract", extract, self.extract_workers, queues[0], queues[1], on_error),
+            _Stage("chunk", chunk, self.chunk_workers, queues[1], queues[2], on_error),
+            _Stage("embed", embed, self.embed_workers, queues[2], queues[3], on_error),
+            _Stage("index", index, self.index_workers, queues[3], None, on_error),
+        ]
+
+        started = time.perf_counter()
+        try:
+            for stage in stages:
+                stage.start()
+            for file_path in file_paths:
+                queues[0].put(file_path)
+            queues[0].put(_DONE)
+            for stage in stages:
+                for thread in stage.threads:
+                    thread.join()
+        finally:
+            if process_pool is not None:
+                process_pool.shutdown()
+
+        stats["stage_seconds"] = {stage.name: stage.busy_seconds for stage in stages}
+        stats["seconds"] = time.perf_counter() - started
+        logger.info(
+            f"Streaming ingest finished: {stats['files']} files, {stats['indexed']} chunks indexed, "
+            f"{len(stats['failures'])} failures in {stats['seconds']:.2f}s"
+        )
+        return stats
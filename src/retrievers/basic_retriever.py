@@ -0,0 +1,62 @@
+import numpy as np
+
+from src.core.llm_engine import BaseLLMEngine, AsyncBaseLLMEngine
+from src.core.retriever import BaseRetriever, AsyncBaseRetriever
+from src.core.vector_store import BaseVectorStore, AsyncBaseVectorStore
+
+
+class VectorStoreRetriever(BaseRetriever):
+    """
+    Embeds the query with ``llm_engine`` and returns the texts of the
+    ``k`` nearest chunks in ``vector_store``. ``search_options`` are passed
+    to the store's similarity_search (e.g. num_candidates, include_vectors).
+    """
+
+    def __init__(self, vector_store: BaseVectorStore, llm_engine: BaseLLMEngine, k: int = 3, filters: dict = None, **search_options):
+        self.vector_store = vector_store
+        self.llm_engine = llm_engine
+        self.k = k
+        self.filters = filters
+        self.search_options = search_options
+
+    def retrieve(self, query: str) -> list[str]:
+        return [doc["text"] for doc in self.retrieve_documents(query)]
+
+    def retrieve_documents(self, query: str, query_vector=None) -> list[dict]:
+        if query_vector is None:
+            query_vector = self.llm_engine.embed([query])[0]
+        return self.vector_store.similarity_search(
+            np.asarray(query_vector, dtype=np.float32).tolist(), k=self.k, filters=self.filters, **self.search_options
+        )
+
+    def retrieve_documents_batch(self, queries: list[str], query_vectors=None) -> list[list[dict]]:
+        """
+        Retrieve for several queries (e.g. expansions of one question) with
+        one embedding call and one batched search.
+        """
+        if query_vectors is None:
+            query_vectors = self.llm_engine.embed(queries)
+        return self.vector_store.similarity_search_batch(query_vectors, k=self.k, filters=self.filters, **self.search_options)
+
+
+class AsyncVectorStoreRetriever(AsyncBaseRetriever):
+    """
+    asyncio variant of VectorStoreRetriever.
+    """
+
+    def __init__(self, vector_store: AsyncBaseVectorStore, llm_engine: AsyncBaseLLMEngine, k: int = 3, filters: dict = None, **search_options):
+        self.vector_store = vector_store
+        self.llm_engine = llm_engine
+        self.k = k
+        self.filters = filters
+        self.search_options = search_options
+
+    async def retrieve(self, query: str) -> list[str]:
+        return [doc["text"] for doc in await self.retrieve_documents(query)]
+
+    async def retrieve_documents(self, query: str, query_vector=None) -> list[dict]:
+        if query_vector is None:
+            query_vector = (await self.llm_engine.embed([query]))[0]
+        return await self.vector_store.similarity_search(
+            np.asarray(query_vector, dtype=np.float32).tolist(), k=self.k, filters=self.filters, **self.search_options
+        )
@@ -0,0 +1,35 @@
+def reciprocal_rank_fusion(result_lists: list[list[dict]], k: int, rrf_k: int = 60) -> list[dict]:
+    """
+    Merge ranked result lists by reciprocal rank: a document scores
+    sum(1 / (rrf_k + rank)) over the lists it appears in. Documents are
+    matched by "_id" (falling back to "text"); the fused score replaces "_score".
+    """
+    fused, docs = {}, {}
+    for results in result_lists:
+        for rank, doc in enumerate(results, start=1):
+            key = doc.get("_id", doc["text"])
+            fused[key] = fused.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            docs.setdefault(key, doc)
+    ranked = sorted(fused, key=fused.get, reverse=True)[:k]
+    return [{**docs[key], "_score": fused[key]} for key in ranked]
+
+
+def weighted_score_fusion(result_lists: list[list[dict]], weights: list[float], k: int) -> list[dict]:
+    """
+    Merge result lists by a weighted sum of their min-max normalized "_score"s,
+    so lists with different score scales (BM25, cosine) are comparable.
+    """
+    fused, docs = {}, {}
+    for results, weight in zip(result_lists, weights):
+        if not results:
+            continue
+        scores = [doc["_score"] for doc in results]
+        low, high = min(scores), max(scores)
+        span = high - low
+        for doc in results:
+            key = doc.get("_id", doc["text"])
+            normalized = (doc["_score"] - low) / span if span else 1.0
+            fused[key] = fused.get(key, 0.0) + weight * normalized
+            docs.setdefault(key, doc)
+    ranked = sorted(fused, key=fused.get, reverse=True)[:k]
+    return [{**docs[key], "_score": fused[key]} for key in ranked]
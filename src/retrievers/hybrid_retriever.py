@@ -0,0 +1,75 @@
+import numpy as np
+
+from src.core.llm_engine import BaseLLMEngine
+from src.core.retriever import BaseRetriever
+from src.core.vector_store import BaseVectorStore
+from src.retrievers.fusion import reciprocal_rank_fusion, weighted_score_fusion
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Combines BM25 over chunk text with vector similarity.
+
+    The store fetches the top ``window`` results of both queries through
+    ``hybrid_candidates`` (a single msearch round trip on Elasticsearch,
+    in-process on NumpyVectorStore), which are then fused with reciprocal
+    rank fusion or a weighted sum of normalized scores. With ``native=True``
+    and a store that supports it, fusion happens server-side via
+    ``rrf_search`` instead.
+
+    :param fusion: "rrf" or "weighted".
+    :param vector_weight: Weight of the vector list for "weighted" fusion; BM25 gets the rest.
+    :param vector_options: Passed to the vector query (num_candidates, nprobe, ...).
+    """
+
+    def __init__(
+        self,
+        vector_store: BaseVectorStore,
+        llm_engine: BaseLLMEngine,
+        k: int = 3,
+        window: int = 50,
+        fusion: str = "rrf",
+        rrf_k: int = 60,
+        vector_weight: float = 0.5,
+        native: bool = False,
+        filters: dict = None,
+        **vector_options,
+    ):
+        if fusion not in ("rrf", "weighted"):
+            raise ValueError(f"Unknown fusion method: {fusion}")
+        if native and not hasattr(vector_store, "rrf_search"):
+            raise ValueError(f"{type(vector_store).__name__} does not support native RRF")
+        if not hasattr(vector_store, "hybrid_candidates"):
+            raise ValueError(f"{type(vector_store).__name__} does not support hybrid search")
+
+        self.vector_store = vector_store
+        self.llm_engine = llm_engine
+        self.k = k
+        self.window = max(window, k)
+        self.fusion = fusion
+        self.rrf_k = rrf_k
+        self.vector_weight = vector_weight
+        self.native = native
+        self.filters = filters
+        self.vector_options = vector_options
+
+    def retrieve(self, query: str) -> list[str]:
+        return [doc["text"] for doc in self.retrieve_documents(query)]
+
+    def retrieve_documents(self, query: str, query_vector=None) -> list[dict]:
+        if query_vector is None:
+            query_vector = self.llm_engine.embed([query])[0]
+        query_vector = np.asarray(query_vector, dtype=np.float32).tolist()
+
+        if self.native:
+            return self.vector_store.rrf_search(
+                query, query_vector, self.k, window=self.window, filters=self.filters,
+                num_candidates=self.vector_options.get("num_candidates"), rrf_k=self.rrf_k,
+            )
+
+        lexical, vector = self.vector_store.hybrid_candidates(
+            query, query_vector, self.window, filters=self.filters, **self.vector_options
+        )
+        if self.fusion == "rrf":
+            return reciprocal_rank_fusion([lexical, vector], self.k, rrf_k=self.rrf_k)
+        return weighted_score_fusion([lexical, vector], [1.0 - self.vector_weight, self.vector_weight], self.k)
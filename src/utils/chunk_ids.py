@@ -0,0 +1,20 @@
+import hashlib
+
+
+def chunk_id(text: str, source: str = None) -> str:
+    """
+    Deterministic id of a chunk: a hash of its source document and text, so
+    re-ingesting an unchanged chunk maps onto the already indexed one.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update((source or "").encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def content_version(text: str) -> str:
+    """
+    Short content hash identifying one version of an extracted document.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
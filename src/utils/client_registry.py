@@ -0,0 +1,60 @@
+"""
+Process-wide registry of SDK clients.
+
+Clients are created on first request and shared by every engine and store
+in the process that asks for the same kind and settings, so their HTTP
+connection pools (keep-alive) are reused instead of each instance opening
+its own. ``close_all`` closes them, e.g. at worker shutdown.
+"""
+import logging
+import threading
+from typing import Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_clients: dict = {}
+_lock = threading.Lock()
+
+
+def get_client(kind: str, factory: Callable[[], T], **settings) -> T:
+    """
+    The shared client of ``kind`` for ``settings``, created with ``factory()``
+    on first use. ``settings`` must be hashable and identify the client
+    completely (host, credentials, pool size, ...).
+    """
+    key = (kind, tuple(sorted(settings.items())))
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                logger.debug(f"Creating shared {kind} client")
+                client = _clients[key] = factory()
+    return client
+
+
+def elasticsearch_client(es_host: str, connections_per_node: int = 10):
+    """
+    Shared Elasticsearch client with a keep-alive pool of
+    ``connections_per_node`` connections per node.
+    """
+    def create():
+        from elasticsearch import Elasticsearch
+        return Elasticsearch(es_host, connections_per_node=connections_per_node)
+
+    return get_client("elasticsearch", create, es_host=es_host, connections_per_node=connections_per_node)
+
+
+def close_all():
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.warning(f"Failed to close {type(client).__name__}: {e}")
@@ -12,10 +12,17 @@ class ColorFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
 
+    def __init__(self, fmt=None, datefmt=None, style='%'):
+        super().__init__(fmt, datefmt, style)
+        # One formatter per level, built once instead of on every record
+        self._formatters = {
+            level: logging.Formatter(color + self._fmt + self.RESET, datefmt, style)
+            for level, color in self.COLORS.items()
+        }
+        self._default = logging.Formatter(self.RESET + self._fmt + self.RESET, datefmt, style)
+
     def format(self, record):
-        log_fmt = self.COLORS.get(record.levelname, self.RESET) + self._fmt + self.RESET
-        formatter = logging.Formatter(log_fmt)
-        return formatter.format(record)
+        return self._formatters.get(record.levelname, self._default).format(record)
 
 def setup_logger(level=logging.DEBUG):
     # Get root logger
@@ -0,0 +1,26 @@
+# (prefix, offset, mime type), checked in order
+_SIGNATURES = [
+    (b"\xff\xd8\xff", 0, "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", 0, "image/png"),
+    (b"GIF87a", 0, "image/gif"),
+    (b"GIF89a", 0, "image/gif"),
+    (b"WEBP", 8, "image/webp"),
+    (b"II*\x00", 0, "image/tiff"),
+    (b"MM\x00*", 0, "image/tiff"),
+    (b"BM", 0, "image/bmp"),
+    (b"ftypheic", 4, "image/heic"),
+    (b"ftypheix", 4, "image/heic"),
+    (b"ftypmif1", 4, "image/heif"),
+    (b"ftypavif", 4, "image/avif"),
+    (b"%PDF-", 0, "application/pdf"),
+]
+
+
+def sniff_mime(data: bytes, default: str = "application/octet-stream") -> str:
+    """
+    MIME type of ``data`` from its leading magic bytes, or ``default``.
+    """
+    for prefix, offset, mime_type in _SIGNATURES:
+        if data[offset:offset + len(prefix)] == prefix:
+            return mime_type
+    return default
@@ -0,0 +1,84 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket: ``rate`` tokens are added per second up to
+    ``burst``, and ``acquire`` blocks until enough tokens are available.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0 or burst <= 0:
+            raise ValueError("'rate' and 'burst' must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1):
+        if tokens > self.burst:
+            # The bucket never holds more than burst tokens, so this would wait forever
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of {self.burst}")
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """
+    RateLimiter whose rate adapts to the provider's quota (AIMD): an
+    ``on_throttle`` (a 429 / RESOURCE_EXHAUSTED response) multiplies the rate
+    by ``decrease`` down to ``min_rate``, and every ``on_success`` adds
+    ``increase`` tokens per second back, up to ``max_rate``.
+
+    Concurrent calls rejected by one overload episode all report it, so the
+    rate is decreased at most once per ``cooldown`` seconds; throttles
+    inside the window only drop the saved-up burst.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = None, max_rate: float = None,
+                 decrease: float = 0.5, increase: float = None, cooldown: float = 1.0):
+        super().__init__(rate, burst)
+        if not 0 < decrease < 1:
+            raise ValueError("'decrease' must be between 0 and 1")
+        self.min_rate = min_rate or rate / 32
+        self.max_rate = max_rate or rate
+        self.decrease = decrease
+        # By default, about 100 successful calls climb back from min_rate to max_rate
+        self.increase = increase if increase is not None else self.max_rate / 100
+        self.cooldown = cooldown
+        self._last_decrease = None
+
+    def on_throttle(self):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._last_decrease is None or now - self._last_decrease >= self.cooldown:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self._last_decrease = now
+            # Drop the saved-up burst so the lower rate takes effect immediately
+            self._tokens = 0.0
+
+    def on_success(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.increase)
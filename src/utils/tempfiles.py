@@ -0,0 +1,22 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Union
+
+
+@contextmanager
+def as_path(data: Union[bytes, str], suffix: str = ""):
+    """
+    Yield a filesystem path for ``data``: a path is passed through, bytes are
+    written once to a temporary file (removed on exit) so that worker
+    processes can open the file instead of each receiving a pickled copy.
+    """
+    if not isinstance(data, bytes):
+        yield data
+        return
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+        f.write(data)
+    try:
+        yield f.name
+    finally:
+        os.remove(f.name)
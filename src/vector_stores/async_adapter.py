@@ -0,0 +1,32 @@
+import asyncio
+
+from src.core.vector_store import BaseVectorStore, AsyncBaseVectorStore
+
+
+class AsyncVectorStoreAdapter(AsyncBaseVectorStore):
+    """
+    Exposes a synchronous vector store (e.g. NumpyVectorStore) through the
+    async interface by running its calls on the default thread pool, so it
+    can back an AsyncRAGPipeline without blocking the event loop.
+    """
+
+    def __init__(self, vector_store: BaseVectorStore):
+        self.vector_store = vector_store
+
+    async def add_documents(self, documents: list[dict], **kwargs):
+        return await asyncio.to_thread(self.vector_store.add_documents, documents, **kwargs)
+
+    async def similarity_search(self, query_vector: list[float], k: int, filters: dict = None, **kwargs):
+        return await asyncio.to_thread(self.vector_store.similarity_search, query_vector, k, filters, **kwargs)
+
+    async def similarity_search_batch(self, query_vectors, k: int, filters: dict = None, **kwargs):
+        return await asyncio.to_thread(self.vector_store.similarity_search_batch, query_vectors, k, filters, **kwargs)
+
+    async def update_metadata(self, ids: list[str], metadata: dict) -> int:
+        return await asyncio.to_thread(self.vector_store.update_metadata, ids, metadata)
+
+    async def warmup(self):
+        await asyncio.to_thread(self.vector_store.warmup)
+
+    def add_change_listener(self, listener):
+        self.vector_store.add_change_listener(listener)
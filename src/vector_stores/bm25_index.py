@@ -0,0 +1,64 @@
+import re
+from array import array
+
+import numpy as np
+
+TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    Append-only in-memory BM25 index over row-numbered texts.
+
+    Postings are kept per term as compact ``array`` buffers of (row, term
+    frequency) so adding documents is cheap; scoring a query accumulates
+    into a dense score vector with one vectorized update per query term.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._rows: dict[str, array] = {}
+        self._freqs: dict[str, array] = {}
+        self._doc_lengths = array("f")
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def add(self, texts: list[str]):
+        for text in texts:
+            row = len(self._doc_lengths)
+            tokens = tokenize(text)
+            self._doc_lengths.append(len(tokens))
+            counts: dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                if token not in self._rows:
+                    self._rows[token] = array("q")
+                    self._freqs[token] = array("f")
+                self._rows[token].append(row)
+                self._freqs[token].append(count)
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        BM25 score of every row for ``query``; rows sharing no term score 0.
+        """
+        n = len(self._doc_lengths)
+        scores = np.zeros(n, dtype=np.float32)
+        if n == 0:
+            return scores
+        doc_lengths = np.frombuffer(self._doc_lengths, dtype=np.float32)
+        length_norm = self.k1 * (1 - self.b + self.b * doc_lengths / max(doc_lengths.mean(), 1e-9))
+        for term in set(tokenize(query)):
+            if term not in self._rows:
+                continue
+            rows = np.frombuffer(self._rows[term], dtype=np.int64)
+            freqs = np.frombuffer(self._freqs[term], dtype=np.float32)
+            idf = np.log(1 + (n - len(rows) + 0.5) / (len(rows) + 0.5))
+            scores[rows] += idf * freqs * (self.k1 + 1) / (freqs + length_norm[rows])
+        return scores
@@ -1,111 +1,162 @@
-from src.core.vector_store import BaseVectorStore
-from elasticsearch import Elasticsearch
-from elasticsearch.helpers import bulk
-import uuid
+from src.core.vector_store import BaseVectorStore, AsyncBaseVectorStore
+from elasticsearch import AsyncElasticsearch
+from elasticsearch.helpers import async_bulk, parallel_bulk, scan, streaming_bulk
+from contextlib import contextmanager
+from itertools import repeat
+from typing import Iterable
+import time
+import numpy as np
+from src.utils.chunk_ids import chunk_id
+from src.utils.client_registry import elasticsearch_client
 import logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# (es_host, index_name) pairs known to exist, so further stores on the same
+# index skip the existence round trip, mapped to the index's filter fields
+_verified_indices: dict = {}
 
-class ElasticsearchVectorStore(BaseVectorStore):
-    def __init__(
-        self,
-        index_name: str,
-        embedding_dim: int = 768,
-        es_host: str = "http://localhost:9200",
-        extra_mappings: dict = None,
-    ):
-        self.embedding_dim = embedding_dim
-        self.index_name = index_name
-        self.client = Elasticsearch(es_host)
+# Metadata fields that filters (e.g. get_ids({"source": ...})) match exactly
+KEYWORD_FIELDS = ("source", "version")
 
-        logger.info(f"Connecting to Elasticsearch at {es_host}")
-        if not self.client.indices.exists(index=self.index_name):
-            logger.info(f"Index '{self.index_name}' does not exist. Creating index.")
-            self._create_index(extra_mappings or {})
-        else:
-            logger.info(f"Index '{self.index_name}' already exists.")
 
-    def _create_index(self, extra_mappings: dict):
+class _ElasticsearchRequests:
+    """
+    Request building and response handling shared by the sync and async stores.
+    Subclasses provide ``index_name`` and ``embedding_dim``.
+    """
+
+    # Filter key -> field queried for it, where an older index lacks the keyword mapping
+    _filter_fields: dict = {}
+
+    def _index_body(self, extra_mappings: dict) -> dict:
         """
-        Creates an index with vector, text, and any additional mapping fields.
+        Index body with vector, text, and any additional mapping fields.
         """
-        mapping = {
+        vector_mapping = {
+            "type": "dense_vector",
+            "dims": self.embedding_dim,
+            "index": True,
+            "similarity": "cosine"
+        }
+        if self.index_options:
+            # e.g. "int8_hnsw", "int4_hnsw", "bbq_hnsw" or {"type": "int8_hnsw", "m": 16, ...}
+            options = self.index_options
+            vector_mapping["index_options"] = {"type": options} if isinstance(options, str) else dict(options)
+        return {
             "mappings": {
                 "properties": {
                     "text": {"type": "text"},
-                    "vector": {
-                        "type": "dense_vector",
-                        "dims": self.embedding_dim,
-                        "index": True,
-                        "similarity": "cosine"
-                    },
+                    "vector": vector_mapping,
+                    "source": {"type": "keyword"},
+                    "version": {"type": "keyword"},
                     **extra_mappings
                 }
             }
         }
-        logger.debug(f"Creating index '{self.index_name}' with mapping: {mapping}")
-        self.client.indices.create(index=self.index_name, body=mapping)
-        logger.info(f"Index '{self.index_name}' created successfully.")
 
-    def add_documents(self, documents: list[dict]):
+    def _iter_actions(self, documents: Iterable[dict]):
         """
-        Add documents with structure:
-        {
-            "text": "...",
-            "vector": [...],  # required, embedding vector
-            "metadata": { arbitrary key/values }
-        }
+        Lazily validate documents and turn them into bulk index actions.
+        Vectors may be lists or numpy arrays; arrays are converted one
+        document at a time. The ``_id`` is the document's "id", or a hash of
+        its text and source, so re-indexing a chunk overwrites it.
         """
-        logger.info(f"Adding {len(documents)} documents to index '{self.index_name}'")
         for doc in documents:
             if "text" not in doc or "vector" not in doc:
                 logger.error("Each document must contain 'text' and 'vector' fields")
                 raise ValueError("Each document must contain 'text' and 'vector' fields")
-            if not isinstance(doc["vector"], list) or len(doc["vector"]) != self.embedding_dim:
+            vector = doc["vector"]
+            if isinstance(vector, np.ndarray):
+                vector = vector.tolist()
+            if not isinstance(vector, list) or len(vector) != self.embedding_dim:
                 logger.error(f"Each 'vector' must be a list of length {self.embedding_dim}")
                 raise ValueError(f"Each 'vector' must be a list of length {self.embedding_dim}")
 
-        actions = []
-        for doc in documents:
             metadata = doc.get("metadata", {})
             source = {
                 "text": doc["text"],
-                "vector": doc["vector"],
+                "vector": vector,
                 **metadata  # flatten metadata fields
             }
-            actions.append({
+            yield {
                 "_index": self.index_name,
-                "_id": str(uuid.uuid4()),
+                "_id": doc.get("id") or chunk_id(doc["text"], metadata.get("source")),
                 "_source": source
-            })
+            }
 
-        logger.debug(f"Bulk indexing {len(actions)} documents")
-        bulk(self.client, actions)
-        logger.info(f"Successfully added {len(actions)} documents to index '{self.index_name}'")
+    def _build_actions(self, documents: list[dict]) -> list[dict]:
+        return list(self._iter_actions(documents))
+
+    def _filter_clauses(self, filters: dict) -> list[dict]:
+        filter_clauses = []
+        for key, value in (filters or {}).items():
+            key = self._filter_fields.get(key, key)
+            if isinstance(value, list):
+                filter_clauses.append({"terms": {key: value}})
+            else:
+                filter_clauses.append({"term": {key: value}})
+        return filter_clauses
 
-    def similarity_search(self, query_vector: list[float], k: int, filters: dict = None):
+    def _reconcile_mapping(self, mapping_response) -> dict:
         """
-        Perform similarity search with optional filters on metadata fields.
-        query_vector: list of floats, must match embedding_dim
+        Check the mapping of an existing index against KEYWORD_FIELDS. Returns
+        the missing fields, to be added with put_mapping; filters on a field
+        that was dynamically mapped as text go to its "keyword" sub-field.
         """
-        logger.info(f"Performing similarity search on index '{self.index_name}' with k={k} and filters={filters}")
+        missing, filter_fields = {}, {}
+        for index in mapping_response:
+            properties = mapping_response[index]["mappings"].get("properties", {})
+            for field in KEYWORD_FIELDS:
+                current = properties.get(field)
+                if current is None:
+                    missing[field] = {"type": "keyword"}
+                elif current.get("type") != "keyword":
+                    if current.get("fields", {}).get("keyword", {}).get("type") == "keyword":
+                        filter_fields[field] = f"{field}.keyword"
+                    else:
+                        logger.warning(
+                            f"Field '{field}' of index '{self.index_name}' is mapped as {current.get('type')}, "
+                            f"not keyword; exact filters on it will not match. Reindex to fix the mapping."
+                        )
+        self._filter_fields = filter_fields
+        return missing
+
+    def _search_body(
+        self,
+        query_vector: list[float],
+        k: int,
+        filters: dict = None,
+        num_candidates: int = None,
+        rerank_window: int = None,
+        include_vectors: bool = False,
+    ) -> dict:
         if not isinstance(query_vector, list) or len(query_vector) != self.embedding_dim:
             logger.error(f"'query_vector' must be a list of length {self.embedding_dim}")
             raise ValueError(f"'query_vector' must be a list of length {self.embedding_dim}")
 
+        filter_clauses = self._filter_clauses(filters)
+        if num_candidates:
+            window = max(k, rerank_window or 0)
+            knn = {
+                "field": "vector",
+                "query_vector": query_vector,
+                "k": window,
+                "num_candidates": max(num_candidates, window),
+            }
+            if filter_clauses:
+                knn["filter"] = filter_clauses
+            body = {"size": window, "knn": knn}
+            if not include_vectors and not rerank_window:
+                body["_source"] = {"excludes": ["vector"]}
+            return body
+
         base_query = {"match_all": {}}
-        if filters:
-            filter_clauses = []
-            for key, value in filters.items():
-                if isinstance(value, list):
-                    filter_clauses.append({"terms": {key: value}})
-                else:
-                    filter_clauses.append({"term": {key: value}})
+        if filter_clauses:
             base_query = {"bool": {"filter": filter_clauses}}
 
-        search_query = {
+        return {
             "size": k,
+            **({} if include_vectors else {"_source": {"excludes": ["vector"]}}),
             "query": {
                 "script_score": {
                     "query": base_query,
@@ -117,7 +168,567 @@ class ElasticsearchVectorStore(BaseVectorStore):
             }
         }
 
-        logger.debug(f"Search query: {search_query}")
-        response = self.client.search(index=self.index_name, body=search_query)
+    @staticmethod
+    def _cosine_scores(sources: list[dict], knn: bool) -> list[dict]:
+        """
+        Map vector query scores back to cosine similarity, the scale the
+        numpy store reports: kNN on a cosine field scores (1 + cos) / 2,
+        the script_score query cos + 1.
+        """
+        for source in sources:
+            source["_score"] = 2.0 * source["_score"] - 1.0 if knn else source["_score"] - 1.0
+        return sources
+
+    def _search_results(
+        self, response, query_vector: list[float], k: int, num_candidates: int = None, rerank_window: int = None, include_vectors: bool = False
+    ) -> list[dict]:
         logger.info(f"Similarity search returned {len(response['hits']['hits'])} results")
-        return [hit["_source"] for hit in response["hits"]["hits"]]
+        sources = self._cosine_scores(self._hits_to_docs(response["hits"]["hits"]), bool(num_candidates))
+        if num_candidates and rerank_window and sources:
+            sources = self._rerank_exact(query_vector, sources, k)
+            if not include_vectors:
+                # Fetched for the re-rank only
+                for source in sources:
+                    source.pop("vector", None)
+        return sources[:k]
+
+    def _batch_searches(
+        self, query_vectors: list[list[float]], k: int, filters: dict = None, num_candidates: int = None, rerank_window: int = None, include_vectors: bool = False
+    ) -> list[dict]:
+        """
+        msearch header/body pairs, one similarity search per query vector.
+        """
+        searches = []
+        for query_vector in query_vectors:
+            searches.append({"index": self.index_name})
+            searches.append(self._search_body(query_vector, k, filters, num_candidates, rerank_window, include_vectors))
+        return searches
+
+    def _batch_results(
+        self, response, query_vectors: list[list[float]], k: int, num_candidates: int = None, rerank_window: int = None, include_vectors: bool = False
+    ) -> list[list[dict]]:
+        results = []
+        for query_vector, sub_response in zip(query_vectors, response["responses"]):
+            if "error" in sub_response:
+                logger.error(f"Batched similarity search sub-query failed: {sub_response['error']}")
+                raise RuntimeError(f"Batched similarity search sub-query failed: {sub_response['error']}")
+            results.append(self._search_results(sub_response, query_vector, k, num_candidates, rerank_window, include_vectors))
+        return results
+
+    @staticmethod
+    def _hits_to_docs(hits: list[dict]) -> list[dict]:
+        return [{**hit["_source"], "_id": hit["_id"], "_score": hit["_score"]} for hit in hits]
+
+    def _lexical_body(self, query_text: str, k: int, filters: dict = None) -> dict:
+        return {
+            "size": k,
+            "query": {
+                "bool": {
+                    "must": [{"match": {"text": query_text}}],
+                    "filter": self._filter_clauses(filters),
+                }
+            }
+        }
+
+    def _rerank_exact(self, query_vector: list[float], sources: list[dict], k: int) -> list[dict]:
+        """
+        Re-order kNN candidates by exact cosine similarity against their stored vectors.
+        """
+        matrix = np.asarray([source["vector"] for source in sources], dtype=np.float32)
+        query = np.asarray(query_vector, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        norms[norms == 0] = 1.0
+        scores = (matrix @ query) / norms
+        order = np.argsort(-scores)[:k]
+        return [{**sources[i], "_score": float(scores[i])} for i in order]
+
+
+class ElasticsearchVectorStore(_ElasticsearchRequests, BaseVectorStore):
+    """
+    Vector store on an Elasticsearch index with a ``dense_vector`` field.
+
+    ``index_options`` selects the HNSW storage format when the index is
+    created, e.g. "int8_hnsw" (4x less vector memory), "int4_hnsw" or
+    "bbq_hnsw" (binary, ~32x). Quantized indices keep the float vectors in
+    ``_source``, so ``similarity_search(..., num_candidates=..., rerank_window=...)``
+    re-scores the best candidates at full precision.
+
+    The Elasticsearch client comes from the process-wide client registry, so
+    stores on the same host share one keep-alive connection pool of
+    ``connections_per_node`` connections per node.
+    """
+
+    def __init__(
+        self,
+        index_name: str,
+        embedding_dim: int = 768,
+        es_host: str = "http://localhost:9200",
+        extra_mappings: dict = None,
+        index_options=None,
+        connections_per_node: int = 10,
+    ):
+        self.embedding_dim = embedding_dim
+        self.index_name = index_name
+        self.index_options = index_options
+        self.es_host = es_host
+        self.client = elasticsearch_client(es_host, connections_per_node=connections_per_node)
+
+        logger.info(f"Connecting to Elasticsearch at {es_host}")
+        self.ensure_index(extra_mappings or {})
+
+    def ensure_index(self, extra_mappings: dict = None):
+        """
+        Create the index unless it exists, otherwise add any keyword field
+        missing from its mapping (indices created before the field was).
+        Checked once per host and index per process; delete the index with
+        ``delete_index`` so that a later store on the same name recreates it.
+        """
+        filter_fields = _verified_indices.get((self.es_host, self.index_name))
+        if filter_fields is not None:
+            self._filter_fields = filter_fields
+            return
+        if not self.client.indices.exists(index=self.index_name):
+            logger.info(f"Index '{self.index_name}' does not exist. Creating index.")
+            self._create_index(extra_mappings or {})
+        else:
+            logger.info(f"Index '{self.index_name}' already exists.")
+            missing = self._reconcile_mapping(self.client.indices.get_mapping(index=self.index_name))
+            if missing:
+                logger.info(f"Adding keyword fields {sorted(missing)} to the mapping of index '{self.index_name}'")
+                self.client.indices.put_mapping(index=self.index_name, properties=missing)
+        _verified_indices[(self.es_host, self.index_name)] = self._filter_fields
+
+    def delete_index(self):
+        """
+        Delete the index and forget that it was verified, so the next
+        ensure_index (of this or another store) creates it again.
+        """
+        _verified_indices.pop((self.es_host, self.index_name), None)
+        self._filter_fields = {}
+        self.client.indices.delete(index=self.index_name, ignore_unavailable=True)
+        logger.info(f"Deleted index '{self.index_name}'")
+
+    def warmup(self):
+        """
+        Open a pooled connection and verify the index ahead of the first request.
+        """
+        self.client.info()
+        self.ensure_index()
+        logger.info(f"Warmed up Elasticsearch store for index '{self.index_name}'")
+
+    def _create_index(self, extra_mappings: dict):
+        """
+        Creates an index with vector, text, and any additional mapping fields.
+        """
+        mapping = self._index_body(extra_mappings)
+        logger.debug(f"Creating index '{self.index_name}' with mapping: {mapping}")
+        self.client.indices.create(index=self.index_name, body=mapping)
+        logger.info(f"Index '{self.index_name}' created successfully.")
+
+    def add_documents(self, documents: Iterable[dict], raise_on_error: bool = True, **bulk_options) -> dict:
+        """
+        Add or replace documents with structure:
+        {
+            "id": "...",      # optional, defaults to chunk_id(text, metadata["source"])
+            "text": "...",
+            "vector": [...],  # required, embedding vector (list or ndarray)
+            "metadata": { arbitrary key/values }
+        }
+        ``documents`` may be any iterable; it is consumed lazily, see bulk_index
+        for ``bulk_options``. Raises RuntimeError if any document is rejected
+        unless ``raise_on_error`` is False.
+        """
+        logger.info(f"Adding documents to index '{self.index_name}'")
+        report = self.bulk_index(documents, **bulk_options)
+        if report["indexed"]:
+            self._notify_change("add")
+        if report["failed"] and raise_on_error:
+            logger.error(f"Failed to index {len(report['failed'])} documents into '{self.index_name}'")
+            raise RuntimeError(
+                f"Failed to index {len(report['failed'])} documents into '{self.index_name}': {report['failed'][:3]}"
+            )
+        logger.info(f"Successfully added {report['indexed']} documents to index '{self.index_name}'")
+        return report
+
+    def add_embeddings(self, texts: Iterable[str], vectors: Iterable, metadatas: Iterable[dict] = None, **bulk_options) -> dict:
+        """
+        Index parallel iterables of texts and vectors (e.g. a 2-D ndarray)
+        without building intermediate document dicts up front.
+        """
+        documents = (
+            {"text": text, "vector": vector, "metadata": metadata or {}}
+            for text, vector, metadata in zip(texts, vectors, metadatas if metadatas is not None else repeat(None))
+        )
+        return self.add_documents(documents, **bulk_options)
+
+    def bulk_index(
+        self,
+        documents: Iterable[dict],
+        chunk_size: int = 500,
+        thread_count: int = 1,
+        max_chunk_bytes: int = 100 * 1024 * 1024,
+        max_retries: int = 3,
+        initial_backoff: float = 2.0,
+        max_backoff: float = 60.0,
+    ) -> dict:
+        """
+        Stream documents into the index in chunks without materializing the
+        action list.
+
+        :param documents: Iterable of documents, see add_documents.
+        :param chunk_size: Documents per bulk request.
+        :param thread_count: Concurrent bulk requests; above 1 uses parallel_bulk.
+        :param max_chunk_bytes: Upper bound on a bulk request body.
+        :param max_retries: Retries for documents rejected with 429, with
+            exponential backoff starting at ``initial_backoff`` seconds.
+        :param max_backoff: Cap on a single backoff sleep.
+        :return: {"indexed": int, "failed": [{"_id", "status", "error"}, ...]}
+        """
+        report = {"indexed": 0, "failed": []}
+        retry_options = {"initial_backoff": initial_backoff, "max_backoff": max_backoff}
+
+        if thread_count <= 1:
+            results = streaming_bulk(
+                self.client, self._iter_actions(documents),
+                chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes, max_retries=max_retries,
+                raise_on_error=False, raise_on_exception=False, **retry_options,
+            )
+            for ok, item in results:
+                self._record_bulk_item(report, ok, item)
+            return report
+
+        # parallel_bulk has no retry support: remember in-flight actions so
+        # 429-rejected ones can be replayed through streaming_bulk afterwards.
+        in_flight, rejected = {}, []
+
+        def tracked_actions():
+            for action in self._iter_actions(documents):
+                in_flight[action["_id"]] = action
+                yield action
+
+        results = parallel_bulk(
+            self.client, tracked_actions(),
+            thread_count=thread_count, chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes,
+            raise_on_error=False, raise_on_exception=False,
+        )
+        for ok, item in results:
+            info = next(iter(item.values()))
+            action = in_flight.pop(info.get("_id"), None)
+            if not ok and info.get("status") == 429 and action is not None and max_retries > 0:
+                rejected.append(action)
+            else:
+                self._record_bulk_item(report, ok, item)
+
+        if rejected:
+            logger.warning(f"Retrying {len(rejected)} documents rejected with 429 after {initial_backoff}s")
+            time.sleep(min(initial_backoff, max_backoff))
+            results = streaming_bulk(
+                self.client, rejected,
+                chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes, max_retries=max_retries - 1,
+                raise_on_error=False, raise_on_exception=False,
+                initial_backoff=initial_backoff * 2, max_backoff=max_backoff,
+            )
+            for ok, item in results:
+                self._record_bulk_item(report, ok, item)
+        return report
+
+    def delete_documents(self, ids: list[str], chunk_size: int = 500) -> dict:
+        """
+        Delete documents by id; ids that are not in the index are ignored.
+        :return: {"deleted": int, "failed": [{"_id", "status", "error"}, ...]}
+        """
+        report = {"deleted": 0, "failed": []}
+        actions = ({"_op_type": "delete", "_index": self.index_name, "_id": doc_id} for doc_id in ids)
+        deleted = []
+        for ok, item in streaming_bulk(self.client, actions, chunk_size=chunk_size, raise_on_error=False, raise_on_exception=False):
+            info = item["delete"]
+            if ok:
+                report["deleted"] += 1
+                deleted.append(info["_id"])
+            elif info.get("status") != 404:
+                report["failed"].append({"_id": info.get("_id"), "status": info.get("status"), "error": info.get("error")})
+        if deleted:
+            self._notify_change("delete", deleted)
+        logger.info(f"Deleted {report['deleted']} documents from index '{self.index_name}'")
+        return report
+
+    def update_metadata(self, ids: list[str], metadata: dict, chunk_size: int = 500) -> int:
+        """
+        Partially update the given documents with the ``metadata`` fields;
+        text and vectors are not re-sent. Ids that are not in the index are ignored.
+        Returns the number of documents updated.
+        """
+        actions = ({"_op_type": "update", "_index": self.index_name, "_id": doc_id, "doc": metadata} for doc_id in ids)
+        updated = 0
+        for ok, item in streaming_bulk(self.client, actions, chunk_size=chunk_size, raise_on_error=False, raise_on_exception=False):
+            info = item["update"]
+            if ok:
+                updated += 1
+            elif info.get("status") != 404:
+                logger.error(f"Failed to update metadata of document '{info.get('_id')}': {info.get('error')}")
+        logger.info(f"Updated metadata of {updated} documents in index '{self.index_name}'")
+        return updated
+
+    def get_ids(self, filters: dict = None) -> set[str]:
+        query = {"bool": {"filter": self._filter_clauses(filters)}} if filters else {"match_all": {}}
+        hits = scan(self.client, index=self.index_name, query={"query": query, "_source": False}, size=1000)
+        return {hit["_id"] for hit in hits}
+
+    @staticmethod
+    def _record_bulk_item(report: dict, ok: bool, item: dict):
+        info = next(iter(item.values()))
+        if ok:
+            report["indexed"] += 1
+        else:
+            report["failed"].append({"_id": info.get("_id"), "status": info.get("status"), "error": info.get("error")})
+
+    @contextmanager
+    def bulk_load(self):
+        """
+        Disable refresh and replicas for the duration of a large load, then
+        restore the previous settings and refresh once:
+
+            with store.bulk_load():
+                store.add_documents(docs, thread_count=4)
+        """
+        settings = self.client.indices.get_settings(index=self.index_name)[self.index_name]["settings"]["index"]
+        previous = {
+            "refresh_interval": settings.get("refresh_interval"),
+            "number_of_replicas": settings.get("number_of_replicas"),
+        }
+        logger.info(f"Disabling refresh and replicas on '{self.index_name}' for bulk load")
+        self.client.indices.put_settings(
+            index=self.index_name, settings={"index": {"refresh_interval": "-1", "number_of_replicas": 0}}
+        )
+        try:
+            yield self
+        finally:
+            # None resets a setting to the cluster default
+            self.client.indices.put_settings(index=self.index_name, settings={"index": previous})
+            self.client.indices.refresh(index=self.index_name)
+            logger.info(f"Restored index settings on '{self.index_name}': {previous}")
+
+    def similarity_search(
+        self,
+        query_vector: list[float],
+        k: int,
+        filters: dict = None,
+        num_candidates: int = None,
+        rerank_window: int = None,
+        include_vectors: bool = False,
+    ):
+        """
+        Perform similarity search with optional filters on metadata fields.
+        query_vector: list of floats, must match embedding_dim
+        Each result's "_score" is its cosine similarity to the query, in [-1, 1].
+        num_candidates: when set, use the native approximate kNN search over the
+            HNSW graph, examining this many candidates per shard (higher means
+            better recall and slower queries). When None, every matching
+            document is scored exactly with a script_score query.
+        rerank_window: kNN mode only. Fetch this many nearest candidates and
+            re-rank them client-side by exact cosine similarity before keeping k.
+        include_vectors: return each result's stored vector as "vector" (e.g.
+            for MMR in the ContextBuilder); otherwise it is left out of _source.
+        """
+        logger.info(f"Performing similarity search on index '{self.index_name}' with k={k} and filters={filters}")
+        search_query = self._search_body(query_vector, k, filters, num_candidates, rerank_window, include_vectors)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            # The body embeds the full query vector; only format it when it is logged
+            logger.debug(f"Search query: {search_query}")
+        response = self.client.search(index=self.index_name, body=search_query)
+        return self._search_results(response, query_vector, k, num_candidates, rerank_window, include_vectors)
+
+    def similarity_search_batch(
+        self,
+        query_vectors,
+        k: int,
+        filters: dict = None,
+        num_candidates: int = None,
+        rerank_window: int = None,
+        include_vectors: bool = False,
+    ) -> list[list[dict]]:
+        """
+        Run one similarity search per query vector (rows of a 2-D array) in a
+        single msearch round trip; options as for similarity_search.
+        """
+        logger.info(f"Performing batched similarity search for {len(query_vectors)} queries on index '{self.index_name}' with k={k} and filters={filters}")
+        query_vectors = np.asarray(query_vectors, dtype=np.float32).tolist()
+        if not query_vectors:
+            return []
+        searches = self._batch_searches(query_vectors, k, filters, num_candidates, rerank_window, include_vectors)
+        response = self.client.msearch(body=searches)
+        return self._batch_results(response, query_vectors, k, num_candidates, rerank_window, include_vectors)
+
+    def hybrid_candidates(
+        self,
+        query_text: str,
+        query_vector: list[float],
+        window: int,
+        filters: dict = None,
+        **vector_options,
+    ):
+        """
+        Run a BM25 query on the text field and a vector query in a single
+        msearch round trip and return both result lists for rank fusion.
+        Lexical results carry BM25 scores, vector results cosine similarities.
+        ``vector_options`` are passed to the vector query (num_candidates, ...).
+        """
+        logger.info(f"Performing hybrid search on index '{self.index_name}' with window={window} and filters={filters}")
+        vector_body = self._search_body(query_vector, window, filters, **vector_options)
+        searches = [
+            {"index": self.index_name}, self._lexical_body(query_text, window, filters),
+            {"index": self.index_name}, vector_body,
+        ]
+        response = self.client.msearch(body=searches)
+        results = []
+        for sub_response in response["responses"]:
+            if "error" in sub_response:
+                logger.error(f"Hybrid search sub-query failed: {sub_response['error']}")
+                raise RuntimeError(f"Hybrid search sub-query failed: {sub_response['error']}")
+            results.append(self._hits_to_docs(sub_response["hits"]["hits"]))
+        lexical, vector = results
+        self._cosine_scores(vector, bool(vector_options.get("num_candidates")))
+        if vector_options.get("num_candidates") and vector_options.get("rerank_window") and vector:
+            vector = self._rerank_exact(query_vector, vector, window)
+            if not vector_options.get("include_vectors"):
+                for source in vector:
+                    source.pop("vector", None)
+        return lexical, vector
+
+    def rrf_search(
+        self,
+        query_text: str,
+        query_vector: list[float],
+        k: int,
+        window: int = 50,
+        filters: dict = None,
+        num_candidates: int = None,
+        rrf_k: int = 60,
+    ):
+        """
+        Server-side hybrid search with Elasticsearch's native RRF retriever
+        (BM25 standard retriever + kNN retriever), fused in one request.
+        "_score" is the RRF score, comparable only within one result list.
+        """
+        logger.info(f"Performing RRF search on index '{self.index_name}' with k={k} and filters={filters}")
+        knn = self._search_body(query_vector, window, filters, num_candidates=num_candidates or max(window * 2, 100))["knn"]
+        body = {
+            "size": k,
+            "retriever": {
+                "rrf": {
+                    "retrievers": [
+                        {"standard": {"query": self._lexical_body(query_text, window, filters)["query"]}},
+                        {"knn": knn},
+                    ],
+                    "rank_window_size": window,
+                    "rank_constant": rrf_k,
+                }
+            }
+        }
+        response = self.client.search(index=self.index_name, body=body)
+        logger.info(f"RRF search returned {len(response['hits']['hits'])} results")
+        return self._hits_to_docs(response["hits"]["hits"])
+
+
+class AsyncElasticsearchVectorStore(_ElasticsearchRequests, AsyncBaseVectorStore):
+    """
+    asyncio variant of ElasticsearchVectorStore backed by AsyncElasticsearch.
+    Call ``await store.ensure_index()`` (or use ``await AsyncElasticsearchVectorStore.create(...)``)
+    before the first request.
+    """
+
+    def __init__(
+        self,
+        index_name: str,
+        embedding_dim: int = 768,
+        es_host: str = "http://localhost:9200",
+        extra_mappings: dict = None,
+        index_options=None,
+    ):
+        self.embedding_dim = embedding_dim
+        self.index_name = index_name
+        self.index_options = index_options
+        self.extra_mappings = extra_mappings or {}
+        self.client = AsyncElasticsearch(es_host)
+        logger.info(f"Connecting to Elasticsearch at {es_host}")
+
+    @classmethod
+    async def create(cls, *args, **kwargs) -> "AsyncElasticsearchVectorStore":
+        store = cls(*args, **kwargs)
+        await store.ensure_index()
+        return store
+
+    async def warmup(self):
+        await self.client.info()
+        await self.ensure_index()
+
+    async def ensure_index(self):
+        if not await self.client.indices.exists(index=self.index_name):
+            logger.info(f"Index '{self.index_name}' does not exist. Creating index.")
+            mapping = self._index_body(self.extra_mappings)
+            logger.debug(f"Creating index '{self.index_name}' with mapping: {mapping}")
+            await self.client.indices.create(index=self.index_name, body=mapping)
+            logger.info(f"Index '{self.index_name}' created successfully.")
+        else:
+            logger.info(f"Index '{self.index_name}' already exists.")
+            missing = self._reconcile_mapping(await self.client.indices.get_mapping(index=self.index_name))
+            if missing:
+                logger.info(f"Adding keyword fields {sorted(missing)} to the mapping of index '{self.index_name}'")
+                await self.client.indices.put_mapping(index=self.index_name, properties=missing)
+
+    async def add_documents(self, documents: list[dict]):
+        """
+        Add documents, see ElasticsearchVectorStore.add_documents.
+        """
+        logger.info(f"Adding {len(documents)} documents to index '{self.index_name}'")
+        actions = self._build_actions(documents)
+
+        logger.debug(f"Bulk indexing {len(actions)} documents")
+        await async_bulk(self.client, actions)
+        self._notify_change("add", [action["_id"] for action in actions])
+        logger.info(f"Successfully added {len(actions)} documents to index '{self.index_name}'")
+
+    async def similarity_search(
+        self,
+        query_vector: list[float],
+        k: int,
+        filters: dict = None,
+        num_candidates: int = None,
+        rerank_window: int = None,
+        include_vectors: bool = False,
+    ):
+        """
+        Perform similarity search, see ElasticsearchVectorStore.similarity_search.
+        """
+        logger.info(f"Performing similarity search on index '{self.index_name}' with k={k} and filters={filters}")
+        search_query = self._search_body(query_vector, k, filters, num_candidates, rerank_window, include_vectors)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            # The body embeds the full query vector; only format it when it is logged
+            logger.debug(f"Search query: {search_query}")
+        response = await self.client.search(index=self.index_name, body=search_query)
+        return self._search_results(response, query_vector, k, num_candidates, rerank_window, include_vectors)
+
+    async def similarity_search_batch(
+        self,
+        query_vectors,
+        k: int,
+        filters: dict = None,
+        num_candidates: int = None,
+        rerank_window: int = None,
+        include_vectors: bool = False,
+    ) -> list[list[dict]]:
+        """
+        Batched similarity search, see ElasticsearchVectorStore.similarity_search_batch.
+        """
+        logger.info(f"Performing batched similarity search for {len(query_vectors)} queries on index '{self.index_name}' with k={k} and filters={filters}")
+        query_vectors = np.asarray(query_vectors, dtype=np.float32).tolist()
+        if not query_vectors:
+            return []
+        searches = self._batch_searches(query_vectors, k, filters, num_candidates, rerank_window, include_vectors)
+        response = await self.client.msearch(body=searches)
+        return self._batch_results(response, query_vectors, k, num_candidates, rerank_window, include_vectors)
+
+    async def close(self):
+        await self.client.close()
@@ -0,0 +1,127 @@
+import os
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def spherical_kmeans(vectors: np.ndarray, n_clusters: int, n_iter: int = 20, seed: int = 0) -> np.ndarray:
+    """
+    Cluster L2-normalized vectors by cosine similarity.
+
+    :param vectors: float32 matrix of shape (n, dim), rows already normalized.
+    :param n_clusters: Number of centroids to learn.
+    :param n_iter: Number of Lloyd iterations.
+    :param seed: Seed for centroid initialization.
+    :return: Normalized centroids of shape (n_clusters, dim).
+    """
+    if len(vectors) < n_clusters:
+        raise ValueError(f"Need at least {n_clusters} vectors to train {n_clusters} clusters, got {len(vectors)}")
+
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        counts = np.bincount(assignments, minlength=n_clusters)
+        empty = counts == 0
+        if empty.any():
+            # Re-seed empty clusters with random points so every list stays usable
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted-file index over normalized vectors.
+
+    Vectors are bucketed by their nearest k-means centroid. A query only
+    scores the rows in its ``nprobe`` closest buckets, so ``nprobe`` is the
+    recall-vs-latency knob: ``nprobe == n_lists`` is an exact search.
+    The index stores row numbers only; vectors stay in the owning store.
+    """
+
+    def __init__(self, centroids: np.ndarray, nprobe: int = 8):
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.nprobe = nprobe
+        self._assignments = np.empty(0, dtype=np.int32)
+        self._lists: list[np.ndarray] = [np.empty(0, dtype=np.int64) for _ in range(self.n_lists)]
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    def __len__(self) -> int:
+        return len(self._assignments)
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, n_lists: int, n_iter: int = 20, nprobe: int = 8, seed: int = 0) -> "IVFIndex":
+        logger.info(f"Training IVF index with {n_lists} lists on {len(vectors)} vectors")
+        return cls(spherical_kmeans(vectors, n_lists, n_iter=n_iter, seed=seed), nprobe=nprobe)
+
+    def add(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Assign the next ``len(vectors)`` rows to their nearest list.
+        Returns the new rows' list numbers, for ``append_assignments``.
+        """
+        if len(vectors) == 0:
+            return np.empty(0, dtype=np.int32)
+        start = len(self._assignments)
+        assignments = np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+        self._assignments = np.concatenate([self._assignments, assignments])
+        rows = np.arange(start, start + len(assignments), dtype=np.int64)
+        for list_no in np.unique(assignments):
+            self._lists[list_no] = np.concatenate([self._lists[list_no], rows[assignments == list_no]])
+        return assignments
+
+    def candidates(self, query: np.ndarray, nprobe: int = None) -> np.ndarray:
+        """
+        Rows in the ``nprobe`` lists whose centroids are closest to ``query``.
+        """
+        nprobe = min(nprobe or self.nprobe, self.n_lists)
+        centroid_scores = self.centroids @ query
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        return np.concatenate([self._lists[list_no] for list_no in probe])
+
+    def save(self, path: str, assignments_path: str):
+        """
+        Write the centroids to ``path`` and the list number of every row to
+        ``assignments_path``, a raw int32 file that ``append_assignments``
+        extends as rows are added, so the .npz is only rewritten on a rebuild.
+        """
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, centroids=self.centroids, nprobe=self.nprobe)
+        with open(assignments_path + ".tmp", "wb") as f:
+            f.write(self._assignments.tobytes())
+        os.replace(assignments_path + ".tmp", assignments_path)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def append_assignments(assignments_path: str, assignments: np.ndarray):
+        with open(assignments_path, "ab") as f:
+            f.write(np.asarray(assignments, dtype=np.int32).tobytes())
+
+    @classmethod
+    def load(cls, path: str, assignments_path: str) -> "IVFIndex":
+        """
+        Read an index written by ``save``. A torn trailing assignment is
+        ignored; indices saved before the assignments file existed keep
+        theirs in the .npz.
+        """
+        data = np.load(path)
+        index = cls(data["centroids"], nprobe=int(data["nprobe"]))
+        if os.path.exists(assignments_path):
+            n = os.path.getsize(assignments_path) // 4
+            assignments = np.fromfile(assignments_path, dtype=np.int32, count=n)
+        else:
+            assignments = data["assignments"] if "assignments" in data.files else np.empty(0, dtype=np.int32)
+        index._assignments = assignments.astype(np.int32, copy=False)
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(index.n_lists + 1))
+        index._lists = [order[bounds[i]:bounds[i + 1]].astype(np.int64) for i in range(index.n_lists)]
+        return index
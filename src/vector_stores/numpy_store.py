@@ -0,0 +1,693 @@
+import glob
+import json
+import os
+import threading
+import logging
+
+import numpy as np
+
+from src.core.vector_store import BaseVectorStore
+from src.vector_stores.bm25_index import BM25Index
+from src.vector_stores.ivf_index import IVFIndex
+from src.vector_stores.quantization import QUANTIZERS, load_quantizer, save_quantizer
+from src.utils.chunk_ids import chunk_id
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+DOCS_FILE = "docs.jsonl"
+SHARD_PATTERN = "shard_{:05d}.f32"
+IVF_FILE = "ivf.npz"
+IVF_ASSIGNMENTS_FILE = "ivf_assignments.i32"
+QUANTIZER_FILE = "quantizer.npz"
+CODES_FILE = "codes.u8"
+
+
+class NumpyVectorStore(BaseVectorStore):
+    """
+    In-process vector store backed by memory-mapped float32 shards.
+
+    Vectors are L2-normalized on insert and appended to fixed-capacity shard
+    files, so cosine similarity reduces to a dot product. Text and metadata
+    live in a JSON-lines side table whose row order matches the shards.
+    Reopening an existing ``index_path`` only maps the shard files; nothing
+    is re-embedded.
+
+    Documents are keyed by id (content-hashed unless given). Adding an
+    existing id or deleting one tombstones its old row, which searches skip
+    until ``compact`` rewrites the shards without it.
+
+    Layout of ``index_path``::
+
+        manifest.json      embedding_dim / shard_size
+        shard_00000.f32    raw float32 rows, shape (n, embedding_dim)
+        docs.jsonl         one {"id", "text", "metadata"} record per row,
+                           interleaved with {"delete": id} tombstones and
+                           {"update": id, "metadata"} metadata changes
+        ivf.npz            optional IVF index, see ``build_ann_index``
+        ivf_assignments.i32  IVF list number of each row, appended on insert
+        quantizer.npz      optional int8 / PQ quantizer, see ``build_quantized_index``
+        codes.u8           quantized codes, shape (n, code_size)
+    """
+
+    def __init__(self, index_path: str, embedding_dim: int = 768, shard_size: int = 65536):
+        if shard_size <= 0:
+            raise ValueError("'shard_size' must be a positive integer")
+
+        self.index_path = index_path
+        self.embedding_dim = embedding_dim
+        self.shard_size = shard_size
+        self._lock = threading.RLock()
+        self._shards: list[np.memmap] = []
+        self._ids: list[str] = []
+        self._texts: list[str] = []
+        self._metadata: list[dict] = []
+        self._live = bytearray()  # 1 per row, 0 once tombstoned
+        self._row_of: dict[str, int] = {}  # id -> row of its live version
+        self.ann_index: IVFIndex = None
+        self._bm25: BM25Index = None
+        self.quantizer = None
+        self._codes: np.ndarray = None
+
+        os.makedirs(self.index_path, exist_ok=True)
+        manifest_path = os.path.join(self.index_path, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest["embedding_dim"] != self.embedding_dim:
+                raise ValueError(
+                    f"Index at '{self.index_path}' has embedding_dim={manifest['embedding_dim']}, "
+                    f"expected {self.embedding_dim}"
+                )
+            self.shard_size = manifest["shard_size"]
+            self._load()
+            logger.info(f"Opened vector index at '{self.index_path}' with {len(self)} documents")
+        else:
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump({"embedding_dim": self.embedding_dim, "shard_size": self.shard_size}, f)
+            logger.info(f"Created vector index at '{self.index_path}'")
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    @property
+    def _n_rows(self) -> int:
+        # Rows in the shards, including tombstoned ones
+        return len(self._ids)
+
+    def _shard_path(self, shard_no: int) -> str:
+        return os.path.join(self.index_path, SHARD_PATTERN.format(shard_no))
+
+    def _map_shard(self, path: str) -> np.memmap:
+        rows = os.path.getsize(path) // (4 * self.embedding_dim)
+        return np.memmap(path, dtype=np.float32, mode="r", shape=(rows, self.embedding_dim))
+
+    def _load(self):
+        """
+        Map existing shards and read the side table. A torn write (more side
+        table rows than vectors or vice versa) is truncated to the common prefix.
+        """
+        for path in sorted(glob.glob(os.path.join(self.index_path, "shard_*.f32"))):
+            if os.path.getsize(path) >= 4 * self.embedding_dim:
+                self._shards.append(self._map_shard(path))
+
+        records = []
+        docs_path = os.path.join(self.index_path, DOCS_FILE)
+        if os.path.exists(docs_path):
+            with open(docs_path, "r", encoding="utf-8") as f:
+                records = [json.loads(line) for line in f if line.strip()]
+
+        n_vectors = sum(shard.shape[0] for shard in self._shards)
+        n_rows = sum(1 for record in records if "delete" not in record and "update" not in record)
+        if n_vectors != n_rows:
+            logger.warning(
+                f"Index at '{self.index_path}' has {n_vectors} vectors but {n_rows} documents; "
+                f"truncating to the shorter of the two"
+            )
+            self._truncate_shards(min(n_vectors, n_rows))
+            n_rows = min(n_vectors, n_rows)
+        for record in records:
+            if "delete" in record:
+                self._delete_ids([record["delete"]])
+            elif "update" in record:
+                self._update_ids([record["update"]], record["metadata"])
+            elif self._n_rows < n_rows:
+                self._append_records([record])
+
+        ivf_path = os.path.join(self.index_path, IVF_FILE)
+        if os.path.exists(ivf_path):
+            self.ann_index = IVFIndex.load(ivf_path, self._ivf_assignments_path)
+            if len(self.ann_index) > self._n_rows:
+                logger.warning(f"IVF index at '{ivf_path}' is ahead of the store; rebuild it with build_ann_index()")
+                self.ann_index = None
+            else:
+                self._sync_ivf_assignments()
+
+        quantizer_path = os.path.join(self.index_path, QUANTIZER_FILE)
+        if os.path.exists(quantizer_path):
+            self.quantizer = load_quantizer(quantizer_path)
+            self._load_codes()
+
+    @property
+    def _ivf_assignments_path(self) -> str:
+        return os.path.join(self.index_path, IVF_ASSIGNMENTS_FILE)
+
+    def _sync_ivf_assignments(self):
+        """
+        Bring the IVF assignments file in line with the side table: a torn
+        trailing write is cut and rows it misses are assigned and appended.
+        """
+        path = self._ivf_assignments_path
+        if not os.path.exists(path):
+            # Index saved with its assignments inside ivf.npz, move them out once
+            self.ann_index.save(os.path.join(self.index_path, IVF_FILE), path)
+        with open(path, "ab") as f:
+            f.truncate(len(self.ann_index) * 4)
+            for block in self._iter_blocks(start=len(self.ann_index)):
+                f.write(self.ann_index.add(block).tobytes())
+
+    def _load_codes(self):
+        """
+        Map the quantized codes, bringing them in line with the side table:
+        extra codes from a torn write are cut, missing ones are encoded.
+        """
+        path = os.path.join(self.index_path, CODES_FILE)
+        code_size = self.quantizer.code_size
+        n_codes = os.path.getsize(path) // code_size if os.path.exists(path) else 0
+        if n_codes > self._n_rows:
+            with open(path, "r+b") as f:
+                f.truncate(self._n_rows * code_size)
+            n_codes = self._n_rows
+        with open(path, "ab") as f:
+            for block in self._iter_blocks(start=n_codes):
+                f.write(self.quantizer.encode(block).tobytes())
+        self._map_codes()
+
+    def _map_codes(self):
+        path = os.path.join(self.index_path, CODES_FILE)
+        code_size = self.quantizer.code_size
+        rows = os.path.getsize(path) // code_size
+        self._codes = np.memmap(path, dtype=np.uint8, mode="r", shape=(rows, code_size)) if rows else np.empty((0, code_size), dtype=np.uint8)
+
+    def _truncate_shards(self, n_rows: int):
+        """
+        Drop vectors beyond the first ``n_rows`` so that later appends stay
+        aligned with the side table.
+        """
+        shards, remaining = [], n_rows
+        for shard_no, shard in enumerate(self._shards):
+            keep = min(shard.shape[0], remaining)
+            path = self._shard_path(shard_no)
+            del shard
+            if keep == 0:
+                os.remove(path)
+                continue
+            with open(path, "r+b") as f:
+                f.truncate(keep * 4 * self.embedding_dim)
+            shards.append(self._map_shard(path))
+            remaining -= keep
+        self._shards = shards
+
+    def _as_matrix(self, vectors) -> np.ndarray:
+        """
+        Convert vectors to a contiguous, L2-normalized float32 matrix.
+        """
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        if matrix.ndim != 2 or matrix.shape[1] != self.embedding_dim:
+            raise ValueError(f"Each vector must have length {self.embedding_dim}")
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return np.ascontiguousarray(matrix / norms)
+
+    def _append_vectors(self, matrix: np.ndarray):
+        """
+        Append normalized rows to the shard files, rolling over to a new
+        shard once the current one reaches ``shard_size`` rows.
+        """
+        offset = 0
+        while offset < len(matrix):
+            if self._shards and self._shards[-1].shape[0] < self.shard_size:
+                shard_no = len(self._shards) - 1
+                room = self.shard_size - self._shards[-1].shape[0]
+            else:
+                shard_no = len(self._shards)
+                room = self.shard_size
+            block = matrix[offset:offset + room]
+            path = self._shard_path(shard_no)
+            with open(path, "ab") as f:
+                f.write(block.tobytes())
+            if shard_no < len(self._shards):
+                self._shards[shard_no] = self._map_shard(path)
+            else:
+                self._shards.append(self._map_shard(path))
+            offset += len(block)
+
+    def _append_records(self, records: list[dict]):
+        for record in records:
+            previous = self._row_of.get(record["id"])
+            if previous is not None:
+                self._live[previous] = 0
+            self._row_of[record["id"]] = len(self._ids)
+            self._ids.append(record["id"])
+            self._texts.append(record["text"])
+            self._metadata.append(record.get("metadata", {}))
+            self._live.append(1)
+
+    def _delete_ids(self, ids) -> list[str]:
+        deleted = []
+        for doc_id in ids:
+            row = self._row_of.pop(doc_id, None)
+            if row is not None:
+                self._live[row] = 0
+                deleted.append(doc_id)
+        return deleted
+
+    def _update_ids(self, ids, metadata: dict) -> list[str]:
+        updated = []
+        for doc_id in ids:
+            row = self._row_of.get(doc_id)
+            if row is not None:
+                self._metadata[row] = {**self._metadata[row], **metadata}
+                updated.append(doc_id)
+        return updated
+
+    def add_documents(self, documents: list[dict]):
+        """
+        Add or replace documents with structure:
+        {
+            "id": "...",      # optional, defaults to chunk_id(text, metadata["source"])
+            "text": "...",
+            "vector": [...],  # required, embedding vector (list or ndarray)
+            "metadata": { arbitrary key/values }
+        }
+        A document whose id is already stored replaces the previous version.
+        """
+        logger.info(f"Adding {len(documents)} documents to index at '{self.index_path}'")
+        for doc in documents:
+            if "text" not in doc or "vector" not in doc:
+                logger.error("Each document must contain 'text' and 'vector' fields")
+                raise ValueError("Each document must contain 'text' and 'vector' fields")
+        if not documents:
+            return
+
+        matrix = self._as_matrix([doc["vector"] for doc in documents])
+        records = []
+        for doc in documents:
+            metadata = doc.get("metadata", {})
+            doc_id = doc.get("id") or chunk_id(doc["text"], metadata.get("source"))
+            records.append({"id": doc_id, "text": doc["text"], "metadata": metadata})
+
+        with self._lock:
+            self._append_vectors(matrix)
+            with open(os.path.join(self.index_path, DOCS_FILE), "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(record) + "\n" for record in records)
+            self._append_records(records)
+            if self._bm25 is not None:
+                self._bm25.add([record["text"] for record in records])
+            if self.ann_index is not None:
+                IVFIndex.append_assignments(self._ivf_assignments_path, self.ann_index.add(matrix))
+            if self.quantizer is not None:
+                with open(os.path.join(self.index_path, CODES_FILE), "ab") as f:
+                    f.write(self.quantizer.encode(matrix).tobytes())
+                self._map_codes()
+        self._notify_change("add", [record["id"] for record in records])
+        logger.info(f"Successfully added {len(documents)} documents to index at '{self.index_path}'")
+
+    def delete_documents(self, ids: list[str]) -> int:
+        """
+        Tombstone the documents with the given ids; unknown ids are ignored.
+        Returns the number of documents deleted.
+        """
+        with self._lock:
+            deleted = self._delete_ids(ids)
+            if deleted:
+                with open(os.path.join(self.index_path, DOCS_FILE), "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps({"delete": doc_id}) + "\n" for doc_id in deleted)
+        if deleted:
+            self._notify_change("delete", deleted)
+        logger.info(f"Deleted {len(deleted)} documents from index at '{self.index_path}'")
+        return len(deleted)
+
+    def update_metadata(self, ids: list[str], metadata: dict) -> int:
+        """
+        Merge ``metadata`` into the documents with the given ids; their
+        vectors stay in place. Unknown ids are ignored.
+        Returns the number of documents updated.
+        """
+        with self._lock:
+            updated = self._update_ids(ids, metadata)
+            if updated:
+                with open(os.path.join(self.index_path, DOCS_FILE), "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps({"update": doc_id, "metadata": metadata}) + "\n" for doc_id in updated)
+        logger.info(f"Updated metadata of {len(updated)} documents in index at '{self.index_path}'")
+        return len(updated)
+
+    def get_ids(self, filters: dict = None) -> set[str]:
+        with self._lock:
+            if not filters:
+                return set(self._row_of)
+            mask = self._row_mask(filters)
+            return {self._ids[row] for row in np.flatnonzero(mask)}
+
+    def compact(self):
+        """
+        Rewrite the shards, side table and codes without tombstoned rows.
+        Not crash-safe: the files are replaced one after the other.
+        """
+        with self._lock:
+            live_rows = np.flatnonzero(np.frombuffer(self._live, dtype=bool))
+            if len(live_rows) == self._n_rows:
+                return
+            tmp_paths = []
+            for shard_no, start in enumerate(range(0, len(live_rows), self.shard_size)):
+                tmp_paths.append(self._shard_path(shard_no) + ".tmp")
+                with open(tmp_paths[-1], "wb") as f:
+                    f.write(self._take(live_rows[start:start + self.shard_size]).tobytes())
+            codes = np.array(self._codes[live_rows]) if self.quantizer is not None else None
+            records = [
+                {"id": self._ids[row], "text": self._texts[row], "metadata": self._metadata[row]}
+                for row in live_rows
+            ]
+
+            self._shards, self._codes = [], None
+            for path in glob.glob(os.path.join(self.index_path, "shard_*.f32")):
+                os.remove(path)
+            for path in tmp_paths:
+                os.replace(path, path[:-len(".tmp")])
+                self._shards.append(self._map_shard(path[:-len(".tmp")]))
+            docs_path = os.path.join(self.index_path, DOCS_FILE)
+            with open(docs_path + ".tmp", "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(record) + "\n" for record in records)
+            os.replace(docs_path + ".tmp", docs_path)
+
+            n_removed = self._n_rows - len(live_rows)
+            self._ids, self._texts, self._metadata = [], [], []
+            self._live, self._row_of = bytearray(), {}
+            self._append_records(records)
+            self._bm25 = None
+            if codes is not None:
+                with open(os.path.join(self.index_path, CODES_FILE), "wb") as f:
+                    f.write(codes.tobytes())
+                self._map_codes()
+            if self.ann_index is not None:
+                self.ann_index = IVFIndex(self.ann_index.centroids, self.ann_index.nprobe)
+                for block in self._iter_blocks():
+                    self.ann_index.add(block)
+                self.ann_index.save(os.path.join(self.index_path, IVF_FILE), self._ivf_assignments_path)
+        logger.info(f"Compacted index at '{self.index_path}', removed {n_removed} deleted rows")
+
+    def warmup(self):
+        """
+        Read the shards (and codes) once so their pages are resident before the first search.
+        """
+        with self._lock:
+            for block in self._iter_blocks():
+                block.max()
+            if self._codes is not None and len(self._codes):
+                self._codes.max()
+        logger.info(f"Warmed up vector index at '{self.index_path}'")
+
+    def _filter_mask(self, filters: dict, rows: np.ndarray = None) -> np.ndarray:
+        """
+        Boolean mask for term (scalar) and terms (list) filters on metadata
+        fields, over all rows or only over ``rows`` when given.
+        """
+        metadata = self._metadata if rows is None else [self._metadata[row] for row in rows]
+        mask = np.ones(len(metadata), dtype=bool)
+        for key, value in filters.items():
+            allowed = set(value) if isinstance(value, list) else {value}
+            mask &= np.fromiter(
+                (meta.get(key) in allowed for meta in metadata), dtype=bool, count=len(metadata)
+            )
+        return mask
+
+    def _row_mask(self, filters: dict = None, rows: np.ndarray = None) -> np.ndarray:
+        """
+        Mask of live rows matching ``filters`` (over ``rows`` when given),
+        or None when every row qualifies.
+        """
+        if not filters and len(self._row_of) == self._n_rows:
+            return None
+        live = np.frombuffer(self._live, dtype=bool)
+        mask = live.copy() if rows is None else live[rows]
+        if filters:
+            mask &= self._filter_mask(filters, rows)
+        return mask
+
+    def _scores(self, query: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of a normalized query against every stored row.
+        """
+        n = self._n_rows
+        if len(self._shards) == 1:
+            return self._shards[0][:n] @ query
+        return np.concatenate([shard @ query for shard in self._shards])[:n]
+
+    def _take(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Gather the stored vectors for global row numbers ``rows``.
+        Every shard but the last is full, so a row maps to
+        (row // shard_size, row % shard_size).
+        """
+        if len(self._shards) == 1:
+            return self._shards[0][rows]
+        out = np.empty((len(rows), self.embedding_dim), dtype=np.float32)
+        shard_nos = rows // self.shard_size
+        for shard_no in np.unique(shard_nos):
+            selected = shard_nos == shard_no
+            out[selected] = self._shards[shard_no][rows[selected] % self.shard_size]
+        return out
+
+    def _iter_blocks(self, start: int = 0):
+        """
+        Yield the stored vectors from row ``start`` onwards, shard by shard,
+        trimmed to the side table length.
+        """
+        offset = 0
+        for shard in self._shards:
+            lo, hi = max(start - offset, 0), min(shard.shape[0], self._n_rows - offset)
+            if lo < hi:
+                yield shard[lo:hi]
+            offset += shard.shape[0]
+
+    def _sample_rows(self, sample_size: int, seed: int) -> np.ndarray:
+        live_rows = np.flatnonzero(np.frombuffer(self._live, dtype=bool))
+        rng = np.random.default_rng(seed)
+        return np.sort(rng.choice(live_rows, min(sample_size, len(live_rows)), replace=False))
+
+    def build_ann_index(self, n_lists: int = None, nprobe: int = 8, n_iter: int = 20, sample_size: int = 100_000, seed: int = 0):
+        """
+        Train an IVF index over the stored vectors and persist it next to the shards.
+
+        :param n_lists: Number of k-means lists, defaults to 4 * sqrt(n).
+        :param nprobe: Default number of lists scanned per query.
+        :param n_iter: k-means iterations.
+        :param sample_size: Maximum number of vectors used to train the centroids.
+        :param seed: Seed for sampling and centroid initialization.
+        """
+        with self._lock:
+            n = len(self)
+            if n == 0:
+                raise ValueError("Cannot build an ANN index on an empty store")
+            n_lists = min(n_lists or max(1, int(4 * np.sqrt(n))), n)
+            sample_rows = self._sample_rows(sample_size, seed)
+            index = IVFIndex.train(self._take(sample_rows), n_lists, n_iter=n_iter, nprobe=nprobe, seed=seed)
+            for block in self._iter_blocks():
+                index.add(block)
+            index.save(os.path.join(self.index_path, IVF_FILE), self._ivf_assignments_path)
+            self.ann_index = index
+        logger.info(f"Built IVF index with {n_lists} lists over {n} documents")
+
+    def build_quantized_index(self, method: str = "int8", sample_size: int = 100_000, seed: int = 0, **train_options):
+        """
+        Train a quantizer on the stored vectors and encode every row.
+        Searches then score compact codes and re-score only the best
+        candidates against the full-precision shards.
+
+        :param method: "int8" (scalar, 4x smaller) or "pq" (product quantization,
+            ``embedding_dim / n_subspaces`` x 4 smaller).
+        :param sample_size: Maximum number of vectors used for training.
+        :param train_options: Passed to the quantizer, e.g. n_subspaces / n_iter for "pq".
+        """
+        if method not in QUANTIZERS:
+            raise ValueError(f"Unknown quantization method: {method}")
+        with self._lock:
+            n = len(self)
+            if n == 0:
+                raise ValueError("Cannot train a quantizer on an empty store")
+            sample_rows = self._sample_rows(sample_size, seed)
+            quantizer = QUANTIZERS[method].train(self._take(sample_rows), seed=seed, **train_options)
+
+            codes_path = os.path.join(self.index_path, CODES_FILE)
+            self._codes = None
+            with open(codes_path, "wb") as f:
+                for block in self._iter_blocks():
+                    f.write(quantizer.encode(block).tobytes())
+            save_quantizer(os.path.join(self.index_path, QUANTIZER_FILE), quantizer)
+            self.quantizer = quantizer
+            self._map_codes()
+        logger.info(f"Built {method} quantized index over {n} documents ({quantizer.code_size} bytes per vector)")
+
+    def _source(self, row: int, score: float) -> dict:
+        return {"text": self._texts[row], **self._metadata[row], "_id": self._ids[row], "_score": score}
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Positions of the ``k`` highest finite scores, best first.
+        """
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return top[np.isfinite(scores[top])]
+
+    def similarity_search(
+        self,
+        query_vector: list[float],
+        k: int,
+        filters: dict = None,
+        nprobe: int = None,
+        exact: bool = False,
+        rerank_window: int = None,
+        include_vectors: bool = False,
+    ):
+        """
+        Perform similarity search with optional filters on metadata fields.
+        query_vector: list or ndarray of floats, must match embedding_dim
+        nprobe: IVF lists to scan when an ANN index is built (defaults to the index's nprobe)
+        exact: bypass the ANN index and quantized codes and score every row
+        rerank_window: with a quantized index, how many of the best approximate
+            candidates to re-score at full precision (default 4 * k, 0 to skip)
+        include_vectors: add each result's stored (normalized) vector as "vector"
+        Each result carries its cosine similarity as "_score".
+        """
+        logger.info(f"Performing similarity search on index at '{self.index_path}' with k={k} and filters={filters}")
+        query = self._as_matrix(query_vector)[0]
+
+        with self._lock:
+            if len(self) == 0 or k <= 0:
+                return []
+            rows = None
+            if self.ann_index is not None and not exact:
+                rows = self.ann_index.candidates(query, nprobe)
+
+            if self.quantizer is not None and not exact:
+                # Approximate scores from the codes, then full precision for the best candidates
+                codes = self._codes if rows is None else self._codes[rows]
+                scores = self.quantizer.scores(query, codes)
+                mask = self._row_mask(filters, rows)
+                if mask is not None:
+                    scores = np.where(mask, scores, -np.inf)
+                window = 4 * k if rerank_window is None else rerank_window
+                if window > 0:
+                    candidates = self._top_k(scores, max(window, k))
+                    rows = candidates if rows is None else rows[candidates]
+                    scores = self._take(rows) @ query
+            elif rows is not None:
+                # Candidates from the probed lists are scored exactly against the stored vectors
+                scores = self._take(rows) @ query
+            else:
+                scores = self._scores(query)
+
+            if self.quantizer is None or exact:
+                mask = self._row_mask(filters, rows)
+                if mask is not None:
+                    scores = np.where(mask, scores, -np.inf)
+            top = self._top_k(scores, k)
+            top_rows = top if rows is None else rows[top]
+            results = [self._source(int(row), float(score)) for row, score in zip(top_rows, scores[top])]
+            if include_vectors:
+                self._attach_vectors(results, top_rows)
+
+        logger.info(f"Similarity search returned {len(results)} results")
+        return results
+
+    def _batch_top_k(self, queries: np.ndarray, k: int, mask: np.ndarray = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Exact top ``k`` rows and scores for each of the normalized ``queries``,
+        one (queries x shard) matrix product per shard, keeping only each
+        shard's best ``k`` candidates per query between shards.
+        """
+        candidate_rows, candidate_scores = [], []
+        offset = 0
+        for block in self._iter_blocks():
+            scores = queries @ block.T
+            if mask is not None:
+                scores[:, ~mask[offset:offset + len(block)]] = -np.inf
+            block_k = min(k, scores.shape[1])
+            top = np.argpartition(-scores, block_k - 1, axis=1)[:, :block_k]
+            candidate_rows.append(top + offset)
+            candidate_scores.append(np.take_along_axis(scores, top, axis=1))
+            offset += len(block)
+        rows, scores = np.hstack(candidate_rows), np.hstack(candidate_scores)
+        order = np.argsort(-scores, axis=1)[:, :k]
+        return np.take_along_axis(rows, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+    def _attach_vectors(self, results: list[dict], rows: np.ndarray):
+        for result, vector in zip(results, self._take(np.asarray(rows, dtype=np.int64)).tolist()):
+            result["vector"] = vector
+
+    def similarity_search_batch(
+        self, query_vectors, k: int, filters: dict = None, exact: bool = False, include_vectors: bool = False, **search_options
+    ):
+        """
+        Search for every row of ``query_vectors`` (2-D, one query per row).
+        Without an ANN or quantized index (or with ``exact``) all queries
+        are scored in matrix-matrix products over the shards; otherwise each
+        query goes through similarity_search, since the approximate
+        candidates differ per query.
+        """
+        queries = self._as_matrix(query_vectors)
+        if (self.ann_index is not None or self.quantizer is not None) and not exact:
+            return [
+                self.similarity_search(query, k, filters, include_vectors=include_vectors, **search_options)
+                for query in queries
+            ]
+
+        logger.info(f"Performing batched similarity search for {len(queries)} queries on index at '{self.index_path}' with k={k} and filters={filters}")
+        with self._lock:
+            if len(self) == 0 or k <= 0:
+                return [[] for _ in queries]
+            rows, scores = self._batch_top_k(queries, k, self._row_mask(filters))
+            results = []
+            for query_rows, query_scores in zip(rows, scores):
+                found = np.isfinite(query_scores)
+                query_results = [self._source(int(row), float(score)) for row, score in zip(query_rows[found], query_scores[found])]
+                if include_vectors:
+                    self._attach_vectors(query_results, query_rows[found])
+                results.append(query_results)
+        return results
+
+    def lexical_search(self, query_text: str, k: int, filters: dict = None):
+        """
+        BM25 search over the stored texts with optional metadata filters.
+        The BM25 index is built in memory on first use and kept up to date on add.
+        """
+        logger.info(f"Performing lexical search on index at '{self.index_path}' with k={k} and filters={filters}")
+        with self._lock:
+            if self._bm25 is None:
+                self._bm25 = BM25Index()
+                self._bm25.add(self._texts)
+            scores = self._bm25.scores(query_text)
+            scores[scores <= 0] = -np.inf
+            mask = self._row_mask(filters)
+            if mask is not None:
+                scores = np.where(mask, scores, -np.inf)
+            top = self._top_k(scores, k)
+            results = [self._source(int(row), float(scores[row])) for row in top]
+
+        logger.info(f"Lexical search returned {len(results)} results")
+        return results
+
+    def hybrid_candidates(self, query_text: str, query_vector: list[float], window: int, filters: dict = None, **vector_options):
+        """
+        Lexical and vector result lists for the same query, for rank fusion.
+        """
+        return (
+            self.lexical_search(query_text, window, filters),
+            self.similarity_search(query_vector, window, filters, **vector_options),
+        )
@@ -0,0 +1,142 @@
+import numpy as np
+
+
+def kmeans(vectors: np.ndarray, n_clusters: int, n_iter: int = 20, seed: int = 0) -> np.ndarray:
+    """
+    Euclidean k-means (Lloyd's algorithm) returning float32 centroids.
+    """
+    rng = np.random.default_rng(seed)
+    n_clusters = min(n_clusters, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].astype(np.float32)
+    for _ in range(n_iter):
+        # ||x - c||^2 up to the per-row constant ||x||^2
+        distances = (centroids ** 2).sum(axis=1) - 2 * vectors @ centroids.T
+        assignments = np.argmin(distances, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        counts = np.bincount(assignments, minlength=n_clusters)
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+            counts[empty] = 1
+        centroids = (sums / counts[:, None]).astype(np.float32)
+    return centroids
+
+
+class ScalarQuantizer:
+    """
+    Per-dimension int8 quantization: each component is mapped linearly from
+    its trained [min, max] range onto 0..255 (4x smaller than float32).
+
+    Scores are computed asymmetrically: the float query is dotted with the
+    decoded codes, folded into ``codes @ (query * scale) + query . low`` so
+    the codes never need to be decoded into a float matrix.
+    """
+    method = "int8"
+
+    def __init__(self, low: np.ndarray, scale: np.ndarray):
+        self.low = np.asarray(low, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+
+    @property
+    def code_size(self) -> int:
+        return len(self.low)
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, **_) -> "ScalarQuantizer":
+        low, high = vectors.min(axis=0), vectors.max(axis=0)
+        scale = (high - low) / 255.0
+        scale[scale == 0] = 1.0
+        return cls(low, scale)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        codes = np.rint((vectors - self.low) / self.scale)
+        return np.clip(codes, 0, 255).astype(np.uint8)
+
+    def scores(self, query: np.ndarray, codes: np.ndarray, block_size: int = 65536) -> np.ndarray:
+        scaled_query = query * self.scale
+        offset = float(query @ self.low)
+        out = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), block_size):
+            block = codes[start:start + block_size].astype(np.float32)
+            out[start:start + block_size] = block @ scaled_query + offset
+        return out
+
+    def state(self) -> dict:
+        return {"low": self.low, "scale": self.scale}
+
+
+class ProductQuantizer:
+    """
+    Product quantization: vectors are split into ``n_subspaces`` slices and
+    each slice is replaced by the id of its nearest of 256 k-means centroids,
+    so a vector costs ``n_subspaces`` bytes (e.g. 768 dims / 96 subspaces = 32x
+    smaller than float32).
+
+    Scores use asymmetric distance computation: per query, a lookup table of
+    query-slice . centroid inner products is built once and each code's score
+    is the sum of its table entries.
+    """
+    method = "pq"
+
+    def __init__(self, codebooks: np.ndarray):
+        # (n_subspaces, 256, dims_per_subspace)
+        self.codebooks = np.asarray(codebooks, dtype=np.float32)
+
+    @property
+    def n_subspaces(self) -> int:
+        return self.codebooks.shape[0]
+
+    @property
+    def code_size(self) -> int:
+        return self.n_subspaces
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, n_subspaces: int = 8, n_iter: int = 20, seed: int = 0, **_) -> "ProductQuantizer":
+        dim = vectors.shape[1]
+        if dim % n_subspaces:
+            raise ValueError(f"Embedding dimension {dim} is not divisible by n_subspaces={n_subspaces}")
+        sub_dim = dim // n_subspaces
+        codebooks = np.zeros((n_subspaces, 256, sub_dim), dtype=np.float32)
+        for j in range(n_subspaces):
+            centroids = kmeans(vectors[:, j * sub_dim:(j + 1) * sub_dim], 256, n_iter=n_iter, seed=seed + j)
+            codebooks[j, :len(centroids)] = centroids
+        return cls(codebooks)
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        return vectors.reshape(len(vectors), self.n_subspaces, -1)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        parts = self._split(vectors)
+        codes = np.empty((len(vectors), self.n_subspaces), dtype=np.uint8)
+        for j in range(self.n_subspaces):
+            codebook = self.codebooks[j]
+            distances = (codebook ** 2).sum(axis=1) - 2 * parts[:, j] @ codebook.T
+            codes[:, j] = np.argmin(distances, axis=1)
+        return codes
+
+    def scores(self, query: np.ndarray, codes: np.ndarray, block_size: int = 65536) -> np.ndarray:
+        # lookup[j, c] = query slice j . centroid c of subspace j
+        lookup = np.einsum("jd,jcd->jc", query.reshape(self.n_subspaces, -1), self.codebooks)
+        subspaces = np.arange(self.n_subspaces)
+        out = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), block_size):
+            block = codes[start:start + block_size]
+            out[start:start + block_size] = lookup[subspaces, block].sum(axis=1)
+        return out
+
+    def state(self) -> dict:
+        return {"codebooks": self.codebooks}
+
+
+QUANTIZERS = {quantizer.method: quantizer for quantizer in (ScalarQuantizer, ProductQuantizer)}
+
+
+def save_quantizer(path: str, quantizer):
+    np.savez(path, method=quantizer.method, **quantizer.state())
+
+
+def load_quantizer(path: str):
+    data = np.load(path)
+    state = {key: data[key] for key in data.files if key != "method"}
+    return QUANTIZERS[str(data["method"])](**state)
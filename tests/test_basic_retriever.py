@@ -0,0 +1,16 @@
+import asyncio
+
+from src.retrievers.basic_retriever import AsyncVectorStoreRetriever
+
+
+class RecordingStore:
+    async def similarity_search(self, query_vector, k, filters=None, **search_options):
+        return [{"text": "a", "search_options": search_options}]
+
+
+def test_async_retriever_forwards_search_options():
+    retriever = AsyncVectorStoreRetriever(RecordingStore(), None, k=1, include_vectors=True)
+
+    documents = asyncio.run(retriever.retrieve_documents("q", query_vector=[1.0, 0.0]))
+
+    assert documents[0]["search_options"] == {"include_vectors": True}
@@ -0,0 +1,25 @@
+from src.cache.embedding_cache import EmbeddingCache
+from src.llm_engines.cached_engine import CachedEmbeddingEngine
+from src.llm_engines.fake_engine import FakeLLMEngine
+
+
+def test_generate_stream_is_forwarded_to_the_wrapped_engine():
+    engine = CachedEmbeddingEngine(FakeLLMEngine(), EmbeddingCache())
+    messages = [{"role": "user", "content": "what is streamed"}]
+
+    deltas = list(engine.generate_stream(messages))
+
+    assert len(deltas) > 1
+    assert "".join(deltas) == FakeLLMEngine().generate(messages)
+
+
+def test_embed_only_sends_missing_texts_to_the_engine():
+    fake = FakeLLMEngine(embedding_dim=8)
+    engine = CachedEmbeddingEngine(fake, EmbeddingCache())
+
+    first = engine.embed(["a", "b"])
+    calls = fake.calls
+    second = engine.embed(["b", "a"])
+
+    assert fake.calls == calls
+    assert (second == first[::-1]).all()
@@ -0,0 +1,147 @@
+import numpy as np
+import pytest
+
+from src.vector_stores.elasticsearch_store import ElasticsearchVectorStore
+
+
+class StubClient:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def search(self, index, body):
+        self.requests.append(body)
+        return self.responses.pop(0)
+
+    def msearch(self, body):
+        self.requests.append(body)
+        return {"responses": self.responses.pop(0)}
+
+
+def make_store(*responses) -> ElasticsearchVectorStore:
+    # Skip __init__, which connects to the cluster
+    store = ElasticsearchVectorStore.__new__(ElasticsearchVectorStore)
+    store.index_name = "test"
+    store.embedding_dim = 2
+    store.index_options = None
+    store.es_host = "http://stub:9200"
+    store.client = StubClient(responses)
+    return store
+
+
+def hits(*scored):
+    return {"hits": {"hits": [
+        {"_id": doc_id, "_score": score, "_source": {"text": doc_id, "vector": vector}}
+        for doc_id, score, vector in scored
+    ]}}
+
+
+def test_exact_and_knn_scores_are_cosine_similarities():
+    # Query [1, 0]: cos = 1.0 for "a", 0.0 for "b"
+    store = make_store(
+        hits(("a", 2.0, [1.0, 0.0]), ("b", 1.0, [0.0, 1.0])),
+        hits(("a", 1.0, [1.0, 0.0]), ("b", 0.5, [0.0, 1.0])),
+        hits(("a", 1.0, [1.0, 0.0]), ("b", 0.5, [0.0, 1.0])),
+    )
+
+    exact = store.similarity_search([1.0, 0.0], k=2)
+    knn = store.similarity_search([1.0, 0.0], k=2, num_candidates=10)
+    reranked = store.similarity_search([1.0, 0.0], k=2, num_candidates=10, rerank_window=2)
+
+    for results in (exact, knn, reranked):
+        assert [doc["_score"] for doc in results] == pytest.approx([1.0, 0.0])
+
+
+def test_hybrid_vector_candidates_are_cosine_similarities():
+    store = make_store([hits(("a", 7.5, [1.0, 0.0])), hits(("a", 1.0, [1.0, 0.0]), ("b", 0.25, [-1.0, 0.0]))])
+
+    lexical, vector = store.hybrid_candidates("a", [1.0, 0.0], window=2, num_candidates=10)
+
+    assert lexical[0]["_score"] == 7.5
+    assert np.allclose([doc["_score"] for doc in vector], [1.0, -0.5])
+
+
+def test_vectors_are_returned_only_when_requested():
+    response = hits(("a", 2.0, [1.0, 0.0]))
+    store = make_store(response, response, hits(("a", 1.0, [1.0, 0.0])))
+
+    without = store.similarity_search([1.0, 0.0], k=1)
+    assert store.client.requests[-1]["_source"] == {"excludes": ["vector"]}
+    with_vectors = store.similarity_search([1.0, 0.0], k=1, include_vectors=True)
+    assert "_source" not in store.client.requests[-1]
+    reranked = store.similarity_search([1.0, 0.0], k=1, num_candidates=10, rerank_window=1)
+
+    assert with_vectors[0]["vector"] == [1.0, 0.0]
+    # The stub ignores _source filtering; the re-rank path strips the vectors it fetched itself
+    assert "vector" not in reranked[0]
+    assert without[0]["_id"] == "a"
+
+
+
+class StubIndices:
+    def __init__(self, properties, exists: bool = True):
+        self.properties = properties
+        self.put = []
+        self.created = []
+        self.present = exists
+
+    def exists(self, index):
+        return self.present
+
+    def create(self, index, body):
+        self.created.append(index)
+        self.present = True
+
+    def delete(self, index, ignore_unavailable=False):
+        self.present = False
+
+    def get_mapping(self, index):
+        return {index: {"mappings": {"properties": self.properties}}}
+
+    def put_mapping(self, index, properties):
+        self.put.append(properties)
+
+
+def test_reused_index_gets_the_missing_source_mapping():
+    store = make_store()
+    store.index_name = "missing-source"
+    store.client.indices = StubIndices({"text": {"type": "text"}})
+
+    store.ensure_index()
+
+    assert store.client.indices.put == [{"source": {"type": "keyword"}, "version": {"type": "keyword"}}]
+    assert store._filter_clauses({"source": "a.pdf"}) == [{"term": {"source": "a.pdf"}}]
+
+
+def test_source_mapped_as_text_is_filtered_on_its_keyword_subfield():
+    dynamic = {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}}
+    store = make_store()
+    store.index_name = "dynamic-source"
+    store.client.indices = StubIndices({"source": dynamic, "version": {"type": "keyword"}})
+
+    store.ensure_index()
+
+    assert store.client.indices.put == []
+    assert store._filter_clauses({"source": "a.pdf"}) == [{"term": {"source.keyword": "a.pdf"}}]
+    # Later stores on the same index reuse the check
+    other = make_store()
+    other.index_name = "dynamic-source"
+    other.ensure_index()
+    assert other._filter_clauses({"source": "a.pdf"}) == [{"term": {"source.keyword": "a.pdf"}}]
+
+
+def test_index_deleted_through_the_store_is_recreated():
+    indices = StubIndices({}, exists=False)
+    store = make_store()
+    store.index_name = "recreated"
+    store.client.indices = indices
+    store.ensure_index()
+    assert indices.created == ["recreated"]
+
+    store.delete_index()
+    other = make_store()
+    other.index_name = "recreated"
+    other.client.indices = indices
+    other.ensure_index()
+
+    assert indices.created == ["recreated", "recreated"]
@@ -0,0 +1,36 @@
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from src.extractors.excel_extractor import ExcelExtractor
+
+
+def workbook_path(tmp_path, sheets: dict) -> str:
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for name, rows in sheets.items():
+        sheet = workbook.create_sheet(name)
+        for row in rows:
+            sheet.append(row)
+    path = str(tmp_path / "book.xlsx")
+    workbook.save(path)
+    return path
+
+
+def test_sheet_without_data_rows_keeps_its_header(tmp_path):
+    path = workbook_path(tmp_path, {"Empty": [["name", "price"]]})
+
+    text = ExcelExtractor(max_workers=1).extract(path)
+
+    assert "### Sheet: Empty (no data rows)" in text
+    assert "| name | price |" in text
+
+
+def test_cells_beyond_the_header_get_generated_column_names(tmp_path):
+    path = workbook_path(tmp_path, {"Wide": [["name", "price"], ["apple", 1], ["pear", 2, "ripe", "green"]]})
+
+    text = ExcelExtractor(max_workers=1).extract(path)
+
+    assert "| name | price | Column 3 | Column 4 |" in text
+    assert "| apple | 1 |  |  |" in text
+    assert "| pear | 2 | ripe | green |" in text
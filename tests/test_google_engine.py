@@ -0,0 +1,83 @@
+import sys
+from types import ModuleType, SimpleNamespace
+
+from src.llm_engines.google_engine import GoogleLLMEngine
+from src.observability import telemetry
+
+
+class StubModels:
+    def __init__(self, response):
+        self.response = response
+        self.requests = []
+
+    def generate_content(self, **kwargs):
+        self.requests.append(kwargs)
+        return self.response
+
+
+def make_engine(response) -> GoogleLLMEngine:
+    # Skip __init__, which needs the Google SDKs and credentials
+    engine = GoogleLLMEngine.__new__(GoogleLLMEngine)
+    engine.client_type = "genai"
+    engine.model = "gemini-test"
+    # genai.Client exposes generation under client.models
+    engine.client = SimpleNamespace(models=StubModels(response))
+    return engine
+
+
+def test_generate_returns_response_text_and_records_usage():
+    telemetry.telemetry.reset()
+    usage = SimpleNamespace(prompt_token_count=12, candidates_token_count=5)
+    engine = make_engine(SimpleNamespace(text="hello", usage_metadata=usage))
+
+    assert engine.generate([{"role": "user", "content": "hi"}]) == "hello"
+    assert engine.client.models.requests == [{"model": "gemini-test", "contents": "hi"}]
+
+    counters = telemetry.telemetry.snapshot()["counters"]
+    assert counters[("llm_tokens_total", (("kind", "prompt"), ("provider", "google")))] == 12
+    assert counters[("llm_tokens_total", (("kind", "completion"), ("provider", "google")))] == 5
+
+
+def test_generate_without_text_attribute_falls_back_to_str():
+    engine = make_engine(SimpleNamespace(usage_metadata=None))
+    assert engine.generate([{"content": "hi"}]) == "namespace(usage_metadata=None)"
+
+
+class StubPart:
+    # Mirrors google.genai.types.Part.from_bytes, whose arguments are keyword-only
+    @classmethod
+    def from_bytes(cls, *, data: bytes, mime_type: str):
+        return ("part", data, mime_type)
+
+
+def stub_genai_types(monkeypatch):
+    # The google-genai SDK is optional; provide just the Part factory the engine imports
+    google = ModuleType("google")
+    genai = ModuleType("google.genai")
+    types = ModuleType("google.genai.types")
+    types.Part = StubPart
+    google.genai, genai.types = genai, types
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.genai", genai)
+    monkeypatch.setitem(sys.modules, "google.genai.types", types)
+
+
+def test_generate_from_image_sends_parts_through_client_models(monkeypatch):
+    stub_genai_types(monkeypatch)
+    engine = make_engine(SimpleNamespace(text="a cat", usage_metadata=None))
+    png = b"\x89PNG\r\n\x1a\n" + b"\0" * 16
+
+    assert engine.generate_from_image(png, [{"content": "what is this?"}]) == "a cat"
+    assert engine.client.models.requests == [
+        {"model": "gemini-test", "contents": ["what is this?", ("part", png, "image/png")]}
+    ]
+
+
+def test_generate_from_pdf_sends_parts_through_client_models(monkeypatch):
+    stub_genai_types(monkeypatch)
+    engine = make_engine(SimpleNamespace(text="a summary", usage_metadata=None))
+
+    assert engine.generate_from_pdf([b"%PDF-1.7"], [{"content": "summarize"}]) == "a summary"
+    assert engine.client.models.requests == [
+        {"model": "gemini-test", "contents": ["summarize", ("part", b"%PDF-1.7", "application/pdf")]}
+    ]
@@ -0,0 +1,127 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.llm_engines.fake_engine import FakeLLMEngine, FakeProviderError
+from src.llm_engines.governed_engine import GovernedLLMEngine, is_retryable, is_throttled
+from src.utils.rate_limiter import AdaptiveRateLimiter, RateLimiter
+
+
+def messages(text: str = "question") -> list[dict]:
+    return [{"role": "user", "content": text}]
+
+
+def test_identical_concurrent_calls_share_one_provider_call():
+    fake = FakeLLMEngine(generate_latency=0.2)
+    engine = GovernedLLMEngine(fake, rate=100, burst=100)
+    start = threading.Barrier(10)
+
+    def ask(_):
+        start.wait()
+        return engine.generate(messages())
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        answers = list(executor.map(ask, range(10)))
+
+    assert fake.calls == 1
+    assert len(set(answers)) == 1
+
+
+def test_different_requests_are_not_coalesced():
+    fake = FakeLLMEngine(generate_latency=0.05)
+    engine = GovernedLLMEngine(fake, rate=100, burst=100)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda i: engine.generate(messages(str(i))), range(4)))
+
+    assert fake.calls == 4
+
+
+def test_throttled_calls_are_retried_and_lower_the_rate():
+    fake = FakeLLMEngine(throttle_rate=0.3, seed=1)
+    engine = GovernedLLMEngine(
+        fake, rate=100, burst=10, min_rate=20, backoff_base=0.001, max_retries=10, throttle_cooldown=0.0
+    )
+    rates = []
+    on_throttle = engine.limiter.on_throttle
+
+    def record_throttle():
+        on_throttle()
+        rates.append(engine.limiter.rate)
+
+    engine.limiter.on_throttle = record_throttle
+
+    answers = [engine.generate(messages(str(i))) for i in range(30)]
+
+    assert len(answers) == 30
+    assert fake.calls > 30
+    assert rates[0] == 50
+    assert min(rates) >= 20
+
+
+def test_non_retryable_errors_surface_immediately():
+    class Broken(FakeLLMEngine):
+        def generate(self, messages, **kwargs):
+            self.calls += 1
+            raise ValueError("bad request")
+
+    fake = Broken()
+    engine = GovernedLLMEngine(fake, rate=100, burst=10, backoff_base=0.001)
+
+    with pytest.raises(ValueError):
+        engine.generate(messages())
+    assert fake.calls == 1
+
+
+def test_hedging_flattens_the_latency_tail():
+    def tail_latency(engine, n=300, warmup=50):
+        latencies = []
+        for i in range(n):
+            started = time.perf_counter()
+            engine.generate(messages(str(i)))
+            latencies.append(time.perf_counter() - started)
+        return float(np.percentile(latencies[warmup:], 99))
+
+    options = dict(generate_latency=0.005, slow_rate=0.05, slow_latency=0.3, seed=2)
+    plain = tail_latency(FakeLLMEngine(**options))
+    hedged = tail_latency(GovernedLLMEngine(FakeLLMEngine(**options), rate=10_000, burst=100, hedge_percentile=90))
+
+    assert plain > 0.25
+    assert hedged < 0.1
+
+
+def test_streams_and_embeddings_are_retried():
+    fake = FakeLLMEngine(embedding_dim=8, throttle_rate=0.5, seed=3)
+    engine = GovernedLLMEngine(fake, rate=1000, burst=10, backoff_base=0.001, max_retries=20)
+
+    assert "".join(engine.generate_stream(messages())) == FakeLLMEngine().generate(messages())
+    assert engine.embed(["a", "b"] * 150).shape == (300, 8)
+
+
+def test_error_classification():
+    assert is_throttled(FakeProviderError(429, "RESOURCE_EXHAUSTED"))
+    assert is_retryable(FakeProviderError(503, "UNAVAILABLE"))
+    assert is_retryable(TimeoutError())
+    assert not is_retryable(ValueError("bad request"))
+
+
+def test_adaptive_limiter_decreases_once_per_cooldown():
+    limiter = AdaptiveRateLimiter(rate=64, burst=8, cooldown=60)
+    for _ in range(10):
+        limiter.on_throttle()
+    assert limiter.rate == 32
+
+    limiter._last_decrease -= 60
+    limiter.on_throttle()
+    assert limiter.rate == 16
+
+    limiter.on_success()
+    assert limiter.rate == pytest.approx(16 + 64 / 100)
+
+
+def test_acquire_more_than_burst_raises():
+    with pytest.raises(ValueError):
+        RateLimiter(rate=10, burst=2).acquire(3)
@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+
+from src.vector_stores.numpy_store import IVF_ASSIGNMENTS_FILE, IVF_FILE, NumpyVectorStore
+
+
+def documents(rng, n, start=0, dim=16):
+    return [
+        {"id": f"doc-{start + i}", "text": f"text {start + i}", "vector": rng.standard_normal(dim), "metadata": {}}
+        for i in range(n)
+    ]
+
+
+def test_adds_append_ivf_assignments_without_rewriting_the_index(tmp_path):
+    rng = np.random.default_rng(0)
+    store = NumpyVectorStore(str(tmp_path), embedding_dim=16)
+    store.add_documents(documents(rng, 200))
+    store.build_ann_index(n_lists=8)
+    ivf_path = os.path.join(tmp_path, IVF_FILE)
+    assignments_path = os.path.join(tmp_path, IVF_ASSIGNMENTS_FILE)
+    saved = os.stat(ivf_path).st_mtime_ns
+
+    store.add_documents(documents(rng, 50, start=200))
+
+    assert os.stat(ivf_path).st_mtime_ns == saved
+    assert os.path.getsize(assignments_path) == 250 * 4
+    reopened = NumpyVectorStore(str(tmp_path), embedding_dim=16)
+    assert np.array_equal(reopened.ann_index._assignments, store.ann_index._assignments)
+    query = rng.standard_normal(16)
+    expected = [doc["_id"] for doc in store.similarity_search(query, k=5, nprobe=8)]
+    assert [doc["_id"] for doc in reopened.similarity_search(query, k=5, nprobe=8)] == expected
+
+
+def test_torn_assignments_are_repaired_on_load(tmp_path):
+    rng = np.random.default_rng(1)
+    store = NumpyVectorStore(str(tmp_path), embedding_dim=16)
+    store.add_documents(documents(rng, 100))
+    store.build_ann_index(n_lists=4)
+    assignments_path = os.path.join(tmp_path, IVF_ASSIGNMENTS_FILE)
+    with open(assignments_path, "r+b") as f:
+        f.truncate(90 * 4 + 2)
+
+    reopened = NumpyVectorStore(str(tmp_path), embedding_dim=16)
+
+    assert os.path.getsize(assignments_path) == 100 * 4
+    assert np.array_equal(reopened.ann_index._assignments, store.ann_index._assignments)
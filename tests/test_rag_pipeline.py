@@ -0,0 +1,71 @@
+import asyncio
+
+from src.llm_engines.fake_engine import AsyncFakeLLMEngine, FakeLLMEngine
+from src.pipeline.async_rag_pipeline import AsyncRAGPipeline
+from src.pipeline.rag_pipeline import RAGPipeline
+from src.utils.chunk_ids import content_version
+from src.vector_stores.async_adapter import AsyncVectorStoreAdapter
+from src.vector_stores.numpy_store import NumpyVectorStore
+
+
+class TextExtractor:
+    def __init__(self, texts: dict):
+        self.texts = texts
+
+    def extract(self, file_path: str) -> str:
+        return self.texts[file_path]
+
+
+class LineChunker:
+    def chunk(self, text: str) -> list[str]:
+        return text.splitlines()
+
+
+class CountingEngine(FakeLLMEngine):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.embedded = 0
+
+    def embed_batch(self, texts):
+        self.embedded += len(texts)
+        return super().embed_batch(texts)
+
+
+def versions(store: NumpyVectorStore) -> set:
+    return {store._metadata[row]["version"] for row in store._row_of.values()}
+
+
+def test_incremental_ingest_refreshes_the_version_of_unchanged_chunks(tmp_path):
+    texts = {"a.txt": "one\ntwo\nthree"}
+    engine = CountingEngine(embedding_dim=8)
+    store = NumpyVectorStore(str(tmp_path), embedding_dim=8)
+    pipeline = RAGPipeline(TextExtractor(texts), LineChunker(), store, None, engine)
+    pipeline.ingest("a.txt")
+
+    texts["a.txt"] = "one\ntwo\nfour"
+    engine.embedded = 0
+    result = pipeline.ingest("a.txt")
+
+    assert result == {"added": 1, "deleted": 1, "unchanged": 2, "updated": 2}
+    # Only the new chunk is embedded; the unchanged ones get a metadata-only update
+    assert engine.embedded == 1
+    assert versions(store) == {content_version(texts["a.txt"])}
+    assert versions(NumpyVectorStore(str(tmp_path), embedding_dim=8)) == {content_version(texts["a.txt"])}
+
+    assert pipeline.ingest("a.txt")["updated"] == 0
+
+
+def test_async_and_sync_ingest_store_the_same_documents(tmp_path):
+    texts = {"a.txt": "one\ntwo\none"}
+    store = NumpyVectorStore(str(tmp_path), embedding_dim=8)
+    pipeline = AsyncRAGPipeline(
+        TextExtractor(texts), LineChunker(), AsyncVectorStoreAdapter(store), None, AsyncFakeLLMEngine(embedding_dim=8)
+    )
+
+    asyncio.run(pipeline.aingest("a.txt"))
+    asyncio.run(pipeline.aingest("a.txt"))
+    assert len(store) == 2
+    assert store.get_ids({"source": "a.txt", "version": content_version(texts["a.txt"])}) == store.get_ids()
+
+    sync = RAGPipeline(TextExtractor(texts), LineChunker(), store, None, FakeLLMEngine(embedding_dim=8))
+    assert sync.ingest("a.txt") == {"added": 0, "deleted": 0, "unchanged": 2, "updated": 0}
@@ -0,0 +1,89 @@
+import threading
+
+import numpy as np
+
+from src.chunkers.simple_chunker import SimpleChunker
+from src.core.llm_engine import BaseLLMEngine
+from src.observability.exporters import Exporter, PrometheusExporter
+from src.observability.telemetry import Telemetry, telemetry
+from src.pipeline.streaming_ingest import StreamingIngestor
+from src.vector_stores.numpy_store import NumpyVectorStore
+from src.llm_engines.fake_engine import FakeLLMEngine
+
+
+class SpanRecorder(Exporter):
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def on_span_end(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+
+class TextExtractor:
+    def extract(self, file_path: str) -> str:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+
+def test_nested_spans_share_the_trace_and_record_durations():
+    registry = Telemetry()
+    recorder = SpanRecorder()
+    registry.add_exporter(recorder)
+
+    with registry.span("query") as parent:
+        with registry.span("retrieve") as child:
+            pass
+
+    assert child.trace_id == parent.trace_id
+    assert child.parent_id == parent.span_id
+    histograms = registry.snapshot()["histograms"]
+    assert histograms[("rag_stage_duration_seconds", (("stage", "retrieve"),))]["count"] == 1
+
+
+def test_spans_in_streaming_ingest_workers_join_the_caller_trace(tmp_path):
+    for i in range(3):
+        (tmp_path / f"doc{i}.txt").write_text(f"document {i}. " * 200, encoding="utf-8")
+    store = NumpyVectorStore(str(tmp_path / "index"), embedding_dim=16)
+    ingestor = StreamingIngestor(TextExtractor(), SimpleChunker(), FakeLLMEngine(embedding_dim=16), store)
+    recorder = SpanRecorder()
+    telemetry.add_exporter(recorder)
+    try:
+        with telemetry.span("ingest_stream") as root:
+            ingestor.ingest(str(path) for path in sorted(tmp_path.glob("*.txt")))
+    finally:
+        telemetry.remove_exporter(recorder)
+
+    stages = [span for span in recorder.spans if span.name in ("extract", "chunk", "embed", "index")]
+    assert {span.name for span in stages} == {"extract", "chunk", "embed", "index"}
+    assert all(span.trace_id == root.trace_id and span.parent_id == root.span_id for span in stages)
+
+
+def test_embed_batches_on_a_thread_pool_see_the_caller_span():
+    seen = []
+
+    class Engine(BaseLLMEngine):
+        embedding_dim = 4
+
+        def embed_batch(self, texts):
+            seen.append(telemetry.current_span())
+            return np.zeros((len(texts), 4), dtype=np.float32)
+
+    with telemetry.span("embed") as parent:
+        Engine().embed(["text"] * 10, batch_size=2, max_concurrency=4)
+
+    assert len(seen) == 5 and all(span is parent for span in seen)
+
+
+def test_prometheus_render_exposes_counters_and_histograms():
+    registry = Telemetry()
+    registry.increment("semantic_cache_lookups_total", result="hit")
+    registry.observe("rag_stage_duration_seconds", 0.02, stage="embed")
+
+    text = PrometheusExporter(registry).render()
+
+    assert 'semantic_cache_lookups_total{result="hit"} 1' in text
+    assert 'rag_stage_duration_seconds_bucket{stage="embed",le="0.025"} 1' in text
+    assert 'rag_stage_duration_seconds_bucket{stage="embed",le="0.01"} 0' in text
+    assert 'rag_stage_duration_seconds_count{stage="embed"} 1' in text